@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Analytics Rules for TopDeck Stats Dashboard
+Declarative achievement, recommendation and warning rules evaluated as
+stats are recorded. Each rule subscribes to the metrics it tests, so a
+recorded stat only touches the rules watching it; rules testing the same
+value are kept sorted by threshold, and an update only visits the rules
+whose threshold lies between the old and new value. Without subscribers
+nobody sees the individual flips, so samples are queued per metric and
+folded in when the active set is read.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MetricKey = Tuple[str, str]   # (StatCategory value, metric name)
+
+RULE_KINDS = ("achievement", "recommendation", "warning")
+
+# Per-metric aggregates, stored as consecutive slots in one array
+_AGGREGATES = ("last", "count", "sum", "max", "min")
+_AGG_OFFSETS = {agg: offset for offset, agg in enumerate(_AGGREGATES)}
+_WIDTH = len(_AGGREGATES)       # "mean" is derived from sum / count
+
+# Samples queued per metric before they are folded in regardless of reads
+_MAX_PENDING = 4096
+
+_OPERATORS = {
+    "<": lambda value, threshold: value < threshold,
+    "<=": lambda value, threshold: value <= threshold,
+    ">": lambda value, threshold: value > threshold,
+    ">=": lambda value, threshold: value >= threshold,
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Active while ``agg(metric) op threshold`` holds.
+
+    With ``per``, the tested value is ``agg(metric) / max(1, per_agg(per))``
+    and ``min_samples`` counts samples of ``per`` instead of ``metric``.
+    """
+    name: str
+    kind: str                       # "achievement", "recommendation" or "warning"
+    message: str
+    metric: MetricKey
+    op: str
+    threshold: float
+    agg: str = "last"               # "last", "count", "sum", "max", "min" or "mean"
+    per: Optional[MetricKey] = None
+    per_agg: str = "count"
+    min_samples: int = 1
+
+
+@dataclass
+class RuleEvent:
+    """A rule becoming active or inactive"""
+    timestamp: float
+    rule: Rule
+    active: bool
+    value: float
+
+
+# The checks get_analytics used to poll for
+DEFAULT_ANALYTICS_RULES = (
+    Rule("low_fps", "warning", "⚠️ Low FPS detected - consider reducing quality settings",
+         ("Performance", "average_fps"), "<", 30.0),
+    Rule("smooth_performance", "achievement", "🏆 Excellent performance - running smoothly!",
+         ("Performance", "average_fps"), ">", 60.0),
+    Rule("low_accuracy", "recommendation", "💡 Low accuracy - try focusing fire on single targets",
+         ("Combat", "accuracy"), "<", 50.0),
+    Rule("sharp_shooter", "achievement", "🎯 Sharp shooter - excellent accuracy!",
+         ("Combat", "accuracy"), ">", 80.0),
+    Rule("overspending", "warning", "⚠️ Spending nearly all income - save for emergencies",
+         ("Economy", "money_spent"), ">", 0.9, agg="sum", per=("Economy", "money_earned"), per_agg="sum"),
+    Rule("underspending", "recommendation", "💡 Under-spending - consider more upgrades",
+         ("Economy", "money_spent"), "<", 0.5, agg="sum", per=("Economy", "money_earned"), per_agg="sum"),
+    Rule("veteran", "achievement", "🌟 Veteran defender - 20+ waves completed!",
+         ("Waves", "wave_completed"), ">", 20, agg="count"),
+    Rule("unstoppable", "achievement", "💪 Unstoppable force - 100:1 K/D ratio!",
+         ("Combat", "enemy_killed"), ">", 100, agg="count", per=("Defenders", "defender_lost"),
+         min_samples=0),
+)
+
+
+def _row_value(aggregates: array, base: int, agg: str) -> float:
+    if agg == "mean":
+        count = aggregates[base + 1]
+        return aggregates[base + 2] / count if count else 0.0
+    return aggregates[base + _AGG_OFFSETS[agg]]
+
+
+class _ThresholdGroup:
+    """Rules testing the same value, sorted by threshold.
+
+    The value is an aggregate of one metric, or a ratio of two. "<" and
+    ">=" rules flip when the value crosses their threshold from either
+    side at the same points, as do "<=" and ">", so each pair shares a
+    group and an update only visits the thresholds between the old value
+    and the new one.
+    """
+
+    __slots__ = ("row", "agg", "per_row", "per_agg", "gate_row", "min_samples", "bisect",
+                 "thresholds", "rules", "compares", "value", "evaluated")
+
+    def __init__(self, row: int, agg: str, per_row: Optional[int], per_agg: str,
+                 min_samples: int, inclusive: bool):
+        self.row = row
+        self.agg = agg
+        self.per_row = per_row
+        self.per_agg = per_agg
+        self.gate_row = row if per_row is None else per_row
+        self.min_samples = min_samples
+        # "<"/">=" flip at thresholds in (low, high], "<="/">" in [low, high)
+        self.bisect = bisect_right if inclusive else bisect_left
+        self.thresholds: List[float] = []
+        self.rules: List[int] = []
+        self.compares: List[Callable[[float, float], bool]] = []
+        self.value = 0.0
+        self.evaluated = False
+
+    def add(self, threshold: float, rule: int, compare: Callable[[float, float], bool]):
+        position = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(position, threshold)
+        self.rules.insert(position, rule)
+        self.compares.insert(position, compare)
+
+    def current(self, aggregates: array) -> Optional[float]:
+        """The tested value, or None while there are too few samples"""
+        if aggregates[self.gate_row + 1] < self.min_samples:
+            return None
+        value = _row_value(aggregates, self.row, self.agg)
+        if self.per_row is not None:
+            value /= max(1.0, _row_value(aggregates, self.per_row, self.per_agg))
+        return value
+
+
+class RuleEngine:
+    """Evaluates rules incrementally as metric samples arrive.
+
+    State is one row of aggregates per subscribed metric, the last tested
+    value per rule group and one byte per rule. Subscribers get a
+    RuleEvent whenever a rule turns on or off. With no subscribers,
+    samples are only queued and the rules are brought up to date by
+    ``active``, ``value`` or ``subscribe``, which give the same results.
+    ``on_new_metric`` (if set) is called with each metric key the first
+    time a rule watches it.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self.rules: List[Rule] = []
+        self.slots: Dict[MetricKey, int] = {}
+        self._groups: Dict[tuple, _ThresholdGroup] = {}
+        self._slot_groups: List[List[_ThresholdGroup]] = []
+        self._pending: List[list] = []
+        self._subscribers: List[Callable[[RuleEvent], None]] = []
+        self.on_new_metric: Optional[Callable[[MetricKey], None]] = None
+        self.aggregates = array("d")
+        self.active_flags = bytearray()
+        self.active_count = 0
+        for rule in rules:
+            self.add_rule(rule)
+
+    def _slot(self, key: MetricKey) -> int:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.slots)
+            self._slot_groups.append([])
+            self._pending.append([])
+            self.aggregates.extend([0.0] * _WIDTH)
+            if self.on_new_metric is not None:
+                self.on_new_metric(key)
+        return slot
+
+    def add_rule(self, rule: Rule) -> int:
+        """Register a rule, in the state the samples seen so far imply"""
+        if rule.kind not in RULE_KINDS:
+            raise ValueError(f"Unknown rule kind: {rule.kind}")
+        if rule.op not in _OPERATORS:
+            raise ValueError(f"Unknown rule operator: {rule.op}")
+        for agg in (rule.agg, rule.per_agg):
+            if agg not in _AGG_OFFSETS and agg != "mean":
+                raise ValueError(f"Unknown aggregate: {agg}")
+
+        self._fold_pending()
+        index = len(self.rules)
+        self.rules.append(rule)
+        self.active_flags.append(0)
+        slot = self._slot(rule.metric)
+        if rule.per is None:
+            per_slot, per_agg, min_samples = None, "", max(1, rule.min_samples)
+        else:
+            per_slot, per_agg, min_samples = self._slot(rule.per), rule.per_agg, rule.min_samples
+        inclusive = rule.op in ("<", ">=")
+        key = (slot, rule.agg, per_slot, per_agg, min_samples, inclusive)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _ThresholdGroup(
+                slot * _WIDTH, rule.agg, None if per_slot is None else per_slot * _WIDTH,
+                per_agg, min_samples, inclusive)
+            self._slot_groups[slot].append(group)
+            if per_slot is not None and per_slot != slot:
+                self._slot_groups[per_slot].append(group)
+        compare = _OPERATORS[rule.op]
+        group.add(float(rule.threshold), index, compare)
+        if group.evaluated and compare(group.value, rule.threshold):
+            self.active_flags[index] = 1
+            self.active_count += 1
+        return index
+
+    def subscribe(self, callback: Callable[[RuleEvent], None]):
+        """Call ``callback(event)`` whenever a rule turns on or off"""
+        self._fold_pending()
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[RuleEvent], None]):
+        self._subscribers.remove(callback)
+
+    def value(self, key: MetricKey, agg: str = "last") -> float:
+        """Current aggregate of a subscribed metric"""
+        self._fold_pending()
+        return self._aggregate(self.slots[key], agg)
+
+    def _aggregate(self, slot: int, agg: str) -> float:
+        return _row_value(self.aggregates, slot * _WIDTH, agg)
+
+    def observe(self, category: str, name: str, timestamp: float, value: Any):
+        """Fold one sample into its metric and re-evaluate the rules watching it"""
+        slot = self.slots.get((category, name))
+        if slot is not None:
+            self.observe_slot(slot, timestamp, value)
+
+    def observe_slot(self, slot: int, timestamp: float, value: Any):
+        """``observe`` for a metric already resolved to its slot (see ``slots``)"""
+        if not self._subscribers:
+            pending = self._pending[slot]
+            pending.append(value)
+            if len(pending) >= _MAX_PENDING:
+                self._fold(slot, timestamp)
+            return
+        if type(value) is not float and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            return
+        self._accumulate(slot, (value,))
+        self._evaluate(slot, timestamp)
+
+    def _accumulate(self, slot: int, values: Sequence[float]):
+        """Fold numeric samples (at least one) into the metric's aggregates"""
+        aggregates = self.aggregates
+        base = slot * _WIDTH
+        count = aggregates[base + 1]
+        aggregates[base] = values[-1]
+        aggregates[base + 1] = count + len(values)
+        aggregates[base + 2] = sum(values, aggregates[base + 2])
+        high, low = max(values), min(values)
+        if count == 0 or high > aggregates[base + 3]:
+            aggregates[base + 3] = high
+        if count == 0 or low < aggregates[base + 4]:
+            aggregates[base + 4] = low
+
+    def _fold(self, slot: int, timestamp: float = 0.0):
+        """Apply a metric's queued samples and re-evaluate its rules once"""
+        pending = self._pending[slot]
+        values = [value for value in pending
+                  if type(value) is float or not isinstance(value, bool) and isinstance(value, (int, float))]
+        pending.clear()
+        if values:
+            self._accumulate(slot, values)
+            self._evaluate(slot, timestamp)
+
+    def _fold_pending(self):
+        for slot, pending in enumerate(self._pending):
+            if pending:
+                self._fold(slot)
+
+    def _evaluate(self, slot: int, timestamp: float):
+        """Re-test the rule groups reading ``slot`` against its aggregates"""
+        aggregates = self.aggregates
+        value = aggregates[slot * _WIDTH]
+        flags = self.active_flags
+        for group in self._slot_groups[slot]:
+            # group.current(), inlined: this runs for every watched sample
+            if aggregates[group.gate_row + 1] < group.min_samples:
+                continue
+            if group.per_row is None and group.agg == "last":
+                new = value
+            else:
+                new = _row_value(aggregates, group.row, group.agg)
+                if group.per_row is not None:
+                    new /= max(1.0, _row_value(aggregates, group.per_row, group.per_agg))
+            if not group.evaluated:
+                group.evaluated = True
+                group.value = new
+                for rule, threshold, compare in zip(group.rules, group.thresholds, group.compares):
+                    if compare(new, threshold):
+                        self._set(rule, True, timestamp, new)
+                continue
+            old = group.value
+            if new == old:
+                continue
+            group.value = new
+            low, high = (old, new) if old < new else (new, old)
+            thresholds = group.thresholds
+            for position in range(group.bisect(thresholds, low), group.bisect(thresholds, high)):
+                rule = group.rules[position]
+                self._set(rule, not flags[rule], timestamp, new)
+
+    def _set(self, rule_index: int, active: bool, timestamp: float, value: float):
+        self.active_flags[rule_index] = active
+        self.active_count += 1 if active else -1
+        if self._subscribers:
+            event = RuleEvent(timestamp, self.rules[rule_index], active, value)
+            for callback in self._subscribers:
+                callback(event)
+
+    def active(self, kind: Optional[str] = None) -> List[Rule]:
+        """Currently active rules (of one kind, if given) in registration order"""
+        self._fold_pending()
+        if not self.active_count:
+            return []
+        return [rule for rule, flag in zip(self.rules, self.active_flags)
+                if flag and (kind is None or rule.kind == kind)]
+
+    def reset(self):
+        """Clear all metric aggregates and rule states (e.g. for a new session)"""
+        for pending in self._pending:
+            pending.clear()
+        for index in range(len(self.aggregates)):
+            self.aggregates[index] = 0.0
+        for index in range(len(self.active_flags)):
+            self.active_flags[index] = 0
+        for group in self._groups.values():
+            group.value = 0.0
+            group.evaluated = False
+        self.active_count = 0
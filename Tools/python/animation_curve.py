@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Animation Curve for TopDeck Config Validator
+Evaluates serialized Unity AnimationCurves with NumPy the way the engine
+does: cubic Hermite segments, weighted (Bezier) tangents, stepped
+(infinite) tangents and the Clamp/Loop/PingPong pre- and post-infinity
+modes, for a whole array of times in one call. Dense samples let the
+validator check range, monotonicity and slope along the entire curve.
+Requires numpy.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Keyframe.weightedMode bits
+WEIGHTED_IN = 1
+WEIGHTED_OUT = 2
+
+DEFAULT_WEIGHT = 1.0 / 3.0
+
+# Bisection steps solving a weighted segment's x(u) = t; 2**-40 is well
+# below float32 resolution, the precision Unity evaluates in
+_BEZIER_STEPS = 40
+
+DEFAULT_SAMPLES = 1025
+
+
+class WrapMode(Enum):
+    """``m_PreInfinity`` / ``m_PostInfinity`` as serialized"""
+    PING_PONG = 0
+    LOOP = 1
+    CLAMP = 2
+
+
+def _wrap_mode(value: Any) -> WrapMode:
+    try:
+        return WrapMode(value)
+    except ValueError:
+        return WrapMode.CLAMP
+
+
+@dataclass
+class AnimationCurve:
+    """Keyframes as parallel arrays, sorted by time"""
+    times: np.ndarray
+    values: np.ndarray
+    in_slopes: np.ndarray
+    out_slopes: np.ndarray
+    in_weights: np.ndarray
+    out_weights: np.ndarray
+    weighted_modes: np.ndarray
+    pre_wrap: WrapMode = WrapMode.CLAMP
+    post_wrap: WrapMode = WrapMode.CLAMP
+
+    @classmethod
+    def from_keys(cls, keys: list, pre_wrap: WrapMode = WrapMode.CLAMP,
+                  post_wrap: WrapMode = WrapMode.CLAMP) -> "AnimationCurve":
+        """From keyframe dicts with Unity's field names (``time``, ``value``, ``inSlope``, ...)"""
+        keys = sorted(keys, key=lambda key: key.get("time", 0.0))
+
+        def column(name: str, default: float) -> np.ndarray:
+            return np.array([float(key.get(name, default)) for key in keys], dtype=np.float64)
+
+        return cls(
+            times=column("time", 0.0),
+            values=column("value", 0.0),
+            in_slopes=column("inSlope", 0.0),
+            out_slopes=column("outSlope", 0.0),
+            in_weights=np.clip(column("inWeight", DEFAULT_WEIGHT), 0.0, 1.0),
+            out_weights=np.clip(column("outWeight", DEFAULT_WEIGHT), 0.0, 1.0),
+            weighted_modes=np.array([int(key.get("weightedMode", 0)) for key in keys], dtype=np.int64),
+            pre_wrap=pre_wrap,
+            post_wrap=post_wrap,
+        )
+
+    @classmethod
+    def from_serialized(cls, data: Any) -> Optional["AnimationCurve"]:
+        """From a curve as loaded by unity_yaml (``m_Curve``, ``m_PreInfinity``, ...); None if not a curve"""
+        if not isinstance(data, dict) or not isinstance(data.get("m_Curve"), list):
+            return None
+        keys = [key for key in data["m_Curve"] if isinstance(key, dict)]
+        return cls.from_keys(keys, _wrap_mode(data.get("m_PreInfinity")), _wrap_mode(data.get("m_PostInfinity")))
+
+    @classmethod
+    def linear(cls, time_start: float, value_start: float, time_end: float,
+               value_end: float) -> "AnimationCurve":
+        """``AnimationCurve.Linear``"""
+        slope = (value_end - value_start) / (time_end - time_start) if time_end != time_start else 0.0
+        return cls.from_keys([
+            {"time": time_start, "value": value_start, "inSlope": 0.0, "outSlope": slope},
+            {"time": time_end, "value": value_end, "inSlope": slope, "outSlope": 0.0},
+        ])
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _wrap(self, t: np.ndarray) -> np.ndarray:
+        start, end = self.times[0], self.times[-1]
+        span = end - start
+        wrapped = t.copy()
+        for mask, mode in ((t < start, self.pre_wrap), (t > end, self.post_wrap)):
+            if not mask.any():
+                continue
+            if mode == WrapMode.CLAMP or span <= 0:
+                wrapped[mask] = np.clip(t[mask], start, end)
+            elif mode == WrapMode.LOOP:
+                wrapped[mask] = start + np.mod(t[mask] - start, span)
+            else:
+                wrapped[mask] = start + span - np.abs(np.mod(t[mask] - start, 2 * span) - span)
+        return wrapped
+
+    def evaluate(self, t: Any) -> np.ndarray:
+        """``AnimationCurve.Evaluate`` for every element of ``t``"""
+        t = np.asarray(t, dtype=np.float64)
+        count = len(self.times)
+        if count == 0:
+            return np.zeros_like(t)
+        if count == 1:
+            return np.full_like(t, self.values[0])
+
+        t = self._wrap(t)
+        index = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, count - 2)
+        t0 = self.times[index]
+        dt = self.times[index + 1] - t0
+        v0 = self.values[index]
+        v1 = self.values[index + 1]
+        m0 = self.out_slopes[index]
+        m1 = self.in_slopes[index + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(dt > 0, (t - t0) / dt, 0.0)
+        d0 = np.where(np.isfinite(m0), m0 * dt, 0.0)
+        d1 = np.where(np.isfinite(m1), m1 * dt, 0.0)
+
+        s2 = s * s
+        s3 = s2 * s
+        result = ((2 * s3 - 3 * s2 + 1) * v0 + (s3 - 2 * s2 + s) * d0
+                  + (3 * s2 - 2 * s3) * v1 + (s3 - s2) * d1)
+
+        weighted = ((self.weighted_modes[index] & WEIGHTED_OUT) != 0) | \
+                   ((self.weighted_modes[index + 1] & WEIGHTED_IN) != 0)
+        if weighted.any():
+            w0 = np.where(self.weighted_modes[index] & WEIGHTED_OUT, self.out_weights[index], DEFAULT_WEIGHT)
+            w1 = np.where(self.weighted_modes[index + 1] & WEIGHTED_IN, self.in_weights[index + 1], DEFAULT_WEIGHT)
+            result = np.where(weighted, _bezier(s, v0, v1, d0, d1, w0, w1), result)
+
+        # A constant (infinite) tangent on either side holds the left key's value
+        stepped = ~(np.isfinite(m0) & np.isfinite(m1))
+        return np.where(stepped | (dt <= 0), v0, result)
+
+    def sample(self, count: int = DEFAULT_SAMPLES, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """``count`` evenly spaced (time, value) samples over [start, end] (default: the keys' span)"""
+        if start is None:
+            start = float(self.times[0]) if len(self.times) else 0.0
+        if end is None:
+            end = float(self.times[-1]) if len(self.times) else 0.0
+        times = np.linspace(start, end, count)
+        return times, self.evaluate(times)
+
+
+def _bezier(s: np.ndarray, v0: np.ndarray, v1: np.ndarray, d0: np.ndarray, d1: np.ndarray,
+            w0: np.ndarray, w1: np.ndarray) -> np.ndarray:
+    """Weighted segments: cubic Bezier with x control points (0, w0, 1 - w1, 1)"""
+    x1 = w0
+    x2 = 1.0 - w1
+    low = np.zeros_like(s)
+    high = np.ones_like(s)
+    # x(u) is monotonic for weights in [0, 1], so bisection always converges
+    for _ in range(_BEZIER_STEPS):
+        u = 0.5 * (low + high)
+        v = 1.0 - u
+        x = 3 * v * v * u * x1 + 3 * v * u * u * x2 + u * u * u
+        below = x < s
+        low = np.where(below, u, low)
+        high = np.where(below, high, u)
+    u = 0.5 * (low + high)
+    v = 1.0 - u
+    return (v * v * v * v0 + 3 * v * v * u * (v0 + w0 * d0)
+            + 3 * v * u * u * (v1 - w1 * d1) + u * u * u * v1)
+
+
+@dataclass
+class CurveProfile:
+    """Range, monotonicity and steepest slope of a densely sampled curve"""
+    start: float
+    end: float
+    minimum: float
+    minimum_time: float
+    maximum: float
+    maximum_time: float
+    max_slope: float                         # Largest |dv/dt| between neighbouring samples
+    max_slope_time: float
+    first_decrease: Optional[float] = None   # Time where the curve first goes down, if it does
+    largest_decrease: float = 0.0            # Deepest fall below an earlier peak
+
+    @property
+    def increasing(self) -> bool:
+        return self.first_decrease is None
+
+
+def profile_curve(curve: AnimationCurve, start: float = 0.0, end: float = 1.0,
+                  samples: int = DEFAULT_SAMPLES) -> CurveProfile:
+    """Sample ``curve`` over [start, end] and summarize it.
+
+    Decreases smaller than a millionth of the curve's magnitude are float
+    noise from keys stored at float32 precision, not a real dip.
+    """
+    times, values = curve.sample(samples, start, end)
+    steps = np.diff(values)
+    slopes = np.abs(steps / np.diff(times)) if len(times) > 1 else np.zeros(1)
+    tolerance = 1e-6 * max(1.0, float(np.max(np.abs(values))))
+    decreasing = np.flatnonzero(steps < -tolerance)
+    low, high, steepest = int(np.argmin(values)), int(np.argmax(values)), int(np.argmax(slopes))
+    return CurveProfile(
+        start=start,
+        end=end,
+        minimum=float(values[low]),
+        minimum_time=float(times[low]),
+        maximum=float(values[high]),
+        maximum_time=float(times[high]),
+        max_slope=float(slopes[steepest]),
+        max_slope_time=float(times[steepest]),
+        first_decrease=float(times[decreasing[0] + 1]) if len(decreasing) else None,
+        largest_decrease=float(np.max(np.maximum.accumulate(values) - values)) if len(decreasing) else 0.0,
+    )
+
+
+def curve_fields(data: Dict[str, Any]) -> Dict[str, AnimationCurve]:
+    """Every AnimationCurve field of a serialized object"""
+    curves = {}
+    for name, value in data.items():
+        curve = AnimationCurve.from_serialized(value)
+        if curve is not None:
+            curves[name] = curve
+    return curves
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Print a profile of every AnimationCurve in Unity assets"""
+    from unity_yaml import load_unity_asset
+
+    parser = argparse.ArgumentParser(description="Profile the AnimationCurves in Unity assets")
+    parser.add_argument("assets", nargs="+")
+    parser.add_argument("--start", type=float, default=0.0)
+    parser.add_argument("--end", type=float, default=1.0)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    args = parser.parse_args(argv)
+
+    for path in args.assets:
+        print(path)
+        for obj in load_unity_asset(path).objects:
+            for name, curve in curve_fields(obj.data).items():
+                profile = profile_curve(curve, args.start, args.end, args.samples)
+                trend = "increasing" if profile.increasing else f"decreases at t={profile.first_decrease:.3f}"
+                print(f"  {obj.data.get('m_Name', obj.type_name)}.{name}: {len(curve)} keys, "
+                      f"[{profile.minimum:.4g}, {profile.maximum:.4g}], max slope {profile.max_slope:.4g} "
+                      f"at t={profile.max_slope_time:.3f}, {trend}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
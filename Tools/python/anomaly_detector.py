@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Anomaly Detector for TopDeck Stats Dashboard
+Streaming regression alerts from exponentially weighted baselines.
+Each watched metric keeps an EWMA mean and variance, updated in O(1) per
+sample; a sample far outside its baseline (z-score) is an outlier, and a
+fast average pulling away from a slow one is a drift. Alerts are
+structured events that CI jobs and the game HUD can consume directly.
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class Ewma:
+    """Exponentially weighted mean and variance"""
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def update(self, value: float):
+        if self.count == 0:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            increment = self.alpha * delta
+            self.mean += increment
+            self.variance = (1.0 - self.alpha) * (self.variance + delta * increment)
+        self.count += 1
+
+    def z_score(self, value: float) -> float:
+        """How many baseline deviations ``value`` is from the mean"""
+        std = math.sqrt(self.variance)
+        if std > 0:
+            return (value - self.mean) / std
+        return 0.0 if value == self.mean else math.copysign(math.inf, value - self.mean)
+
+    def reset(self):
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+
+@dataclass
+class AnomalyRule:
+    """What counts as anomalous for one metric.
+
+    ``mode`` is "outlier" (one sample beyond ``z_threshold`` deviations of
+    the baseline and at least ``min_delta`` from its mean) or "drift" (the
+    fast average beyond ``drift_ratio`` times the slow one, reported once
+    on entry and once on recovery). ``direction`` is "high", "low" or "both".
+    The slow baseline keeps adapting, so a lasting regression is reported as
+    recovered once it has become the norm.
+    """
+    category: str                       # StatCategory value, e.g. "Waves"
+    name: str
+    mode: str = "outlier"
+    direction: str = "both"
+    z_threshold: float = 3.0
+    min_delta: float = 0.0
+    alpha: float = 0.1                  # Baseline (slow) smoothing
+    fast_alpha: float = 0.05            # Drift only: recent-average smoothing
+    drift_ratio: float = 1.25
+    min_samples: int = 10               # Baseline samples before alerting
+    severity: str = "warning"           # "info", "warning" or "critical"
+    description: str = ""
+
+
+@dataclass
+class Alert:
+    """One anomaly, as emitted to subscribers"""
+    seq: int
+    timestamp: float
+    category: str
+    name: str
+    kind: str                           # "outlier", "drift" or "recovered"
+    direction: str                      # "high" or "low"
+    severity: str
+    value: float
+    expected: float
+    z_score: float
+    description: str = ""
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        if not math.isfinite(record["z_score"]):
+            record["z_score"] = None
+        return record
+
+
+# Regressions worth flagging in a normal TopDeck session
+DEFAULT_RULES = (
+    AnomalyRule("Waves", "wave_duration", direction="both", z_threshold=3.0, alpha=0.3,
+                min_samples=5, min_delta=5.0, description="Wave took unusually long or short"),
+    AnomalyRule("Waves", "wave_efficiency", direction="low", z_threshold=3.0, alpha=0.3,
+                min_samples=5, min_delta=10.0, description="Wave kill efficiency dropped"),
+    AnomalyRule("Combat", "shot_accuracy", direction="low", z_threshold=3.0, alpha=0.1,
+                min_samples=10, min_delta=10.0, description="Accuracy collapsed"),
+    # Recorded once per second, as the mean frame time of the second that just ended
+    AnomalyRule("Performance", "frame_time_ms", mode="drift", direction="high", alpha=0.02,
+                fast_alpha=0.2, drift_ratio=1.25, min_samples=30, severity="critical",
+                description="Frame time drifting upward"),
+)
+
+
+class _Watch:
+    """Per-metric state for one rule"""
+
+    __slots__ = ("rule", "baseline", "fast", "drifting")
+
+    def __init__(self, rule: AnomalyRule):
+        self.rule = rule
+        self.baseline = Ewma(rule.alpha)
+        self.fast = Ewma(rule.fast_alpha) if rule.mode == "drift" else None
+        self.drifting = False
+
+
+class AnomalyDetector:
+    """Feeds samples through the rules watching them and emits alerts.
+
+    ``context`` (e.g. current wave, last upgrade) is copied into each alert.
+    The latest ``max_alerts`` alerts are kept for polling with ``alerts()``;
+    subscribers are called with every alert as it is raised.
+    ``on_new_metric`` (if set) is called with each (category, name) the
+    first time a rule watches it.
+    """
+
+    def __init__(self, rules: Iterable[AnomalyRule] = DEFAULT_RULES, max_alerts: int = 1000):
+        self.watched: Dict[Tuple[str, str], List[_Watch]] = {}
+        self.on_new_metric: Optional[Callable[[Tuple[str, str]], None]] = None
+        for rule in rules:
+            self.add_rule(rule)
+        self.context: Dict[str, Any] = {}
+        self.history: Deque[Alert] = deque(maxlen=max_alerts)
+        self.alert_count = 0
+        self._subscribers: List[Callable[[Alert], None]] = []
+
+    def add_rule(self, rule: AnomalyRule):
+        if rule.mode not in ("outlier", "drift"):
+            raise ValueError(f"Unknown anomaly mode: {rule.mode}")
+        if rule.direction not in ("high", "low", "both"):
+            raise ValueError(f"Unknown anomaly direction: {rule.direction}")
+        key = (rule.category, rule.name)
+        if key not in self.watched:
+            self.watched[key] = []
+            if self.on_new_metric is not None:
+                self.on_new_metric(key)
+        self.watched[key].append(_Watch(rule))
+
+    def subscribe(self, callback: Callable[[Alert], None]):
+        """Call ``callback(alert)`` for every alert raised from now on"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Alert], None]):
+        self._subscribers.remove(callback)
+
+    def observe(self, category: str, name: str, timestamp: float, value: Any) -> List[Alert]:
+        """Feed one sample; returns the alerts it raised (usually none)"""
+        watches = self.watched.get((category, name))
+        if not watches or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return []
+        value = float(value)
+        if not math.isfinite(value):
+            return []
+        raised = []
+        for watch in watches:
+            alert = self._check(watch, timestamp, value)
+            if alert is not None:
+                raised.append(alert)
+        return raised
+
+    def _check(self, watch: _Watch, timestamp: float, value: float) -> Optional[Alert]:
+        rule = watch.rule
+        baseline = watch.baseline
+        ready = baseline.count >= rule.min_samples
+
+        if rule.mode == "outlier":
+            alert = None
+            if ready:
+                z = baseline.z_score(value)
+                delta = value - baseline.mean
+                direction = "high" if delta > 0 else "low"
+                if (abs(z) >= rule.z_threshold and abs(delta) >= rule.min_delta
+                        and rule.direction in (direction, "both")):
+                    alert = self._emit(rule, timestamp, "outlier", direction, value, baseline.mean, z)
+            baseline.update(value)
+            return alert
+
+        fast = watch.fast
+        fast.update(value)
+        baseline.update(value)
+        if not ready or baseline.mean <= 0:
+            return None
+        ratio = fast.mean / baseline.mean
+        # Once drifting, only recover halfway back so a ratio near the
+        # threshold does not flap between drift and recovered
+        limit = rule.drift_ratio if not watch.drifting else 1.0 + (rule.drift_ratio - 1.0) / 2.0
+        high = ratio >= limit
+        low = ratio <= 1.0 / limit
+        drifting = (high and rule.direction != "low") or (low and rule.direction != "high")
+        if drifting == watch.drifting:
+            return None
+        watch.drifting = drifting
+        z = baseline.z_score(fast.mean)
+        if drifting:
+            return self._emit(rule, timestamp, "drift", "high" if high else "low",
+                              fast.mean, baseline.mean, z)
+        return self._emit(rule, timestamp, "recovered", "high" if ratio >= 1.0 else "low",
+                          fast.mean, baseline.mean, z, severity="info")
+
+    def _emit(self, rule: AnomalyRule, timestamp: float, kind: str, direction: str,
+              value: float, expected: float, z: float, severity: Optional[str] = None) -> Alert:
+        alert = Alert(
+            seq=self.alert_count, timestamp=timestamp, category=rule.category, name=rule.name,
+            kind=kind, direction=direction, severity=severity or rule.severity, value=value,
+            expected=expected, z_score=z, description=rule.description, context=dict(self.context)
+        )
+        self.alert_count += 1
+        self.history.append(alert)
+        for callback in self._subscribers:
+            callback(alert)
+        return alert
+
+    def alerts(self, since_seq: int = 0) -> List[Alert]:
+        """Kept alerts with ``seq >= since_seq``, oldest first"""
+        if not self.history or self.history[-1].seq < since_seq:
+            return []
+        skip = max(0, since_seq - self.history[0].seq)
+        return list(self.history)[skip:]
+
+    def reset(self):
+        """Forget baselines and alerts (e.g. for a new session); rules and subscribers stay"""
+        for watches in self.watched.values():
+            for watch in watches:
+                watch.baseline.reset()
+                if watch.fast is not None:
+                    watch.fast.reset()
+                watch.drifting = False
+        self.context.clear()
+        self.history.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Scan an NDJSON event log and print alerts as NDJSON (exit 1 on critical alerts)"""
+    parser = argparse.ArgumentParser(description="Stream anomaly alerts from a TopDeck NDJSON log")
+    parser.add_argument("log", help="NDJSON event log (StatsDashboard.ingest_ndjson format)")
+    parser.add_argument("--fail-on", choices=("info", "warning", "critical"), default="critical",
+                        help="exit non-zero if an alert at or above this severity is raised")
+    args = parser.parse_args(argv)
+
+    from trace_export import iter_ndjson_events
+
+    levels = {"info": 0, "warning": 1, "critical": 2}
+    detector = AnomalyDetector()
+    worst = -1
+    with open(args.log) as log:
+        for entry in iter_ndjson_events(log):
+            if entry.name == "wave_started":
+                detector.context["wave"] = entry.value
+            for alert in detector.observe(entry.category.value, entry.name, entry.timestamp, entry.value):
+                print(json.dumps(alert.to_dict()))
+                worst = max(worst, levels.get(alert.severity, 0))
+    return 1 if worst >= levels[args.fail_on] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
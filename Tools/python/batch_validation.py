@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Batch Validation for TopDeck Config Validator
+Compiles a ConfigValidator rule set into bound arrays and validates a
+whole matrix of candidate configs (rows = configs, columns = fields) in
+one vectorized pass, for parameter sweeps. Every row gets a 64-bit
+violation mask; ValidationResults are only built for the rows asked for,
+and match what validate_config reports for the same config.
+Requires numpy.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_validator import ConfigValidator, ValidationLevel, ValidationResult
+
+# Violation kinds; a row's mask has bit ``kind * len(fields) + column`` set per violation
+BELOW = 0     # ERROR, as validate_range
+ABOVE = 1     # WARNING, as validate_range
+MISSING = 2   # WARNING with require_all; a NaN cell is a missing field
+KINDS = 3
+
+MAX_FIELDS = 64 // KINDS
+
+
+class CompiledRules:
+    """One config type's range rules as arrays, in a fixed column order"""
+
+    def __init__(self, config_type: str, fields: Sequence[str], low: Sequence[float], high: Sequence[float]):
+        if len(fields) > MAX_FIELDS:
+            raise ValueError(f"{config_type}: {len(fields)} fields do not fit a 64-bit mask (max {MAX_FIELDS})")
+        self.config_type = config_type
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.columns: Dict[str, int] = {name: column for column, name in enumerate(self.fields)}
+        self.bounds: Tuple[Tuple[float, float], ...] = tuple(zip(low, high))   # as written, for messages
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+
+    @classmethod
+    def from_validator(cls, validator: ConfigValidator, config_type: str,
+                       fields: Optional[Sequence[str]] = None) -> "CompiledRules":
+        """Compile ``validator.rules[config_type]`` (or just ``fields`` of it, in that order)"""
+        rules = validator.rules.get(config_type)
+        if rules is None:
+            raise ValueError(f"No rules defined for {config_type}")
+        fields = list(rules) if fields is None else list(fields)
+        unknown = [name for name in fields if name not in rules]
+        if unknown:
+            raise ValueError(f"No {config_type} rules for: {', '.join(unknown)}")
+        return cls(config_type, fields, [rules[name][0] for name in fields], [rules[name][1] for name in fields])
+
+    def bit(self, field: str, kind: int) -> int:
+        """The mask bit for ``kind`` of violation on ``field``"""
+        return 1 << (kind * len(self.fields) + self.columns[field])
+
+    @property
+    def error_bits(self) -> int:
+        """Mask of every BELOW bit (the violations reported as errors)"""
+        return (1 << len(self.fields)) - 1
+
+    def matrix(self, configs: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Configs as dicts -> a candidate matrix (missing fields become NaN)"""
+        matrix = np.full((len(configs), len(self.fields)), np.nan)
+        for row, config in enumerate(configs):
+            for name, value in config.items():
+                column = self.columns.get(name)
+                if column is not None:
+                    matrix[row, column] = value
+        return matrix
+
+    def validate(self, matrix: np.ndarray, require_all: bool = True) -> "BatchValidation":
+        """Violation masks for every row of ``matrix`` in one pass"""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.fields):
+            raise ValueError(f"Expected a (configs, {len(self.fields)}) matrix, got {matrix.shape}")
+        planes = [matrix < self.low, matrix > self.high]
+        if require_all:
+            planes.append(np.isnan(matrix))
+        # Kind-major bits, packed little-endian into 8 bytes per row
+        bits = np.concatenate(planes, axis=1)
+        packed = np.zeros((len(matrix), 8), dtype=np.uint8)
+        packed[:, :(bits.shape[1] + 7) // 8] = np.packbits(bits, axis=1, bitorder="little")
+        masks = packed.view("<u8").ravel()
+        return BatchValidation(self, matrix, masks)
+
+
+@dataclass
+class BatchValidation:
+    """Violation masks of a candidate matrix; ValidationResults built per row on demand"""
+    rules: CompiledRules
+    matrix: np.ndarray
+    masks: np.ndarray   # uint64 per row
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Rows with no errors (as generate_report's PASSED)"""
+        return (self.masks & np.uint64(self.rules.error_bits)) == 0
+
+    @property
+    def clean(self) -> np.ndarray:
+        """Rows with no violation at all"""
+        return self.masks == 0
+
+    def rows_with(self, field: str, kind: int) -> np.ndarray:
+        """Indices of rows with ``kind`` of violation on ``field``"""
+        return np.flatnonzero(self.masks & np.uint64(self.rules.bit(field, kind)))
+
+    def counts(self) -> Dict[Tuple[str, int], int]:
+        """(field, kind) -> rows with that violation, for the violations that occur"""
+        width = len(self.rules.fields)
+        bits = np.unpackbits(self.masks.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        totals = bits[:, :KINDS * width].sum(axis=0)
+        return {(self.rules.fields[bit % width], bit // width): int(total)
+                for bit, total in enumerate(totals) if total}
+
+    def results(self, row: int, order: Optional[Iterable[str]] = None) -> List[ValidationResult]:
+        """The ValidationResults validate_config reports for this row.
+
+        validate_config reports range violations in the config dict's key
+        order; ``order`` gives that order (pass the row's config dict
+        itself). Without it they follow the rules' field order, as for a
+        dict built from the row. Missing fields always come last, in
+        field order.
+        """
+        mask = int(self.masks[row])
+        width = len(self.rules.fields)
+        fields = self.rules.fields
+        if order is None:
+            columns: Iterable[int] = range(width)
+        else:
+            columns = [self.rules.columns[name] for name in order if name in self.rules.columns]
+        results = []
+        for column in columns:
+            name = fields[column]
+            value = float(self.matrix[row, column])
+            if mask >> (BELOW * width + column) & 1:
+                min_val = self.rules.bounds[column][0]
+                results.append(ValidationResult(
+                    level=ValidationLevel.ERROR,
+                    field=name,
+                    message=f"Value {value} is below minimum {min_val}",
+                    suggestion=f"Set {name} to at least {min_val}"
+                ))
+            elif mask >> (ABOVE * width + column) & 1:
+                max_val = self.rules.bounds[column][1]
+                results.append(ValidationResult(
+                    level=ValidationLevel.WARNING,
+                    field=name,
+                    message=f"Value {value} exceeds recommended maximum {max_val}",
+                    suggestion=f"Consider keeping {name} below {max_val} for balance"
+                ))
+        for column, name in enumerate(fields):
+            if mask >> (MISSING * width + column) & 1:
+                results.append(ValidationResult(
+                    level=ValidationLevel.WARNING,
+                    field=name,
+                    message=f"Missing expected field: {name}",
+                    suggestion=f"Add {name} to configuration"
+                ))
+        return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate a uniform random sweep over a config type's rule ranges"""
+    parser = argparse.ArgumentParser(description="Sweep random candidate configs through the batch validator")
+    parser.add_argument("config_type", nargs="?", default="upgrade_costs")
+    parser.add_argument("--configs", type=int, default=1_000_000)
+    parser.add_argument("--spread", type=float, default=0.25,
+                        help="sample this fraction beyond each bound on either side")
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    rules = CompiledRules.from_validator(ConfigValidator(), args.config_type)
+    margin = (rules.high - rules.low) * args.spread
+    rng = np.random.default_rng(args.seed)
+    matrix = rng.uniform(rules.low - margin, rules.high + margin, size=(args.configs, len(rules.fields)))
+    batch = rules.validate(matrix)
+
+    print(f"{args.config_type}: {len(batch):,} candidates, {int(batch.passed.sum()):,} without errors, "
+          f"{int(batch.clean.sum()):,} without warnings")
+    kinds = {BELOW: "below minimum", ABOVE: "above maximum", MISSING: "missing"}
+    for (name, kind), count in sorted(batch.counts().items()):
+        print(f"  {name:<24} {kinds[kind]:<14} {count:>10,}")
+    failing = np.flatnonzero(~batch.passed)
+    if len(failing):
+        print(f"First failing candidate (row {failing[0]}):")
+        for result in batch.results(int(failing[0])):
+            print(f"  {result.level.value}: {result.field}: {result.message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Analytics Rules Benchmark for TopDeck Stats Dashboard
+Registers hundreds of threshold and ratio rules and measures the per-event
+cost of keeping them current: through RuleEngine directly (queuing samples
+until the rules are read, and with a subscriber, evaluating each one), through
+StatsDashboard.record_stat, and by re-testing every rule on its metric per
+event. Also checks that the incremental rule states match a full re-test.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from analytics_rules import RULE_KINDS, Rule, RuleEngine  # noqa: E402
+from stats_dashboard import StatCategory, StatsDashboard  # noqa: E402
+
+METRICS = [(category, f"metric_{i}") for i, category in
+           enumerate([StatCategory.COMBAT, StatCategory.ECONOMY, StatCategory.WAVES,
+                      StatCategory.ENEMIES, StatCategory.DEFENDERS] * 8)]
+
+OPERATORS = {
+    "<": lambda value, threshold: value < threshold,
+    "<=": lambda value, threshold: value <= threshold,
+    ">": lambda value, threshold: value > threshold,
+    ">=": lambda value, threshold: value >= threshold,
+}
+
+
+def synthetic_rules(count: int, ratio_share: float, seed: int = 11):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        category, name = rng.choice(METRICS)
+        kind = RULE_KINDS[i % len(RULE_KINDS)]
+        op = rng.choice(list(OPERATORS))
+        if rng.random() < ratio_share:
+            per_category, per_name = rng.choice(METRICS)
+            rules.append(Rule(f"rule_{i}", kind, f"rule {i}", (category.value, name), op,
+                              rng.uniform(0.2, 5.0), agg="sum",
+                              per=(per_category.value, per_name), per_agg="sum"))
+        else:
+            rules.append(Rule(f"rule_{i}", kind, f"rule {i}", (category.value, name), op,
+                              rng.uniform(0.0, 100.0), agg=rng.choice(["last", "max", "mean"])))
+    return rules
+
+
+def synthetic_events(count: int, seed: int = 12):
+    """Each metric drifts in small steps, as gameplay stats do between samples"""
+    rng = random.Random(seed)
+    current = {metric: rng.uniform(0.0, 100.0) for metric in METRICS}
+    events = []
+    for _ in range(count):
+        metric = rng.choice(METRICS)
+        value = current[metric] = min(100.0, max(0.0, current[metric] + rng.gauss(0.0, 2.0)))
+        events.append((*metric, value))
+    return events
+
+
+class NaiveRules:
+    """Re-tests every rule on a metric whenever that metric gets a sample"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.samples = {}
+        self.by_metric = {}
+        for index, rule in enumerate(rules):
+            self.by_metric.setdefault(rule.metric, []).append(index)
+            if rule.per is not None and rule.per != rule.metric:
+                self.by_metric.setdefault(rule.per, []).append(index)
+        self.active = [False] * len(rules)
+
+    def _agg(self, key, agg):
+        last, count, total, high = self.samples.get(key, (0.0, 0, 0.0, 0.0))
+        return {"last": last, "count": count, "sum": total, "max": high,
+                "mean": total / count if count else 0.0}[agg]
+
+    def observe(self, key, value):
+        last, count, total, high = self.samples.get(key, (0.0, 0, 0.0, value))
+        self.samples[key] = (value, count + 1, total + value, max(high, value))
+        for index in self.by_metric.get(key, ()):
+            rule = self.rules[index]
+            tested = self._agg(rule.metric, rule.agg)
+            if rule.per is not None:
+                if self._agg(rule.per, "count") < rule.min_samples:
+                    continue
+                tested /= max(1.0, self._agg(rule.per, rule.per_agg))
+            self.active[index] = OPERATORS[rule.op](tested, rule.threshold)
+
+
+def main():
+    """Run the analytics rules benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--ratio-share", type=float, default=0.1, help="fraction of ratio rules")
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events)
+    keyed = [(category.value, name, value) for category, name, value in events]
+
+    print("=" * 60)
+    print("ANALYTICS RULES BENCHMARK")
+    print("=" * 60)
+    print(f"  Events: {args.events:,}  Metrics: {len(METRICS)}  Ratio rules: {args.ratio_share:.0%}")
+    print("")
+
+    baseline = StatsDashboard(history_size=10_000, analytics_rules=(), anomaly_rules=())
+    start = time.perf_counter()
+    for category, name, value in events:
+        baseline.record_stat(category, name, value)
+    baseline_us = (time.perf_counter() - start) / len(events) * 1e6
+    print(f"  record_stat without rules: {baseline_us:6.2f} µs/event")
+    print("")
+    print(f"  {'Rules':>6}  {'engine':>10}  {'subscribed':>11}  {'record_stat':>12}  {'re-test all':>12}  {'active':>7}")
+
+    for rule_count in args.rules:
+        rules = synthetic_rules(rule_count, args.ratio_share)
+
+        # Without subscribers samples are queued until active() reads the rules
+        engine = RuleEngine(rules)
+        start = time.perf_counter()
+        for timestamp, (category, name, value) in enumerate(keyed):
+            engine.observe(category, name, timestamp, value)
+        engine.active()
+        engine_us = (time.perf_counter() - start) / len(events) * 1e6
+
+        subscribed = RuleEngine(rules)
+        subscribed.subscribe(lambda event: None)
+        start = time.perf_counter()
+        for timestamp, (category, name, value) in enumerate(keyed):
+            subscribed.observe(category, name, timestamp, value)
+        subscribed_us = (time.perf_counter() - start) / len(events) * 1e6
+
+        naive = NaiveRules(rules)
+        start = time.perf_counter()
+        for category, name, value in keyed:
+            naive.observe((category, name), value)
+        naive_us = (time.perf_counter() - start) / len(events) * 1e6
+
+        if ([bool(flag) for flag in engine.active_flags] != naive.active
+                or subscribed.active_flags != engine.active_flags):
+            print(f"  ❌ Incremental rule states differ from a full re-test ({rule_count} rules)")
+            return 1
+
+        dashboard = StatsDashboard(history_size=10_000, analytics_rules=rules, anomaly_rules=())
+        start = time.perf_counter()
+        for category, name, value in events:
+            dashboard.record_stat(category, name, value)
+        dashboard_us = (time.perf_counter() - start) / len(events) * 1e6
+
+        print(f"  {rule_count:>6}  {engine_us:>7.2f} µs  {subscribed_us:>8.2f} µs  {dashboard_us:>9.2f} µs  "
+              f"{naive_us:>9.2f} µs  {engine.active_count:>7,}")
+
+    print("")
+    print("  ✅ Incremental rule states match a full re-test")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Batch Validation Benchmark for TopDeck Config Validator
+Validates random candidate configs for every rule set with validate_config
+one dict at a time and with the compiled batch validator, and reports
+configs/sec for each plus the cost of materializing ValidationResults for
+failing rows. Checks that both report the same results.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from batch_validation import CompiledRules  # noqa: E402
+from config_validator import ConfigValidator  # noqa: E402
+
+
+def candidates(rules: CompiledRules, count: int, seed: int) -> np.ndarray:
+    """Uniform over each range plus 25% either side, with 2% of cells missing"""
+    rng = np.random.default_rng(seed)
+    margin = (rules.high - rules.low) * 0.25
+    matrix = rng.uniform(rules.low - margin, rules.high + margin, size=(count, len(rules.fields)))
+    matrix[rng.random(matrix.shape) < 0.02] = np.nan
+    return matrix
+
+
+def as_dicts(rules: CompiledRules, matrix: np.ndarray, seed: int) -> list:
+    """Rows as config dicts, with the keys of every other one shuffled"""
+    rng = np.random.default_rng(seed)
+    dicts = []
+    for index, row in enumerate(matrix):
+        items = [(name, value) for name, value in zip(rules.fields, row.tolist()) if value == value]
+        if index % 2:
+            items = [items[i] for i in rng.permutation(len(items))]
+        dicts.append(dict(items))
+    return dicts
+
+
+def main():
+    """Run the batch validation benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--configs", type=int, default=2_000_000, help="candidates per rule set, batch")
+    parser.add_argument("--loop-configs", type=int, default=20_000, help="candidates per rule set, per dict")
+    parser.add_argument("--materialize", type=int, default=10_000, help="failing rows turned into results")
+    args = parser.parse_args()
+
+    validator = ConfigValidator()
+    print("=" * 60)
+    print("BATCH VALIDATION BENCHMARK")
+    print("=" * 60)
+    print(f"  {'Rule set':<16} {'fields':>6} {'per dict':>12} {'batch':>14} {'speedup':>8} {'results':>12}")
+
+    failed = False
+    for config_type in validator.rules:
+        rules = validator.compile_rules(config_type)
+        matrix = candidates(rules, args.configs, seed=len(config_type))
+
+        dicts = as_dicts(rules, matrix[:args.loop_configs], seed=len(config_type))
+        start = time.perf_counter()
+        expected = [[(r.level, r.field, r.message) for r in validator.validate_config(config_type, config)]
+                    for config in dicts]
+        loop_rate = len(dicts) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = rules.validate(matrix)
+        batch_rate = len(matrix) / (time.perf_counter() - start)
+
+        failing = np.flatnonzero(~batch.passed)[:args.materialize]
+        start = time.perf_counter()
+        for row in failing:
+            batch.results(int(row))
+        materialize_rate = len(failing) / (time.perf_counter() - start) if len(failing) else 0.0
+
+        got = [[(r.level, r.field, r.message) for r in batch.results(row, dicts[row])]
+               for row in range(len(dicts))]
+        if got != expected:
+            failed = True
+            print(f"  ❌ {config_type}: batch results differ from validate_config")
+        print(f"  {config_type:<16} {len(rules.fields):>6} {loop_rate / 1e3:>9.0f}k/s {batch_rate / 1e6:>11.1f}M/s "
+              f"{batch_rate / loop_rate:>7.0f}x {materialize_rate / 1e3:>9.0f}k/s")
+
+    print("")
+    print(f"  per dict: validate_config on {args.loop_configs:,} dicts; batch: {args.configs:,}-row matrix;")
+    print("  results: ValidationResults materialized per second for failing rows")
+    print("")
+    if failed:
+        print("  ❌ Batch results differ from validate_config")
+    else:
+        print(f"  ✅ Batch results identical to validate_config on {args.loop_configs:,} candidates per rule set")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
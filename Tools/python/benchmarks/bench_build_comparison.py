@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Build Comparison Benchmark for TopDeck Stats Dashboard
+Self-check of the bootstrap confidence intervals behind the build gate:
+compares synthetic baseline/candidate session samples whose true change
+is known, and reports how often the interval covers it, how often an
+unchanged build is flagged as a regression and how often a real one is
+caught. Also times the chunked bootstrap against one resample at a time.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+from build_comparison import bootstrap, compare_samples  # noqa: E402
+
+
+def sessions(rng: np.random.Generator, count: int, scale: float) -> np.ndarray:
+    """Per-session p95 frame times (ms); scaling them scales the true median exactly"""
+    return scale * rng.lognormal(mean=np.log(18.0), sigma=0.25, size=count)
+
+
+def trial_rates(rng: np.random.Generator, trials: int, samples: int, change: float,
+                confidence: float, threshold: float, resamples: int):
+    """(CI coverage, regression rate) over ``trials`` comparisons with a true ``change``"""
+    covered = flagged = 0
+    for _ in range(trials):
+        comparison = compare_samples(
+            "frame_time_p95_ms", sessions(rng, samples, 1.0), sessions(rng, samples, 1.0 + change),
+            True, "median", confidence, threshold, resamples, rng
+        )
+        covered += comparison.ci_low <= change <= comparison.ci_high
+        flagged += comparison.regression
+    return covered / trials, flagged / trials
+
+
+def naive_bootstrap(values: np.ndarray, resamples: int, rng: np.random.Generator) -> np.ndarray:
+    return np.array([np.median(rng.choice(values, size=len(values))) for _ in range(resamples)])
+
+
+def main():
+    """Run the build comparison benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=60, help="sessions per build in each trial")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    print("=" * 60)
+    print("BUILD COMPARISON BENCHMARK")
+    print("=" * 60)
+    print(f"  {args.trials} trials of {args.samples} vs. {args.samples} sessions, "
+          f"{args.confidence:.0%} CI, {args.resamples:,} resamples")
+    print("")
+
+    coverage, false_alarms = trial_rates(rng, args.trials, args.samples, 0.0,
+                                         args.confidence, 0.02, args.resamples)
+    regressed_coverage, caught = trial_rates(rng, args.trials, args.samples, 0.10,
+                                             args.confidence, 0.02, args.resamples)
+    print(f"  CI coverage, no change:       {coverage:>8.1%}")
+    print(f"  CI coverage, +10% frame time: {regressed_coverage:>8.1%}")
+    print(f"  False regressions, no change: {false_alarms:>8.1%}")
+    print(f"  Regressions caught, +10%:     {caught:>8.1%}")
+
+    values = sessions(rng, 1000, 1.0)
+    start = time.perf_counter()
+    naive_bootstrap(values, args.resamples, rng)
+    naive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    bootstrap(values, "median", args.resamples, rng)
+    chunked_time = time.perf_counter() - start
+    print("")
+    print(f"  Bootstrap of 1,000 sessions, one resample at a time: {naive_time * 1000:>8.1f} ms")
+    print(f"  Bootstrap of 1,000 sessions, chunked:                {chunked_time * 1000:>8.1f} ms")
+    print(f"  Speedup:                                             {naive_time / chunked_time:>8.1f}x")
+
+    # Percentile intervals run slightly narrow on small samples; allow for
+    # that and for the trial count's own sampling error
+    slack = 0.05 + 2.0 * np.sqrt(args.confidence * (1 - args.confidence) / args.trials)
+    failures = []
+    if min(coverage, regressed_coverage) < args.confidence - slack:
+        failures.append("confidence intervals cover the true change too rarely")
+    if false_alarms > (1.0 - args.confidence) / 2 + slack:
+        failures.append("unchanged builds are flagged as regressions too often")
+    print("")
+    if failures:
+        for failure in failures:
+            print(f"  ❌ {failure.capitalize()}")
+    else:
+        print("  ✅ Interval coverage and false-regression rate are as expected")
+    print("=" * 60)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Concurrent Dashboard Stress Test for TopDeck Stats Dashboard
+Runs several producer threads recording kills, damage and frame times while
+a reader thread polls get_summary, through ConcurrentDashboard's per-thread
+buffers and through one big lock around a plain StatsDashboard. Checks that
+no count is lost and that reads never go backwards, and reports producer
+and end-to-end throughput and reader polls/sec as producers are added.
+Finally one producer sends a value the dashboard rejects, which must be
+dropped without stopping the flusher or losing the calls around it.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from concurrent_dashboard import ConcurrentDashboard  # noqa: E402
+from stats_dashboard import StatCategory, StatsDashboard  # noqa: E402
+
+DAMAGE_PER_KILL = 2.5
+FRAME_EVERY = 100
+
+
+class BigLockDashboard:
+    """The alternative: every call on a shared dashboard under one lock"""
+
+    def __init__(self, dashboard: StatsDashboard):
+        self.dashboard = dashboard
+        self.lock = threading.Lock()
+
+    def record_stat(self, category, name, value, unit=""):
+        with self.lock:
+            self.dashboard.record_stat(category, name, value, unit)
+
+    def update_fps(self, delta_time):
+        with self.lock:
+            self.dashboard.update_fps(delta_time)
+
+    def get_summary(self):
+        with self.lock:
+            return self.dashboard.get_summary()
+
+
+def produce(target, kills: int, barrier: threading.Barrier, bad_at: int = -1):
+    barrier.wait()
+    for i in range(kills):
+        target.record_stat(StatCategory.COMBAT, "enemy_killed", 1)
+        target.record_stat(StatCategory.COMBAT, "damage_dealt", DAMAGE_PER_KILL)
+        if i == bad_at:
+            # Not a number: fails in the session totals
+            target.record_stat(StatCategory.COMBAT, "damage_dealt", "lots")
+        if i % FRAME_EVERY == 0:
+            target.update_fps(0.016)
+
+
+def read(target, done: threading.Event, report: dict):
+    """Poll summaries; kills must never go backwards and damage must match whole flushes"""
+    last = 0
+    while not done.is_set():
+        session = target.get_summary()["session"]
+        kills = session["enemies_killed"]
+        if kills < last:
+            report["errors"].append(f"kills went back from {last} to {kills}")
+        last = kills
+        report["reads"] += 1
+        time.sleep(0.001)
+
+
+def run(mode: str, producers: int, kills: int, bad_value: bool = False) -> dict:
+    dashboard = StatsDashboard(history_size=100_000)
+    dashboard.start_session("stress")
+    target = ConcurrentDashboard(dashboard) if mode == "buffered" else BigLockDashboard(dashboard)
+    if mode == "buffered":
+        target.start()
+
+    barrier = threading.Barrier(producers + 1)
+    done = threading.Event()
+    report = {"reads": 0, "errors": []}
+    reader = threading.Thread(target=read, args=(target, done, report))
+    threads = [threading.Thread(target=produce, args=(target, kills, barrier, kills // 2 if bad_value and n == 0 else -1))
+               for n in range(producers)]
+    reader.start()
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    produced = time.perf_counter() - start
+    if mode == "buffered":
+        if not target._flusher.is_alive():
+            report["errors"].append("the flusher thread died")
+        target.stop()
+        if target.failed_calls != (1 if bad_value else 0):
+            report["errors"].append(f"{target.failed_calls} calls failed, {1 if bad_value else 0} expected")
+    elapsed = time.perf_counter() - start
+    done.set()
+    reader.join()
+
+    session = dashboard.current_session
+    expected_kills = producers * kills
+    frames = producers * ((kills + FRAME_EVERY - 1) // FRAME_EVERY)
+    if session.enemies_killed != expected_kills:
+        report["errors"].append(f"{session.enemies_killed:,} kills recorded, {expected_kills:,} expected")
+    if session.total_damage_dealt != expected_kills * DAMAGE_PER_KILL:
+        report["errors"].append(f"damage {session.total_damage_dealt} != {expected_kills * DAMAGE_PER_KILL}")
+    if dashboard.frame_stats.frames != frames:
+        report["errors"].append(f"{dashboard.frame_stats.frames:,} frames recorded, {frames:,} expected")
+    calls = 2 * expected_kills + frames
+    report["call_rate"] = calls / produced
+    report["rate"] = calls / elapsed
+    report["reads_per_second"] = report["reads"] / elapsed
+    return report
+
+
+def main():
+    """Run the concurrent dashboard stress test"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kills", type=int, default=100_000, help="kills recorded per producer")
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CONCURRENT DASHBOARD STRESS TEST")
+    print("=" * 60)
+    print(f"  {args.kills:,} kills + damage per producer, one frame per {FRAME_EVERY} kills, 1 reader")
+    print("")
+    print(f"  {'':>9}  {'--- per-thread buffers ---':^26}  {'------ big lock ------':^22}")
+    print(f"  {'Producers':>9}  {'calls':>8} {'applied':>8} {'reads':>8}  {'calls':>8} {'reads':>8}")
+
+    failed = False
+    for producers in args.producers:
+        buffered = run("buffered", producers, args.kills)
+        locked = run("locked", producers, args.kills)
+        print(f"  {producers:>9}  {buffered['call_rate'] / 1e3:>6.0f}k/s {buffered['rate'] / 1e3:>6.0f}k/s "
+              f"{buffered['reads_per_second']:>6.0f}/s  {locked['rate'] / 1e3:>6.0f}k/s "
+              f"{locked['reads_per_second']:>6.0f}/s")
+        for mode, report in (("buffered", buffered), ("big lock", locked)):
+            for error in report["errors"]:
+                print(f"  ❌ {mode}, {producers} producers: {error}")
+                failed = True
+
+    # The rejected call is logged with a traceback; keep it out of the table
+    logging.disable(logging.ERROR)
+    try:
+        poisoned = run("buffered", 2, args.kills, bad_value=True)
+    finally:
+        logging.disable(logging.NOTSET)
+    print(f"  {'1 bad':>9}  {poisoned['call_rate'] / 1e3:>6.0f}k/s {poisoned['rate'] / 1e3:>6.0f}k/s "
+          f"{poisoned['reads_per_second']:>6.0f}/s  (2 producers, one value rejected)")
+    for error in poisoned["errors"]:
+        print(f"  ❌ buffered, one bad value: {error}")
+        failed = True
+
+    print("")
+    print("  calls: producer-side writes/s; applied: writes/s until flushed into the dashboard")
+    print("")
+    if failed:
+        print("  ❌ Lost or inconsistent counts")
+    else:
+        print("  ✅ No lost counts; reads never went backwards")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
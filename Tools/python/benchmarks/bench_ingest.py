@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Batch Ingestion Benchmark for TopDeck Stats Dashboard
+Replays a synthetic NDJSON game log through one-at-a-time record_stat calls
+and through the batch entry points (ingest_ndjson, record_many), checks that
+both produce the same session totals, and reports events/sec.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from stats_dashboard import StatsDashboard, StatCategory  # noqa: E402
+
+# (category, name, value) cycle resembling a busy wave
+EVENT_PATTERN = [
+    ("Combat", "damage_dealt", 12.5),
+    ("Combat", "damage_dealt", 40.0),
+    ("Combat", "enemy_killed", 1),
+    ("Economy", "money_earned", 25),
+    ("Combat", "damage_taken", 3.25),
+    ("Combat", "accuracy", 71.5),
+    ("Economy", "money_spent", 150),
+    ("Upgrades", "upgrade_purchased", 1),
+    ("Defenders", "defender_lost", 1),
+    ("Waves", "wave_completed", 7),
+]
+
+
+def write_synthetic_log(path: str, count: int, start_time: float = 1_700_000_000.0):
+    """Write ``count`` NDJSON events to ``path``"""
+    with open(path, "w") as out:
+        lines = []
+        for i in range(count):
+            category, name, value = EVENT_PATTERN[i % len(EVENT_PATTERN)]
+            lines.append(
+                f'{{"timestamp":{start_time + i * 0.001:.3f},"category":"{category}",'
+                f'"name":"{name}","value":{value}}}\n'
+            )
+            if len(lines) >= 100_000:
+                out.writelines(lines)
+                lines.clear()
+        out.writelines(lines)
+
+
+def new_dashboard() -> StatsDashboard:
+    dashboard = StatsDashboard()
+    dashboard.start_session("bench")
+    return dashboard
+
+
+def session_totals(dashboard: StatsDashboard) -> dict:
+    session = dashboard.current_session
+    return {
+        "waves_completed": session.waves_completed,
+        "highest_wave": session.highest_wave,
+        "enemies_killed": session.enemies_killed,
+        "defenders_lost": session.defenders_lost,
+        "money_earned": session.money_earned,
+        "money_spent": session.money_spent,
+        "upgrades_purchased": session.upgrades_purchased,
+        "total_damage_dealt": session.total_damage_dealt,
+        "total_damage_taken": session.total_damage_taken,
+    }
+
+
+def run_per_event(path: str, limit: int) -> tuple:
+    """Parse and record one line at a time, as a log replay does today"""
+    dashboard = new_dashboard()
+    start = time.perf_counter()
+    with open(path) as log:
+        for line in islice(log, limit):
+            record = json.loads(line)
+            dashboard.record_stat(StatCategory(record["category"]), record["name"],
+                                  record["value"], record.get("unit", ""))
+    return dashboard, time.perf_counter() - start
+
+
+def run_ndjson(path: str, limit: int) -> tuple:
+    dashboard = new_dashboard()
+    start = time.perf_counter()
+    with open(path) as log:
+        dashboard.ingest_ndjson(islice(log, limit))
+    return dashboard, time.perf_counter() - start
+
+
+def run_record_many(count: int, batch_size: int = 65536) -> float:
+    """Events/sec for pre-parsed columns fed through record_many"""
+    dashboard = new_dashboard()
+    pattern = [(StatCategory(c), n, v) for c, n, v in EVENT_PATTERN]
+    batch = [pattern[i % len(pattern)] for i in range(batch_size)]
+    categories, names, values = (list(column) for column in zip(*batch))
+    timestamps = [float(i) for i in range(batch_size)]
+
+    start = time.perf_counter()
+    done = 0
+    while done < count:
+        dashboard.record_many(categories, names, values, timestamps=timestamps)
+        done += batch_size
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    """Run the ingestion benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10_000_000,
+                        help="size of the synthetic log")
+    parser.add_argument("--baseline-events", type=int, default=1_000_000,
+                        help="events replayed through record_stat (the slow path)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.ndjson")
+        print("=" * 60)
+        print("BATCH INGESTION BENCHMARK")
+        print("=" * 60)
+        print(f"  Writing {args.events:,} synthetic events...")
+        write_synthetic_log(path, args.events)
+        print(f"  Log size: {os.path.getsize(path) / 1e6:,.1f} MB")
+        print("")
+
+        baseline_count = min(args.events, args.baseline_events)
+        per_event, per_event_time = run_per_event(path, baseline_count)
+        batched, _ = run_ndjson(path, baseline_count)
+        if session_totals(per_event) != session_totals(batched):
+            print("  ❌ Batch totals differ from per-event totals")
+            return 1
+        print(f"  ✅ Session totals match over {baseline_count:,} events")
+        print("")
+
+        _, ndjson_time = run_ndjson(path, args.events)
+        per_event_rate = baseline_count / per_event_time
+        ndjson_rate = args.events / ndjson_time
+        columns_rate = run_record_many(args.events)
+
+        print(f"  record_stat per line: {per_event_rate:>12,.0f} events/sec")
+        print(f"  ingest_ndjson:        {ndjson_rate:>12,.0f} events/sec "
+              f"({ndjson_time:.1f}s for {args.events:,})")
+        print(f"  record_many columns:  {columns_rate:>12,.0f} events/sec")
+        print(f"  NDJSON speedup:       {ndjson_rate / per_event_rate:>12.2f}x")
+        print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
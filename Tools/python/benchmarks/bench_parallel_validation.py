@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Parallel Validation Benchmark for TopDeck Config Validator
+Generates a synthetic Unity project of 10k assets and validates it cold
+(no caches) with 1, 2, 4, ... worker processes, both as a whole project
+and as a plain list of asset files. Reports the speedup over one job and
+checks that every job count produces the same results in the same order.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_project_validation import make_project  # noqa: E402
+from config_validator import ConfigValidator  # noqa: E402
+from project_validator import ProjectValidator  # noqa: E402
+
+
+def project_run(root: str, jobs: int) -> tuple:
+    start = time.perf_counter()
+    report = ProjectValidator(root).validate(jobs)
+    results = [(path, result.level, result.field, result.message)
+               for path, results in report.results.items() for result in results]
+    return time.perf_counter() - start, results
+
+
+def files_run(paths: list, jobs: int) -> tuple:
+    start = time.perf_counter()
+    results = ConfigValidator().validate_assets(paths, jobs)
+    return time.perf_counter() - start, [(result.level, result.field, result.message) for result in results]
+
+
+def default_jobs() -> list:
+    cores = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= max(cores, 2):
+        jobs.append(jobs[-1] * 2)
+    if cores > jobs[-1]:
+        jobs.append(cores)
+    return jobs
+
+
+def main():
+    """Run the parallel validation benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=10_000, help="config assets (plus 100 shared ones)")
+    parser.add_argument("--jobs", type=int, nargs="+", default=default_jobs())
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="topdeck_parallel_")
+    print("=" * 60)
+    print("PARALLEL VALIDATION BENCHMARK")
+    print("=" * 60)
+    try:
+        project = make_project(root, args.assets, invalid_every=50)
+        print(f"  {args.assets:,} configs + 100 shared assets, {os.cpu_count()} cores available")
+        print("")
+        print(f"  {'Jobs':>4}  {'project':>8} {'speedup':>8}  {'files':>8} {'speedup':>8}")
+
+        failed = False
+        baseline = None
+        for jobs in args.jobs:
+            project_seconds, project_results = project_run(root, jobs)
+            files_seconds, files_results = files_run(project["configs"], jobs)
+            if baseline is None:
+                baseline = (project_seconds, project_results, files_seconds, files_results)
+            same = project_results == baseline[1] and files_results == baseline[3]
+            failed |= not same
+            print(f"  {jobs:>4}  {project_seconds:>7.2f}s {baseline[0] / project_seconds:>7.2f}x  "
+                  f"{files_seconds:>7.2f}s {baseline[2] / files_seconds:>7.2f}x"
+                  + ("" if same else "  ❌ results differ from 1 job"))
+
+        errors = sum(1 for result in baseline[3] if result[0].value == "ERROR")
+        print("")
+        if failed:
+            print("  ❌ Results depend on the job count")
+        else:
+            print(f"  ✅ Identical results in identical order for every job count ({errors} errors found)")
+        print("=" * 60)
+        return 1 if failed else 0
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
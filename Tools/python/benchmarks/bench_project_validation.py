@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Project Validation Benchmark for TopDeck Config Validator
+Generates a synthetic Unity project of ProceduralVariantConfig assets that
+reference shared ScriptableObjects, which reference textures, and times
+project validation cold, unchanged, after editing one config and after
+editing one texture. Checks that exactly the affected assets are
+re-validated each time.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from project_validator import ProjectValidator  # noqa: E402
+from unity_yaml import default_cache_path  # noqa: E402
+
+SCRIPT_GUID = "7d60c148dd404c1639c6508d7e6b4f9a"
+SHARED_SCRIPT_GUID = "4f1c0e8a2b7d4e6f9a0b1c2d3e4f5a6b"
+
+CONFIG_TEMPLATE = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!114 &11400000
+MonoBehaviour:
+  m_ObjectHideFlags: 0
+  m_CorrespondingSourceObject: {{fileID: 0}}
+  m_PrefabInstance: {{fileID: 0}}
+  m_PrefabAsset: {{fileID: 0}}
+  m_GameObject: {{fileID: 0}}
+  m_Enabled: 1
+  m_EditorHideFlags: 0
+  m_Script: {{fileID: 11500000, guid: {script}, type: 3}}
+  m_Name: {name}
+  m_EditorClassIdentifier: Assembly-CSharp::ProceduralVariantConfig
+  palette: {{fileID: 11400000, guid: {shared}, type: 2}}
+  healthRange: {{x: {health_low}, y: {health_high}}}
+  speedRange: {{x: 0.8, y: 1.4}}
+  damageRange: {{x: 0.9, y: 2.5}}
+  eliteChanceCurve:
+    serializedVersion: 2
+    m_Curve:
+{keys}    m_PreInfinity: 2
+    m_PostInfinity: 2
+    m_RotationOrder: 4
+"""
+
+KEY_TEMPLATE = """    - serializedVersion: 3
+      time: {time}
+      value: {value}
+      inSlope: 0
+      outSlope: 0
+      tangentMode: 0
+      weightedMode: 0
+      inWeight: 0.33333334
+      outWeight: 0.33333334
+"""
+
+SHARED_TEMPLATE = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!114 &11400000
+MonoBehaviour:
+  m_ObjectHideFlags: 0
+  m_GameObject: {{fileID: 0}}
+  m_Enabled: 1
+  m_Script: {{fileID: 11500000, guid: {script}, type: 3}}
+  m_Name: {name}
+  m_EditorClassIdentifier: Assembly-CSharp::EnemyPalette
+  texture: {{fileID: 2800000, guid: {texture}, type: 3}}
+  tint: {{r: 1, g: 0.5, b: 0.25, a: 1}}
+"""
+
+META_TEMPLATE = "fileFormatVersion: 2\nguid: {guid}\nNativeFormatImporter:\n  mainObjectFileID: 11400000\n"
+
+
+def _guid(rng: random.Random) -> str:
+    return "%032x" % rng.getrandbits(128)
+
+
+def _write(path: str, text, guid: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if isinstance(text, bytes) else "w") as out:
+        out.write(text)
+    with open(path + ".meta", "w") as meta:
+        meta.write(META_TEMPLATE.format(guid=guid))
+
+
+def config_text(name: str, shared: str, rng: random.Random, invalid: bool = False) -> str:
+    times = [0, 0.25, 0.5, 0.75, 1]
+    chance = sorted(round(rng.uniform(0.0, 0.9), 3) for _ in times)
+    if invalid:
+        chance.reverse()
+    keys = "".join(KEY_TEMPLATE.format(time=t, value=v) for t, v in zip(times, chance))
+    health_low = rng.uniform(0.1, 0.4) if invalid else rng.uniform(0.5, 1.0)
+    health_high = rng.uniform(5.5, 8.0) if invalid else rng.uniform(1.5, 4.5)
+    return CONFIG_TEMPLATE.format(script=SCRIPT_GUID, name=name, shared=shared, keys=keys,
+                                  health_low=round(health_low, 2), health_high=round(health_high, 2))
+
+
+def make_project(root: str, configs: int, shared: int = 100, seed: int = 22, invalid_every: int = 0) -> dict:
+    """A project with ``configs`` config assets, config i referencing shared asset i % ``shared``.
+
+    Every ``invalid_every``-th config has a health range outside both
+    bounds and a decreasing elite chance curve.
+    """
+    rng = random.Random(seed)
+    assets = os.path.join(root, "Assets")
+    _write(os.path.join(assets, "Scripts", "ProceduralVariantConfig.cs"), "class ProceduralVariantConfig {}\n",
+           SCRIPT_GUID)
+    _write(os.path.join(assets, "Scripts", "EnemyPalette.cs"), "class EnemyPalette {}\n", SHARED_SCRIPT_GUID)
+
+    shared_guids = []
+    textures = []
+    for j in range(shared):
+        texture_guid, shared_guid = _guid(rng), _guid(rng)
+        texture = os.path.join(assets, "Art", f"Palette{j:03d}.png")
+        _write(texture, rng.randbytes(4096), texture_guid)
+        _write(os.path.join(assets, "Shared", f"Palette{j:03d}.asset"),
+               SHARED_TEMPLATE.format(script=SHARED_SCRIPT_GUID, name=f"Palette{j:03d}", texture=texture_guid),
+               shared_guid)
+        shared_guids.append(shared_guid)
+        textures.append(texture)
+
+    config_paths = []
+    for i in range(configs):
+        name = f"Variant{i:05d}"
+        path = os.path.join(assets, "Configs", f"Group{i // 500:02d}", f"{name}.asset")
+        invalid = invalid_every > 0 and i % invalid_every == 0
+        _write(path, config_text(name, shared_guids[i % shared], rng, invalid), _guid(rng))
+        config_paths.append(path)
+    return {"configs": config_paths, "textures": textures, "shared": shared}
+
+
+def timed_run(root: str) -> tuple:
+    start = time.perf_counter()
+    with ProjectValidator(root, default_cache_path(root, "validation_cache.pickle"),
+                          default_cache_path(root)) as validator:
+        report = validator.validate()
+    return report, time.perf_counter() - start
+
+
+def main():
+    """Run the project validation benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--configs", type=int, default=10_000)
+    parser.add_argument("--shared", type=int, default=100)
+    parser.add_argument("--keep", help="generate the project here and keep it")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="topdeck_project_")
+    print("=" * 60)
+    print("PROJECT VALIDATION BENCHMARK")
+    print("=" * 60)
+    start = time.perf_counter()
+    project = make_project(root, args.configs, args.shared)
+    print(f"  Generated {args.configs:,} configs, {args.shared} shared assets and textures "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("")
+
+    failed = False
+    rng = random.Random(1)
+
+    def check(label: str, expected: int):
+        nonlocal failed
+        report, seconds = timed_run(root)
+        ok = len(report.validated) == expected and len(report.results) == args.configs
+        failed |= not ok
+        print(f"  {'✅' if ok else '❌'} {label:<28} {seconds:>7.3f}s  "
+              f"{len(report.validated):>6,} validated (expected {expected:,}), {report.reused:,} unchanged")
+
+    check("Cold run", args.configs)
+    check("Nothing changed", 0)
+
+    # Let the edits below land outside the cache's racy-mtime window
+    time.sleep(2.1)
+    config = project["configs"][rng.randrange(args.configs)]
+    with open(config, "a") as out:
+        out.write("  m_RotationOrder: 4\n")
+    check("One config edited", 1)
+
+    texture = project["textures"][0]
+    with open(texture, "r+b") as out:
+        out.write(b"\xff" * 16)
+    dependents = len(range(0, args.configs, args.shared))
+    check("One shared texture edited", dependents)
+
+    os.utime(project["configs"][0])
+    check("One config touched, same", 0)
+
+    print("=" * 60)
+    if not args.keep:
+        shutil.rmtree(root)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Session Analytics Benchmark for TopDeck Stats Dashboard
+Computes cross-session balance distributions (wave duration by wave,
+kills/min by upgrade count, cost per kill by highest wave) for synthetic
+playtest sessions with SessionTable and with a per-session Python loop,
+checks that both agree, and reports the time for each.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+from session_analytics import SessionTable, WaveTable, naive_group_by  # noqa: E402
+from session_archive import SessionArchive  # noqa: E402
+from stats_dashboard import GameSession, StatCategory  # noqa: E402
+
+METRIC_TABLE = [(StatCategory.WAVES, "wave_completed"), (StatCategory.WAVES, "wave_duration")]
+
+
+def synthetic_sessions(count: int, seed: int = 7):
+    """Sessions plus their (wave, duration) lists"""
+    rng = random.Random(seed)
+    sessions, waves = [], []
+    for i in range(count):
+        highest = rng.randint(1, 40)
+        durations = [20.0 + wave * 1.5 + rng.expovariate(0.2) for wave in range(1, highest + 1)]
+        kills = sum(10 + wave * 3 for wave in range(1, highest + 1)) - rng.randint(0, 20)
+        start = 1_700_000_000.0 + i * 3600.0
+        sessions.append(GameSession(
+            start_time=start,
+            end_time=start + sum(durations),
+            waves_completed=highest,
+            enemies_killed=max(0, kills),
+            money_earned=kills * 12,
+            money_spent=int(kills * 12 * rng.uniform(0.5, 1.0)),
+            upgrades_purchased=rng.randint(0, highest // 2),
+            highest_wave=highest,
+            session_id=f"playtest_{i:06d}"
+        ))
+        waves.append(list(enumerate(durations, start=1)))
+    return sessions, waves
+
+
+def naive_analysis(sessions, waves):
+    wave_groups = {}
+    for session_waves in waves:
+        for wave, duration in session_waves:
+            wave_groups.setdefault(wave, []).append(duration)
+    wave_rows = naive_group_by(
+        [(wave, d) for wave, durations in wave_groups.items() for d in durations],
+        key=lambda row: row[0], value=lambda row: row[1]
+    )
+    kpm = naive_group_by(
+        sessions, key=lambda s: s.upgrades_purchased,
+        value=lambda s: s.enemies_killed / (s.duration() / 60.0) if s.duration() > 0 else None
+    )
+    cpk = naive_group_by(
+        sessions, key=lambda s: s.highest_wave,
+        value=lambda s: s.money_spent / s.enemies_killed if s.enemies_killed > 0 else None
+    )
+    return wave_rows, kpm, cpk
+
+
+def vectorized_analysis(table: SessionTable):
+    return (table.wave_duration_by_wave(), table.kills_per_minute_by_upgrades(),
+            table.cost_per_kill_by_highest_wave())
+
+
+def agrees(distribution, naive) -> bool:
+    for row in distribution.rows():
+        expected = naive[row[distribution.key]]
+        for name, value in expected.items():
+            if not math.isclose(row[name], value, rel_tol=1e-9, abs_tol=1e-9):
+                return False
+    return len(distribution) == len(naive)
+
+
+def write_archive(path: str, sessions, waves):
+    with SessionArchive(path) as archive:
+        for session, session_waves in zip(sessions, waves):
+            count = len(session_waves) * 2
+            values = array("d")
+            for wave, duration in session_waves:
+                values.append(wave)
+                values.append(duration)
+            archive.append(session, (
+                array("d", [session.start_time] * count),
+                values,
+                array("I", [0, 1] * len(session_waves)),
+                array("H", [0] * count),
+            ), METRIC_TABLE, [""])
+
+
+def main():
+    """Run the session analytics benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20_000)
+    args = parser.parse_args()
+
+    sessions, waves = synthetic_sessions(args.sessions)
+    wave_count = sum(len(w) for w in waves)
+
+    print("=" * 60)
+    print("SESSION ANALYTICS BENCHMARK")
+    print("=" * 60)
+    print(f"  Sessions: {args.sessions:,}  Waves: {wave_count:,}")
+    print("")
+
+    start = time.perf_counter()
+    naive = naive_analysis(sessions, waves)
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = SessionTable.from_sessions(sessions)
+    table.waves = WaveTable(
+        session_index=np.repeat(np.arange(len(waves)), [len(w) for w in waves]),
+        wave=np.fromiter((wave for w in waves for wave, _ in w), dtype=np.int64, count=wave_count),
+        duration=np.fromiter((d for w in waves for _, d in w), dtype=np.float64, count=wave_count)
+    )
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = vectorized_analysis(table)
+    query_time = time.perf_counter() - start
+
+    if not all(agrees(v, n) for v, n in zip(vectorized, naive)):
+        print("  ❌ Vectorized distributions differ from the per-session loop")
+        return 1
+    print("  ✅ Vectorized distributions match the per-session loop")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive")
+        write_archive(path, sessions, waves)
+        start = time.perf_counter()
+        with SessionArchive(path) as archive:
+            archived = vectorized_analysis(SessionTable.from_archive(archive))
+        archive_time = time.perf_counter() - start
+    if not all(agrees(v, n) for v, n in zip(archived, naive)):
+        print("  ❌ Archive distributions differ from the per-session loop")
+        return 1
+
+    print("")
+    print(f"  Per-session loop:          {naive_time * 1000:>10.1f} ms")
+    print(f"  SessionTable build:        {build_time * 1000:>10.1f} ms")
+    print(f"  SessionTable group-bys:    {query_time * 1000:>10.1f} ms")
+    print(f"  Open archive + group-bys:  {archive_time * 1000:>10.1f} ms")
+    print(f"  Group-by speedup:          {naive_time / query_time:>10.1f}x")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Session Archive Benchmark for TopDeck Stats Dashboard
+Builds a synthetic archive of GameSession summaries, then times reopening
+it and querying by session_id and start_time against reloading the same
+sessions from a JSON export.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from array import array
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from session_archive import SessionArchive  # noqa: E402
+from stats_dashboard import GameSession, StatCategory  # noqa: E402
+
+START_TIME = 1_700_000_000.0
+SESSION_GAP = 900.0
+EVENTS_PER_SESSION = 16
+METRIC_TABLE = [(StatCategory.COMBAT, "damage_dealt"), (StatCategory.ECONOMY, "money_earned")]
+UNIT_TABLE = [""]
+
+
+def synthetic_session(i: int) -> GameSession:
+    start = START_TIME + i * SESSION_GAP
+    return GameSession(
+        start_time=start,
+        end_time=start + 600.0,
+        waves_completed=i % 30,
+        enemies_killed=i % 30 * 25,
+        money_earned=i % 30 * 400,
+        money_spent=i % 30 * 350,
+        highest_wave=i % 30,
+        total_damage_dealt=i % 30 * 1250.0,
+        session_id=f"session_{i:07d}"
+    )
+
+
+def synthetic_events(session: GameSession) -> tuple:
+    count = EVENTS_PER_SESSION
+    return (
+        array("d", [session.start_time + j for j in range(count)]),
+        array("d", [float(j) for j in range(count)]),
+        array("I", [j % len(METRIC_TABLE) for j in range(count)]),
+        array("H", [0] * count),
+    )
+
+
+def best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the session archive benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    sessions = [synthetic_session(i) for i in range(args.sessions)]
+    probe_ids = [sessions[(i * 7919) % args.sessions].session_id for i in range(args.lookups)]
+    window = (START_TIME + args.sessions // 2 * SESSION_GAP, START_TIME + (args.sessions // 2 + 96) * SESSION_GAP)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, "archive")
+        json_path = os.path.join(tmp, "sessions.json")
+
+        print("=" * 60)
+        print("SESSION ARCHIVE BENCHMARK")
+        print("=" * 60)
+        print(f"  Writing {args.sessions:,} sessions ({EVENTS_PER_SESSION} events each)...")
+        start = time.perf_counter()
+        with SessionArchive(archive_path) as archive:
+            for session in sessions:
+                archive.append(session, synthetic_events(session), METRIC_TABLE, UNIT_TABLE)
+        append_rate = args.sessions / (time.perf_counter() - start)
+        with open(json_path, "w") as out:
+            json.dump([asdict(session) for session in sessions], out)
+
+        archive_bytes = sum(os.path.getsize(os.path.join(archive_path, name))
+                            for name in os.listdir(archive_path))
+        print(f"  Archive size: {archive_bytes / 1e6:,.1f} MB  "
+              f"JSON size: {os.path.getsize(json_path) / 1e6:,.1f} MB")
+        print("")
+
+        def open_archive():
+            SessionArchive(archive_path).close()
+
+        def open_json():
+            with open(json_path) as source:
+                [GameSession(**record) for record in json.load(source)]
+
+        def query_archive():
+            with SessionArchive(archive_path) as archive:
+                found = [archive.get(session_id) for session_id in probe_ids]
+                in_window = archive.find_by_start(*window)
+                archive.events(in_window[0])
+            assert all(found) and len(in_window) == 97
+
+        def query_json():
+            with open(json_path) as source:
+                loaded = [GameSession(**record) for record in json.load(source)]
+            by_id = {session.session_id: session for session in loaded}
+            found = [by_id.get(session_id) for session_id in probe_ids]
+            in_window = [s for s in loaded if window[0] <= s.start_time <= window[1]]
+            assert all(found) and len(in_window) == 97
+
+        open_time = best_of(5, open_archive)
+        json_open_time = best_of(3, open_json)
+        query_time = best_of(5, query_archive)
+        json_query_time = best_of(3, query_json)
+
+        print(f"  Append rate:              {append_rate:>12,.0f} sessions/sec")
+        print(f"  Open archive:             {open_time * 1000:>12.2f} ms")
+        print(f"  Reload JSON export:       {json_open_time * 1000:>12.2f} ms")
+        print(f"  Open + {args.lookups:,} id lookups + start-time range:")
+        print(f"    archive:                {query_time * 1000:>12.2f} ms")
+        print(f"    JSON:                   {json_query_time * 1000:>12.2f} ms")
+        print(f"  Speedup:                  {json_query_time / query_time:>12.1f}x")
+        print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
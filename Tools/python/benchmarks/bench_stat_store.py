@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Stat Store Benchmark for TopDeck Stats Dashboard
+Compares the legacy deque-of-StatEntry history against the columnar
+StatRingBuffer: record throughput (events/sec), retained bytes per event and
+filtered recent-window query latency.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque, defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from stats_dashboard import StatsDashboard, StatCategory, StatEntry  # noqa: E402
+
+
+class LegacyHistory:
+    """The pre-columnar record_stat path: one StatEntry per event in a deque"""
+
+    def __init__(self, history_size: int):
+        self.stats_history: deque = deque(maxlen=history_size)
+        self.counters = defaultdict(lambda: defaultdict(float))
+
+    def record_stat(self, category, name, value, unit=""):
+        entry = StatEntry(
+            timestamp=time.time(),
+            category=category,
+            name=name,
+            value=value,
+            unit=unit
+        )
+        self.stats_history.append(entry)
+        self.counters[category][name] = value
+
+    def get_recent_stats(self, category=None, limit=100):
+        if category:
+            filtered = [s for s in self.stats_history if s.category == category]
+            return list(filtered)[-limit:]
+        return list(self.stats_history)[-limit:]
+
+
+def synthetic_events(count: int):
+    """A repeating mix of frame, combat and economy events"""
+    pattern = [
+        (StatCategory.PERFORMANCE, "current_fps", 59.7),
+        (StatCategory.PERFORMANCE, "average_fps", 60.1),
+        (StatCategory.COMBAT, "damage_dealt", 35.0),
+        (StatCategory.COMBAT, "enemy_killed", 1),
+        (StatCategory.ECONOMY, "money_earned", 25),
+    ]
+    return [pattern[i % len(pattern)] for i in range(count)]
+
+
+def measure_throughput(recorder, events) -> float:
+    """Events per second for recording ``events`` through ``recorder``"""
+    record = recorder.record_stat
+    gc.collect()
+    start = time.perf_counter()
+    for category, name, value in events:
+        record(category, name, value)
+    return len(events) / (time.perf_counter() - start)
+
+
+def measure_retained_bytes(factory, history_size: int) -> float:
+    """Bytes retained per event once the history is full"""
+    events = synthetic_events(history_size)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    recorder = factory(history_size)
+    for category, name, value in events:
+        recorder.record_stat(category, name, value)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / history_size
+
+
+def measure_query(recorder, queries: int = 200) -> float:
+    """Microseconds per ``get_recent_stats(COMBAT, limit=10)`` call"""
+    start = time.perf_counter()
+    for _ in range(queries):
+        recorder.get_recent_stats(StatCategory.COMBAT, limit=10)
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+def main():
+    """Run the stat store benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--history-size", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3, help="best of this many alternating runs")
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events)
+
+    print("=" * 60)
+    print("STAT STORE BENCHMARK")
+    print("=" * 60)
+    print(f"  Events: {args.events:,}  History size: {args.history_size:,}")
+    print("")
+
+    # Alternate the two so a noisy neighbour slows both alike
+    legacy_rate = columnar_rate = 0.0
+    for _ in range(args.rounds):
+        legacy_rate = max(legacy_rate, measure_throughput(LegacyHistory(args.history_size), events))
+        columnar_rate = max(columnar_rate, measure_throughput(StatsDashboard(args.history_size), events))
+    print(f"  Legacy deque:     {legacy_rate:>12,.0f} events/sec")
+    print(f"  Columnar ring:    {columnar_rate:>12,.0f} events/sec")
+    print(f"  Speedup:          {columnar_rate / legacy_rate:>12.2f}x")
+    print("")
+
+    legacy_bytes = measure_retained_bytes(LegacyHistory, args.history_size)
+    columnar_bytes = measure_retained_bytes(StatsDashboard, args.history_size)
+    print(f"  Legacy deque:     {legacy_bytes:>12.1f} bytes/event")
+    print(f"  Columnar ring:    {columnar_bytes:>12.1f} bytes/event")
+    print(f"  Column layout:    {StatsDashboard(1).stats_history.BYTES_PER_EVENT:>12d} bytes/event")
+    print("")
+
+    fill = synthetic_events(args.history_size)
+    legacy, columnar = LegacyHistory(args.history_size), StatsDashboard(args.history_size)
+    for category, name, value in fill:
+        legacy.record_stat(category, name, value)
+        columnar.record_stat(category, name, value)
+    print(f"  Legacy query:     {measure_query(legacy):>12.1f} us (last 10 COMBAT)")
+    print(f"  Indexed query:    {measure_query(columnar):>12.1f} us (last 10 COMBAT)")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
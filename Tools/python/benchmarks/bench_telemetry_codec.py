@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Telemetry Codec Benchmark for TopDeck Stats Dashboard
+Encodes a synthetic session as NDJSON and as the binary telemetry format
+(uncompressed, zlib and lzma) and reports bytes/event and encode/decode
+throughput, including the zero-copy column view of raw blocks. Checks that
+every event survives the binary round trip.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from telemetry_codec import TelemetryReader, TelemetryWriter  # noqa: E402
+
+METRICS = [
+    ("Combat", "damage_dealt", "hp"), ("Combat", "enemy_killed", ""), ("Combat", "accuracy", "%"),
+    ("Combat", "shot_accuracy", "%"), ("Economy", "money_earned", "gold"),
+    ("Economy", "money_spent", "gold"), ("Performance", "frame_time_ms", "ms"),
+    ("Performance", "average_fps", "fps"), ("Waves", "wave_completed", ""),
+    ("Upgrades", "upgrade_purchased", ""), ("Defenders", "defender_lost", ""),
+    ("Enemies", "enemy_leaked", ""),
+]
+
+
+def synthetic_events(count: int, seed: int = 5, start_time: float = 1_700_000_000.0):
+    """Events at irregular, mostly sub-frame intervals with realistic value types"""
+    rng = random.Random(seed)
+    timestamp = start_time
+    events = []
+    for _ in range(count):
+        timestamp += rng.expovariate(1000.0)
+        category, name, unit = rng.choice(METRICS)
+        if unit in ("hp", "%", "ms", "fps"):
+            value = round(rng.uniform(0.0, 100.0), 3)
+        elif name == "upgrade_purchased":
+            value = rng.choice(["damage", "range", "fire_rate"])
+        else:
+            value = rng.randint(1, 500)
+        events.append((timestamp, category, name, value, unit))
+    return events
+
+
+def encode_ndjson(events) -> bytes:
+    return "".join(
+        json.dumps({"timestamp": timestamp, "category": category, "name": name,
+                    "value": value, "unit": unit}) + "\n"
+        for timestamp, category, name, value, unit in events
+    ).encode("utf-8")
+
+
+def decode_ndjson(data: bytes):
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+def encode_binary(events, compression) -> bytes:
+    out = io.BytesIO()
+    with TelemetryWriter(out, compression) as writer:
+        for timestamp, category, name, value, unit in events:
+            writer.write(timestamp, category, name, value, unit)
+    return out.getvalue()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the telemetry codec benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events)
+    count = len(events)
+
+    print("=" * 60)
+    print("TELEMETRY CODEC BENCHMARK")
+    print("=" * 60)
+    print(f"  Events: {count:,}  Metrics: {len(METRICS)}")
+    print("")
+    print(f"  {'Format':<14} {'bytes/event':>11} {'encode':>12} {'decode':>12}")
+
+    data, encode_s = timed(encode_ndjson, events)
+    _, decode_s = timed(decode_ndjson, data)
+    json_size = len(data)
+    print(f"  {'NDJSON':<14} {json_size / count:>11.1f} {count / encode_s / 1e6:>7.2f} M/s "
+          f"{count / decode_s / 1e6:>7.2f} M/s")
+
+    for label, compression in (("binary", None), ("binary+zlib", "zlib"), ("binary+lzma", "lzma")):
+        data, encode_s = timed(encode_binary, events, compression)
+        decoded, decode_s = timed(lambda buffer: list(TelemetryReader(buffer).events()), data)
+        print(f"  {label:<14} {len(data) / count:>11.1f} {count / encode_s / 1e6:>7.2f} M/s "
+              f"{count / decode_s / 1e6:>7.2f} M/s   ({json_size / len(data):.0f}x smaller)")
+
+        if len(decoded) != count or any(
+                abs(got[0] - want[0]) > 1e-6 or got[1:] != want[1:]
+                for got, want in zip(decoded, events)):
+            print(f"  ❌ {label} round trip lost or changed events")
+            return 1
+
+        if compression is None:
+            start = time.perf_counter()
+            total = 0.0
+            for block in TelemetryReader(data).blocks():
+                total += sum(block.values)
+            columns_s = time.perf_counter() - start
+            raw = data
+
+    print("")
+    print(f"  Zero-copy column scan (raw): {count / columns_s / 1e6:.1f} M events/s")
+    start = time.perf_counter()
+    for block in TelemetryReader(raw).blocks():
+        block.timestamps()
+    print(f"  Timestamp reconstruction:    {count / (time.perf_counter() - start) / 1e6:.1f} M events/s")
+    print("")
+    print("  ✅ All formats round-trip every event")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
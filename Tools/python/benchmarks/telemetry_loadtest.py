@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Telemetry Load Test for TopDeck Stats Dashboard
+Starts a TelemetryServer on ephemeral localhost ports, drives it with
+stand-in game emitter processes over UDP or TCP, and reports sustained
+events/sec, drops/backpressure and ingest-to-visible latency. UDP frames
+lost in the kernel show up as sent minus received.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from stats_dashboard import StatsDashboard  # noqa: E402
+from telemetry_server import TelemetryServer, encode_frame, frame_for_tcp  # noqa: E402
+
+FRAME_EVENTS = [
+    {"category": "Combat", "name": "damage_dealt", "value": 35.0},
+    {"category": "Combat", "name": "enemy_killed", "value": 1},
+    {"category": "Economy", "name": "money_earned", "value": 25},
+    {"category": "Combat", "name": "accuracy", "value": 72.5, "unit": "%"},
+]
+
+
+def build_events(count: int):
+    return [FRAME_EVENTS[i % len(FRAME_EVENTS)] for i in range(count)]
+
+
+def emitter(transport: str, port: int, events_per_frame: int, rate: float,
+            duration: float, results):
+    """Stand-in game process: send frames at ``rate`` frames/sec (0 = unthrottled)"""
+    events = build_events(events_per_frame)
+    if transport == "udp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        send = lambda payload: sock.sendto(payload, ("127.0.0.1", port))  # noqa: E731
+    else:
+        sock = socket.create_connection(("127.0.0.1", port))
+        # sendall blocks while the server applies backpressure
+        send = lambda payload: sock.sendall(frame_for_tcp(payload))  # noqa: E731
+
+    sent = 0
+    interval = 1.0 / rate if rate > 0 else 0.0
+    deadline = time.perf_counter() + duration
+    next_send = time.perf_counter()
+    try:
+        while time.perf_counter() < deadline:
+            send(encode_frame(events, sent=time.time()))
+            sent += 1
+            if interval:
+                next_send += interval
+                time.sleep(max(0.0, next_send - time.perf_counter()))
+    finally:
+        sock.close()
+    results.put(sent)
+
+
+async def run(args) -> int:
+    dashboard = StatsDashboard(history_size=args.history_size)
+    dashboard.start_session("loadtest")
+    server = TelemetryServer(
+        dashboard,
+        udp_port=0 if args.transport == "udp" else None,
+        tcp_port=0 if args.transport == "tcp" else None,
+        max_queue=args.max_queue
+    )
+    await server.start()
+
+    port = server.udp_port if args.transport == "udp" else server.tcp_port
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=emitter, args=(
+            args.transport, port, args.events_per_frame, args.rate, args.duration, results
+        ))
+        for _ in range(args.emitters)
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    loop = asyncio.get_running_loop()
+    sent = [await loop.run_in_executor(None, results.get) for _ in processes]
+    for process in processes:
+        process.join()
+    # Give datagrams still in the socket buffer a moment to arrive
+    await asyncio.sleep(0.1)
+    await server.stop(drain=True)
+    elapsed = time.perf_counter() - start
+
+    report = server.report()
+    frames_sent = sum(sent)
+    print("=" * 60)
+    print("TELEMETRY LOAD TEST")
+    print("=" * 60)
+    print(f"  Transport: {args.transport.upper()}  Emitters: {args.emitters}  "
+          f"Events/frame: {args.events_per_frame}")
+    print(f"  Frames sent:        {frames_sent:>12,}")
+    print(f"  Frames received:    {report['frames_received']:>12,}")
+    print(f"  Frames dropped:     {report['frames_dropped']:>12,}")
+    print(f"  Backpressure waits: {report['backpressure_waits']:>12,}")
+    print(f"  Queue high water:   {report['queue_high_water']:>12,}")
+    print(f"  Events ingested:    {report['events_ingested']:>12,}")
+    print(f"  Sustained rate:     {report['events_ingested'] / elapsed:>12,.0f} events/sec")
+    latency = report["latency_ms"]
+    print(f"  Latency p50/p99:    {latency['p50']:>8.2f} / {latency['p99']:.2f} ms "
+          f"(max {latency['max']:.2f} ms)")
+    print("=" * 60)
+    return 0
+
+
+def main():
+    """Run the telemetry load test"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transport", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--emitters", type=int, default=2)
+    parser.add_argument("--events-per-frame", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="frames/sec per emitter (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--history-size", type=int, default=100_000)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
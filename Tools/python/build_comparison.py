@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Build Comparison for TopDeck Stats Dashboard
+A/B comparison of two sets of recorded sessions (e.g. the archives of two
+builds). Reports the change in frame-time percentiles, wave durations,
+kills per minute and cost per kill with bootstrap confidence intervals,
+and exits non-zero on a significant regression so it can gate a build.
+
+Requires numpy.
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from session_analytics import SessionTable
+from session_archive import SessionArchive
+
+# Session metric -> True when a higher value is worse
+SESSION_METRICS = {
+    "frame_time_p50_ms": True,
+    "frame_time_p95_ms": True,
+    "frame_time_p99_ms": True,
+    "kills_per_minute": False,
+    "cost_per_kill": True,
+}
+
+STATISTICS: Dict[str, Callable[..., np.ndarray]] = {
+    "median": np.median,
+    "mean": np.mean,
+}
+
+# Resampled values held in memory at once (float64s)
+CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class MetricComparison:
+    """Candidate vs. baseline for one metric; ``ci_*`` bound the relative change"""
+    metric: str
+    baseline: float
+    candidate: float
+    relative: float
+    ci_low: float
+    ci_high: float
+    baseline_samples: int
+    candidate_samples: int
+    higher_is_worse: bool
+    regression: bool = False
+    improvement: bool = False
+
+
+@dataclass
+class ComparisonReport:
+    statistic: str
+    confidence: float
+    threshold: float
+    resamples: int
+    comparisons: List[MetricComparison] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[MetricComparison]:
+        return [c for c in self.comparisons if c.regression]
+
+    def to_dict(self) -> Dict:
+        """The report as plain data, with NaN/infinite figures as None so it is valid JSON"""
+        return _finite(asdict(self))
+
+
+def _finite(value):
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite(item) for item in value]
+    return value
+
+
+def bootstrap(values: np.ndarray, statistic: str, resamples: int,
+              rng: np.random.Generator) -> np.ndarray:
+    """``statistic`` of ``resamples`` resamples (with replacement) of ``values``.
+
+    Resamples are drawn as one index matrix per chunk, so at most
+    CHUNK_ELEMENTS resampled values exist at a time.
+    """
+    reduce = STATISTICS[statistic]
+    n = len(values)
+    rows = max(1, CHUNK_ELEMENTS // n)
+    results = np.empty(resamples)
+    for start in range(0, resamples, rows):
+        stop = min(resamples, start + rows)
+        indexes = rng.integers(0, n, size=(stop - start, n))
+        results[start:stop] = reduce(values[indexes], axis=1)
+    return results
+
+
+def compare_samples(metric: str, baseline: np.ndarray, candidate: np.ndarray,
+                    higher_is_worse: bool, statistic: str = "median", confidence: float = 0.95,
+                    threshold: float = 0.02, resamples: int = 2000,
+                    rng: Optional[np.random.Generator] = None) -> MetricComparison:
+    """Compare two samples of one metric (NaNs are dropped).
+
+    The change counts as a regression (or improvement) when the whole
+    confidence interval of the relative change lies on the worse (better)
+    side of zero and the point estimate is at least ``threshold``.
+    """
+    rng = rng or np.random.default_rng()
+    baseline = baseline[np.isfinite(baseline)]
+    candidate = candidate[np.isfinite(candidate)]
+    reduce = STATISTICS[statistic]
+    base_value = float(reduce(baseline))
+    cand_value = float(reduce(candidate))
+
+    base_boot = bootstrap(baseline, statistic, resamples, rng)
+    cand_boot = bootstrap(candidate, statistic, resamples, rng)
+    alpha = 1.0 - confidence
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_boot = cand_boot / base_boot - 1.0
+        relative = cand_value / base_value - 1.0 if base_value else float("nan")
+        ci_low, ci_high = np.nanpercentile(relative_boot, [100.0 * alpha / 2, 100.0 * (1 - alpha / 2)])
+
+    comparison = MetricComparison(
+        metric=metric, baseline=base_value, candidate=cand_value, relative=float(relative),
+        ci_low=float(ci_low), ci_high=float(ci_high), baseline_samples=len(baseline),
+        candidate_samples=len(candidate), higher_is_worse=higher_is_worse
+    )
+    worse_low, worse_high = (ci_low, relative) if higher_is_worse else (-ci_high, -relative)
+    if worse_low > 0 and worse_high >= threshold:
+        comparison.regression = True
+    better_low, better_high = (-ci_high, -relative) if higher_is_worse else (ci_low, relative)
+    if better_low > 0 and better_high >= threshold:
+        comparison.improvement = True
+    return comparison
+
+
+def compare_tables(baseline: SessionTable, candidate: SessionTable,
+                   waves: Optional[Sequence[int]] = None, statistic: str = "median",
+                   confidence: float = 0.95, threshold: float = 0.02, resamples: int = 2000,
+                   min_samples: int = 10, seed: Optional[int] = None) -> ComparisonReport:
+    """Compare session metrics and per-wave durations between two session tables.
+
+    Wave durations are compared for ``waves`` (every wave both tables have
+    at least ``min_samples`` of, by default). The confidence level is
+    Bonferroni-adjusted for the number of metrics compared, so gating on
+    many waves does not multiply false alarms.
+    """
+    rng = np.random.default_rng(seed)
+    report = ComparisonReport(statistic, confidence, threshold, resamples)
+
+    samples = []
+    for metric, higher_is_worse in SESSION_METRICS.items():
+        try:
+            a, b = baseline.metric(metric), candidate.metric(metric)
+        except KeyError:
+            report.skipped.append(metric)
+            continue
+        samples.append((metric, a, b, higher_is_worse))
+
+    if baseline.waves is not None and candidate.waves is not None:
+        if waves is None:
+            base_waves, base_counts = np.unique(baseline.waves.wave, return_counts=True)
+            cand_waves, cand_counts = np.unique(candidate.waves.wave, return_counts=True)
+            waves = np.intersect1d(base_waves[base_counts >= min_samples],
+                                   cand_waves[cand_counts >= min_samples]).tolist()
+        for wave in waves:
+            samples.append((f"wave_{wave}_duration", baseline.waves.duration[baseline.waves.wave == wave],
+                            candidate.waves.duration[candidate.waves.wave == wave], True))
+    elif waves:
+        report.skipped.extend(f"wave_{wave}_duration" for wave in waves)
+
+    usable = []
+    for metric, a, b, higher_is_worse in samples:
+        if np.count_nonzero(np.isfinite(a)) < min_samples or np.count_nonzero(np.isfinite(b)) < min_samples:
+            report.skipped.append(metric)
+        else:
+            usable.append((metric, a, b, higher_is_worse))
+
+    adjusted = 1.0 - (1.0 - confidence) / max(1, len(usable))
+    for metric, a, b, higher_is_worse in usable:
+        report.comparisons.append(compare_samples(
+            metric, a, b, higher_is_worse, statistic, adjusted, threshold, resamples, rng))
+    return report
+
+
+def format_report(report: ComparisonReport) -> str:
+    lines = ["=" * 78, "BUILD COMPARISON (candidate vs. baseline)", "=" * 78]
+    lines.append(f"  {report.statistic} per metric, {report.confidence:.0%} family-wise confidence, "
+                 f"{report.resamples:,} resamples, gate at {report.threshold:.1%}")
+    lines.append("")
+    lines.append(f"  {'metric':<24} {'baseline':>11} {'candidate':>11} {'change':>8}   {'CI':<19}")
+    for c in report.comparisons:
+        mark = "❌" if c.regression else "✅" if c.improvement else "  "
+        lines.append(f"{mark}{c.metric:<24} {c.baseline:>11,.2f} {c.candidate:>11,.2f} "
+                     f"{c.relative:>+8.1%}   [{c.ci_low:+.1%}, {c.ci_high:+.1%}]")
+    if report.skipped:
+        lines.append("")
+        lines.append(f"  Skipped (too few samples): {', '.join(report.skipped)}")
+    lines.append("")
+    regressions = report.regressions
+    if regressions:
+        lines.append(f"❌ {len(regressions)} significant regression(s): "
+                     + ", ".join(c.metric for c in regressions))
+    else:
+        lines.append("✅ No significant regressions")
+    lines.append("=" * 78)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Compare two session archives; exit 1 on a significant regression"""
+    parser = argparse.ArgumentParser(description="Compare two builds' session archives")
+    parser.add_argument("baseline", help="session archive of the baseline build")
+    parser.add_argument("candidate", help="session archive of the candidate build")
+    parser.add_argument("--waves", type=int, nargs="+", help="waves to compare (default: all with data)")
+    parser.add_argument("--statistic", choices=sorted(STATISTICS), default="median")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--threshold", type=float, default=2.0,
+                        help="smallest change in percent that can fail the gate")
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--min-samples", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    with SessionArchive(args.baseline) as baseline, SessionArchive(args.candidate) as candidate:
+        report = compare_tables(
+            SessionTable.from_archive(baseline), SessionTable.from_archive(candidate),
+            waves=args.waves, statistic=args.statistic, confidence=args.confidence,
+            threshold=args.threshold / 100.0, resamples=args.resamples,
+            min_samples=args.min_samples, seed=args.seed
+        )
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(report.to_dict(), out, indent=2, allow_nan=False)
+    return 1 if report.regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
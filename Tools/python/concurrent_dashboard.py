@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Concurrent Dashboard for TopDeck Stats Dashboard
+Lets ingestion, reporting and analytics threads share one StatsDashboard.
+Producers append to their own per-thread buffers without taking a lock;
+buffers are merged into the dashboard in timestamp order on a flush
+cadence, and reads run under the same lock as the merge, so they never
+see a call half-applied and never see a later call without an earlier one.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from anomaly_detector import Alert
+from stats_dashboard import GameSession, StatCategory, StatsDashboard
+
+# (timestamp, dashboard method name or a callable, args, kwargs) as buffered by a producer
+_Call = Tuple[float, Union[str, Callable[..., Any]], tuple, Dict[str, Any]]
+
+_NO_KWARGS: Dict[str, Any] = {}
+
+# record_stat values that are batched into record_many
+_BATCHABLE_VALUES = (int, float)
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentDashboard:
+    """Multi-producer front end for a StatsDashboard.
+
+    Writes (``record_stat``, ``update_fps`` and any other dashboard method
+    through ``submit``) are stamped with the clock when made and buffered
+    per thread; ``flush()`` applies them with the dashboard's clock pinned
+    to each call's stamp, so a deferred call behaves as if made then.
+    Stamps are clamped to the previous flush so the history stays in time
+    order. Writes become visible to reads at the next flush, made every
+    ``flush_interval`` seconds by ``start()``'s background thread or by a
+    producer whose buffer reaches ``max_buffered`` calls.
+
+    A buffered call that raises when applied is logged and counted in
+    ``failed_calls``; the calls around it are still applied.
+    """
+
+    def __init__(self, dashboard: Optional[StatsDashboard] = None,
+                 flush_interval: float = 0.05, max_buffered: int = 65536,
+                 apply_chunk: int = 1024):
+        self.dashboard = dashboard if dashboard is not None else StatsDashboard()
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.apply_chunk = apply_chunk
+        self.lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self.flushes = 0
+        self.calls_applied = 0
+        self.failed_calls = 0
+
+        # The dashboard reads the pinned stamp while a flush applies a call
+        self.clock = self.dashboard.clock
+        self._pinned: Optional[float] = None
+        self.dashboard.clock = self._now
+        self._flushed_until = float("-inf")
+
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, Deque[_Call]]] = []
+        self._buffers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _now(self) -> float:
+        return self.clock() if self._pinned is None else self._pinned
+
+    def _buffer(self) -> Deque[_Call]:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = deque()
+            with self._buffers_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        return buffer
+
+    # Writes (any thread)
+
+    def record_stat(self, category: StatCategory, name: str, value: Any, unit: str = ""):
+        buffer = self._buffer()
+        buffer.append((self.clock(), "record_stat", (category, name, value, unit), _NO_KWARGS))
+        if len(buffer) >= self.max_buffered:
+            self.flush()
+
+    def update_fps(self, delta_time: float):
+        buffer = self._buffer()
+        buffer.append((self.clock(), "update_fps", (delta_time,), _NO_KWARGS))
+        if len(buffer) >= self.max_buffered:
+            self.flush()
+
+    def record_many(self, categories, names, values, units=None, timestamps=None,
+                    on_applied: Optional[Callable[[], Any]] = None):
+        """Buffer one ``dashboard.record_many`` batch (stamped with the clock if ``timestamps`` is None).
+
+        ``on_applied()`` is called on the flushing thread once the batch
+        has been applied, i.e. when it becomes visible to reads.
+        """
+        buffer = self._buffer()
+        now = self.clock()
+        if timestamps is None:
+            timestamps = [now] * len(values)
+        args = (categories, names, values, units, timestamps)
+        if on_applied is None:
+            buffer.append((now, "record_many", args, _NO_KWARGS))
+        else:
+            buffer.append((now, self._record_many_then, (on_applied,) + args, _NO_KWARGS))
+        if len(buffer) >= self.max_buffered:
+            self.flush()
+
+    def submit(self, method: str, *args, **kwargs):
+        """Buffer ``dashboard.<method>(*args, **kwargs)``, e.g. ``submit("complete_wave")``"""
+        if not callable(getattr(self.dashboard, method, None)) or method.startswith("_"):
+            raise ValueError(f"Not a dashboard method: {method}")
+        buffer = self._buffer()
+        buffer.append((self.clock(), method, args, kwargs))
+        if len(buffer) >= self.max_buffered:
+            self.flush()
+
+    # Merging
+
+    def pending(self) -> int:
+        """Calls buffered and not yet flushed, across all threads"""
+        with self._buffers_lock:
+            return sum(len(buffer) for _, buffer in self._buffers)
+
+    def flush(self) -> int:
+        """Apply every buffered call in timestamp order; returns how many were applied"""
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+                # Forget finished threads once their last calls are taken below
+                self._buffers = [(thread, buffer) for thread, buffer in buffers
+                                 if thread.is_alive() or buffer]
+            # popleft is atomic, so producers can keep appending meanwhile;
+            # anything appended after len() was read waits for the next flush
+            batches = []
+            for _, buffer in buffers:
+                count = len(buffer)
+                if count:
+                    popleft = buffer.popleft
+                    batches.append([popleft() for _ in range(count)])
+            if not batches:
+                return 0
+            calls = batches[0] if len(batches) == 1 else list(heapq.merge(*batches, key=_stamp))
+            # The read lock is released between chunks, so a read waits for
+            # at most ``apply_chunk`` calls and sees a prefix of the merge
+            chunk = self.apply_chunk
+            failed = 0
+            for start in range(0, len(calls), chunk):
+                with self.lock:
+                    failed += self._apply(calls[start:start + chunk])
+            self.flushes += 1
+            self.calls_applied += len(calls) - failed
+            self.failed_calls += failed
+            return len(calls) - failed
+
+    def _apply(self, calls: List[_Call]) -> int:
+        """Apply ``calls`` in order; returns how many raised"""
+        dashboard = self.dashboard
+        floor = self._flushed_until
+        failed = 0
+        run: List[_Call] = []
+        try:
+            for call in calls:
+                # Only well-formed stats are batched: record_many cannot undo
+                # the part of a batch it applied before a bad value raised
+                args = call[2]
+                if (call[1] == "record_stat" and not call[3] and len(args) > 2
+                        and type(args[2]) in _BATCHABLE_VALUES and type(args[1]) is str
+                        and isinstance(args[0], StatCategory)):
+                    run.append(call)
+                    continue
+                if run:
+                    floor, failed = self._record_run(run, floor, failed)
+                    run = []
+                timestamp, method, args, kwargs = call
+                self._pinned = floor = max(floor, timestamp)
+                try:
+                    function = method if callable(method) else getattr(dashboard, method)
+                    function(*args, **kwargs)
+                except Exception:
+                    logger.exception("Buffered %s call failed", method)
+                    failed += 1
+            if run:
+                floor, failed = self._record_run(run, floor, failed)
+        finally:
+            self._pinned = None
+            self._flushed_until = floor
+        return failed
+
+    def _record_many_then(self, on_applied: Callable[[], Any], *args):
+        self.dashboard.record_many(*args)
+        on_applied()
+
+    def _record_run(self, run: List[_Call], floor: float, failed: int) -> Tuple[float, int]:
+        """Consecutive record_stat calls, as one record_many batch"""
+        timestamps = []
+        for timestamp, _, _, _ in run:
+            floor = max(floor, timestamp)
+            timestamps.append(floor)
+        self._pinned = floor
+        try:
+            self.dashboard.record_many(
+                [args[0] for _, _, args, _ in run],
+                [args[1] for _, _, args, _ in run],
+                [args[2] for _, _, args, _ in run],
+                [args[3] if len(args) > 3 else "" for _, _, args, _ in run],
+                timestamps
+            )
+        except Exception:
+            logger.exception("Buffered run of %d record_stat calls failed", len(run))
+            failed += len(run)
+        return floor, failed
+
+    def start(self):
+        """Flush every ``flush_interval`` seconds on a background thread"""
+        if self._flusher is not None:
+            return
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="dashboard-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Dashboard flush failed")
+
+    def stop(self):
+        """Stop the background flusher and apply whatever is still buffered"""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def __enter__(self) -> "ConcurrentDashboard":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Snapshot-consistent reads (any thread)
+
+    def read(self, function: Callable[[StatsDashboard], Any], flush: bool = False) -> Any:
+        """``function(dashboard)`` between applied chunks (after a flush, if ``flush``)"""
+        if flush:
+            self.flush()
+        with self.lock:
+            return function(self.dashboard)
+
+    def get_summary(self, flush: bool = False) -> Dict[str, Any]:
+        return self.read(StatsDashboard.get_summary, flush)
+
+    def generate_report(self, flush: bool = False) -> str:
+        return self.read(StatsDashboard.generate_report, flush)
+
+    def get_analytics(self, flush: bool = False) -> Dict[str, Any]:
+        return self.read(StatsDashboard.get_analytics, flush)
+
+    def get_alerts(self, since_seq: int = 0) -> List[Alert]:
+        return self.read(lambda dashboard: dashboard.get_alerts(since_seq))
+
+    def export_session_data(self, session: Optional[GameSession] = None) -> Dict:
+        return self.read(lambda dashboard: dashboard.export_session_data(session))
+
+
+def _stamp(call: _Call) -> float:
+    return call[0]
@@ -5,13 +5,22 @@ Validates ScriptableObject configurations and game parameters.
 Integrates with Unity MCP to check asset validity and ranges.
 """
 
+import argparse
 import json
+import os
 import sys
 import re
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from unity_yaml import (AssetCache, UnityAsset, UnityObject, UnityYamlError, default_cache_path,
+                        iter_unity_yaml_files, load_unity_asset)
+
+if TYPE_CHECKING:
+    from animation_curve import AnimationCurve
+
 
 class ValidationLevel(Enum):
     """Severity levels for validation issues"""
@@ -29,12 +38,86 @@ class ValidationResult:
     suggestion: str = ""
 
 
+def _vector_range(vector: Any) -> Optional[List[float]]:
+    """A serialized Vector2 used as a (min, max) range"""
+    if isinstance(vector, dict) and "x" in vector and "y" in vector:
+        return [vector["x"], vector["y"]]
+    return None
+
+
+def _is_curve(value: Any) -> bool:
+    """Whether ``value`` is an AnimationCurve, without importing numpy: none
+    can exist before something has imported animation_curve"""
+    module = sys.modules.get("animation_curve")
+    return module is not None and isinstance(value, module.AnimationCurve)
+
+
+def _adaptive_wave_configs(fields: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """AdaptiveWaveDifficultyConfig -> wave_difficulty"""
+    from animation_curve import AnimationCurve, profile_curve
+    config: Dict[str, Any] = {}
+    counts = AnimationCurve.from_serialized(fields.get("enemyCountCurve"))
+    if counts is not None and len(counts):
+        profile = profile_curve(counts, *CURVE_DOMAIN)
+        config["min_enemy_count"] = profile.minimum
+        config["max_enemy_count"] = profile.maximum
+        config["enemy_count_curve"] = counts
+    for field, source in (("spawn_delay_curve", "spawnDelayCurve"), ("elite_budget", "eliteBudgetCurve"),
+                          ("mini_boss_budget", "miniBossBudgetCurve")):
+        curve = AnimationCurve.from_serialized(fields.get(source))
+        if curve is not None and len(curve):
+            config[field] = curve
+    spawn_delay = _vector_range(fields.get("spawnDelayRange"))
+    if spawn_delay:
+        config["spawn_interval"] = spawn_delay
+    return [("wave_difficulty", config)]
+
+
+def _variant_configs(fields: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """ProceduralVariantConfig -> enemy_variants, plus its elite/mini-boss chances"""
+    from animation_curve import AnimationCurve
+    variants: Dict[str, Any] = {}
+    for field, source in (("health_multiplier", "healthRange"), ("speed_multiplier", "speedRange"),
+                          ("damage_multiplier", "damageRange")):
+        value = _vector_range(fields.get(source))
+        if value:
+            variants[field] = value
+    for field, source in (("health_curve", "healthCurve"), ("speed_curve", "speedCurve"),
+                          ("damage_curve", "damageCurve")):
+        curve = AnimationCurve.from_serialized(fields.get(source))
+        if curve is not None and len(curve):
+            variants[field] = curve
+    chances: Dict[str, Any] = {}
+    for field, source in (("elite_chance", "eliteChanceCurve"), ("mini_boss_chance", "miniBossChanceCurve")):
+        curve = AnimationCurve.from_serialized(fields.get(source))
+        if curve is not None and len(curve):
+            chances[field] = curve
+    return [("enemy_variants", variants), ("wave_difficulty", chances)]
+
+
+# Curves are evaluated with a normalized wave / difficulty score in [0, 1]
+CURVE_DOMAIN = (0.0, 1.0)
+
+# MonoBehaviour/ScriptableObject script class -> its validator configs
+ASSET_CONFIGS: Dict[str, Callable[[Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]] = {
+    "AdaptiveWaveDifficultyConfig": _adaptive_wave_configs,
+    "ProceduralVariantConfig": _variant_configs,
+}
+
+
+# Fewest files worth handing to a worker process
+MIN_FILES_PER_JOB = 16
+
+
 class ConfigValidator:
     """Validates Unity configuration files and ScriptableObject data"""
     
-    def __init__(self):
+    def __init__(self, script_guids: Optional[Dict[str, str]] = None):
         self.results: List[ValidationResult] = []
         
+        # Script GUID -> class name, for objects without m_EditorClassIdentifier
+        self.script_guids = script_guids or {}
+        
         # Define validation rules for different config types
         self.rules = {
             "wave_difficulty": {
@@ -70,6 +153,34 @@ class ConfigValidator:
             }
         }
     
+        # AnimationCurve fields: (min, max, must not decrease, steepest allowed
+        # |slope| per unit of CURVE_DOMAIN). Curve-only fields are optional,
+        # so they are kept out of ``rules`` and its missing-field check
+        self.curve_rules = {
+            "wave_difficulty": {
+                "enemy_count_curve": (1, 500, True, 150.0),
+                "spawn_delay_curve": (0.0, 1.0, True, None),
+                "elite_budget": (0, 10, True, None),
+                "mini_boss_budget": (0, 5, True, None),
+                "elite_chance": (0.0, 1.0, True, 1.0),
+                "mini_boss_chance": (0.0, 0.5, True, 0.5)
+            },
+            "enemy_variants": {
+                "health_curve": (0.5, 5.0, True, None),
+                "speed_curve": (0.5, 3.0, True, None),
+                "damage_curve": (0.5, 5.0, True, None)
+            }
+        }
+        
+        # Curves the game clamps into a (min, max) range field of the same config
+        self.curve_clamps = {
+            "enemy_variants": {
+                "health_curve": "health_multiplier",
+                "speed_curve": "speed_multiplier",
+                "damage_curve": "damage_multiplier"
+            }
+        }
+    
     def validate_range(self, value: float, min_val: float, max_val: float, field: str) -> bool:
         """Check if a value is within acceptable range"""
         if value < min_val:
@@ -106,8 +217,69 @@ class ConfigValidator:
                 return False
         return True
     
-    def validate_config(self, config_type: str, data: Dict[str, Any]) -> List[ValidationResult]:
-        """Validate a configuration based on its type"""
+    def validate_curve(self, curve: "AnimationCurve", min_val: float, max_val: float, field: str,
+                       increasing: bool = False, max_slope: Optional[float] = None,
+                       clamp: Optional[List[float]] = None) -> bool:
+        """Check range, monotonicity and slope along a densely sampled curve.
+        
+        ``clamp`` is the (min, max) the game clamps the curve's values into;
+        any part of the curve outside it never takes effect. Requires numpy.
+        """
+        from animation_curve import profile_curve
+        profile = profile_curve(curve, *CURVE_DOMAIN)
+        valid = True
+        if clamp is not None and (profile.minimum < clamp[0] or profile.maximum > clamp[1]):
+            self.results.append(ValidationResult(
+                level=ValidationLevel.WARNING,
+                field=field,
+                message=f"Curve spans {profile.minimum:.4g} to {profile.maximum:.4g}, "
+                        f"outside the range [{clamp[0]}, {clamp[1]}] the game clamps it to",
+                suggestion=f"Keep {field} inside its range, or widen the range"
+            ))
+            valid = False
+        if profile.minimum < min_val:
+            self.results.append(ValidationResult(
+                level=ValidationLevel.ERROR,
+                field=field,
+                message=f"Curve dips to {profile.minimum:.4g} at t={profile.minimum_time:.3f}, below minimum {min_val}",
+                suggestion=f"Keep every key and tangent of {field} at or above {min_val}"
+            ))
+            valid = False
+        if profile.maximum > max_val:
+            self.results.append(ValidationResult(
+                level=ValidationLevel.WARNING,
+                field=field,
+                message=f"Curve reaches {profile.maximum:.4g} at t={profile.maximum_time:.3f}, "
+                        f"above recommended maximum {max_val}",
+                suggestion=f"Consider keeping {field} below {max_val} for balance (check tangent overshoot)"
+            ))
+            valid = False
+        if increasing and not profile.increasing:
+            self.results.append(ValidationResult(
+                level=ValidationLevel.WARNING,
+                field=field,
+                message=f"Curve decreases from t={profile.first_decrease:.3f} "
+                        f"(drops by up to {profile.largest_decrease:.4g})",
+                suggestion="Flatten the tangents so difficulty never eases off between keys"
+            ))
+            valid = False
+        if max_slope is not None and profile.max_slope > max_slope:
+            self.results.append(ValidationResult(
+                level=ValidationLevel.WARNING,
+                field=field,
+                message=f"Slope {profile.max_slope:.4g} at t={profile.max_slope_time:.3f} exceeds {max_slope}",
+                suggestion="Spread the change over a longer stretch of the curve"
+            ))
+            valid = False
+        return valid
+    
+    def validate_config(self, config_type: str, data: Dict[str, Any],
+                        require_all: bool = True) -> List[ValidationResult]:
+        """Validate a configuration based on its type.
+        
+        With ``require_all`` off, fields the data does not have are not
+        reported (e.g. for a Unity asset that only maps onto some of them).
+        """
         self.results = []
         
         if config_type not in self.rules:
@@ -120,9 +292,16 @@ class ConfigValidator:
             return self.results
         
         rules = self.rules[config_type]
+        curve_rules = self.curve_rules.get(config_type, {})
+        clamps = self.curve_clamps.get(config_type, {})
         
         for field, value in data.items():
-            if field in rules:
+            if _is_curve(value) and (field in curve_rules or field in rules):
+                min_val, max_val, increasing, max_slope = curve_rules.get(field) or (*rules[field], False, None)
+                clamp = data.get(clamps.get(field))
+                self.validate_curve(value, min_val, max_val, field, increasing, max_slope,
+                                    clamp if isinstance(clamp, list) and len(clamp) == 2 else None)
+            elif field in rules:
                 min_val, max_val = rules[field]
                 
                 if isinstance(value, list):
@@ -136,7 +315,7 @@ class ConfigValidator:
         
         # Check for missing required fields
         for field in rules:
-            if field not in data:
+            if require_all and field not in data:
                 self.results.append(ValidationResult(
                     level=ValidationLevel.WARNING,
                     field=field,
@@ -146,6 +325,93 @@ class ConfigValidator:
         
         return self.results
     
+    def compile_rules(self, config_type: str, fields: Optional[List[str]] = None):
+        """``config_type``'s rules as a batch_validation.CompiledRules, for validating
+        a whole matrix of candidate configs at once (requires numpy)"""
+        from batch_validation import CompiledRules
+        return CompiledRules.from_validator(self, config_type, fields)
+    
+    def script_class(self, obj: UnityObject) -> Optional[str]:
+        """Script class of a MonoBehaviour/ScriptableObject"""
+        return obj.script_class or self.script_guids.get(obj.script_guid)
+    
+    def validate_asset(self, path: str, cache: Optional[AssetCache] = None) -> List[ValidationResult]:
+        """Validate the ScriptableObjects/MonoBehaviours in a Unity YAML file.
+        
+        Objects whose script has an ASSET_CONFIGS entry are mapped onto
+        validator configs; result fields are prefixed with the object name.
+        """
+        try:
+            asset = cache.load(path) if cache is not None else load_unity_asset(path)
+        except (OSError, UnicodeDecodeError, UnityYamlError) as error:
+            self.results = [ValidationResult(
+                level=ValidationLevel.ERROR,
+                field=path,
+                message=f"Could not load asset: {error}",
+                suggestion="Check that the file is a text-serialized Unity asset"
+            )]
+            return self.results
+        return self.validate_unity_asset(asset)
+    
+    def validate_unity_asset(self, asset: UnityAsset) -> List[ValidationResult]:
+        """Validate an already loaded asset (see validate_asset)"""
+        results = []
+        matched = False
+        for obj in asset.monobehaviours():
+            script = self.script_class(obj)
+            mapper = ASSET_CONFIGS.get(script)
+            if mapper is None:
+                continue
+            matched = True
+            name = obj.data.get("m_Name") or script
+            for config_type, data in mapper(obj.data):
+                for result in self.validate_config(config_type, data, require_all=False):
+                    result.field = f"{name}.{result.field}"
+                    results.append(result)
+        
+        if not matched:
+            results.append(ValidationResult(
+                level=ValidationLevel.INFO,
+                field=asset.path,
+                message="No objects with validation rules in this asset"
+            ))
+        self.results = results
+        return self.results
+    
+    def map_assets(self, function: Callable[[str], Any], paths: List[str], jobs: Optional[int] = 1,
+                   chunk_size: Optional[int] = None) -> List[Any]:
+        """``function(path)`` for every path, across ``jobs`` processes (None: one per core).
+        
+        Paths are handed out in chunks (by default about four per worker,
+        for load balancing) and results come back in the order of
+        ``paths``, so reports do not depend on scheduling. In the workers,
+        ``pool_validator()`` is a copy of this validator. Fewer than
+        MIN_FILES_PER_JOB files per worker are not worth a process, so
+        small batches run here.
+        """
+        global _pool_validator
+        jobs = min(jobs or os.cpu_count() or 1, -(-len(paths) // MIN_FILES_PER_JOB))
+        if jobs <= 1:
+            previous, _pool_validator = _pool_validator, self
+            try:
+                return [function(path) for path in paths]
+            finally:
+                _pool_validator = previous
+        if chunk_size is None:
+            chunk_size = -(-len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_pool_validator,
+                                 initargs=(self.script_guids, self.rules, self.curve_rules,
+                                           self.curve_clamps)) as pool:
+            return list(pool.map(function, paths, chunksize=chunk_size))
+    
+    def validate_assets(self, paths: List[str], jobs: Optional[int] = 1,
+                        chunk_size: Optional[int] = None) -> List[ValidationResult]:
+        """validate_asset for every path across a process pool, results in path order"""
+        results = [result for asset_results in self.map_assets(_validate_asset, paths, jobs, chunk_size)
+                   for result in asset_results]
+        self.results = results
+        return self.results
+    
     def validate_balance(self, upgrade_config: Dict, wave_config: Dict) -> List[ValidationResult]:
         """Cross-validate upgrade and wave configs for game balance"""
         self.results = []
@@ -238,8 +504,76 @@ class ConfigValidator:
         return "\n".join(report)
 
 
-def main(config_path: str = None):
+_pool_validator: Optional[ConfigValidator] = None
+
+
+def _init_pool_validator(script_guids: Dict[str, str], rules: Dict[str, Dict[str, Tuple[float, float]]],
+                         curve_rules: Dict[str, Dict[str, Tuple[float, float, bool, Optional[float]]]],
+                         curve_clamps: Dict[str, Dict[str, str]]):
+    global _pool_validator
+    _pool_validator = ConfigValidator(script_guids)
+    _pool_validator.rules = rules
+    _pool_validator.curve_rules = curve_rules
+    _pool_validator.curve_clamps = curve_clamps
+
+
+def pool_validator() -> ConfigValidator:
+    """The validator a ``map_assets`` function should use"""
+    if _pool_validator is None:
+        raise RuntimeError("pool_validator() is only available inside ConfigValidator.map_assets")
+    return _pool_validator
+
+
+def _validate_asset(path: str) -> List[ValidationResult]:
+    return pool_validator().validate_asset(path)
+
+
+def validate_asset_files(paths: List[str], cache_path: Optional[str] = None, jobs: Optional[int] = 1) -> int:
+    """Validate Unity asset files and print one report; returns the exit code.
+    
+    With more than one job the files are parsed in worker processes and
+    the parsed-asset cache is not used.
+    """
+    validator = ConfigValidator()
+    files = [file_path for path in paths
+             for file_path in (iter_unity_yaml_files(path) if os.path.isdir(path) else [path])]
+    jobs = min(jobs or os.cpu_count() or 1, len(files) // MIN_FILES_PER_JOB)
+    if jobs <= 1:
+        results: List[ValidationResult] = []
+        with AssetCache(cache_path) as cache:
+            for path in files:
+                print(f"Validating {path}...")
+                results.extend(validator.validate_asset(path, cache))
+        validator.results = results
+    else:
+        print(f"Validating {len(files)} assets with {jobs} jobs...")
+        results = validator.validate_assets(files, jobs)
+    
+    print("\n" + validator.generate_report())
+    errors = [r for r in results if r.level == ValidationLevel.ERROR]
+    return 0 if not errors else 1
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for config validation"""
+    parser = argparse.ArgumentParser(description="Validate TopDeck configs and Unity assets")
+    parser.add_argument("assets", nargs="*",
+                        help="Unity YAML assets or folders to validate (default: validate the built-in samples)")
+    parser.add_argument("--cache", help="parsed-asset cache file (default: the project's Library folder)")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--project", metavar="ROOT",
+                        help="validate every ScriptableObject in the Unity project at ROOT, incrementally")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for parsing and validating assets (default: one per core)")
+    args = parser.parse_args(argv)
+    
+    if args.project:
+        from project_validator import validate_project
+        return validate_project(args.project, use_cache=not args.no_cache, jobs=args.jobs or None)
+    if args.assets:
+        cache_path = None if args.no_cache else args.cache or default_cache_path(args.assets[0])
+        return validate_asset_files(args.assets, cache_path, jobs=args.jobs or None)
+    
     validator = ConfigValidator()
     
     # Example validation - in real use, this would read from Unity assets
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Entity Gauges for TopDeck Stats Dashboard
+Live entity counts (attackers, projectiles, defenders) and per-frame
+frame times, kept as time-stamped columns so frame cost can be joined
+against what was on screen (see scaling_analysis.py).
+"""
+
+from array import array
+from typing import Dict, Optional, Tuple
+
+ENTITY_KINDS = ("attackers", "projectiles", "defenders")
+
+
+class EntityGauges:
+    """Append-only columns of gauge updates and frame samples.
+
+    Each gauge update stores the full set of counts at that moment, so a
+    frame can be matched to the latest update at or before it; frames
+    before the first update could not be, so they are not stored, and a
+    game that never reports entity counts costs nothing here. Columns are
+    bounded: once one holds twice its capacity, the older half is dropped
+    (amortized O(1) per append). The default keeps at least an hour of
+    frames at 60 FPS, at most about 7 MB.
+    """
+
+    def __init__(self, frame_capacity: int = 216_000, gauge_capacity: int = 250_000):
+        if frame_capacity <= 0 or gauge_capacity <= 0:
+            raise ValueError("capacities must be positive")
+        self.frame_capacity = frame_capacity
+        self.gauge_capacity = gauge_capacity
+        self.current: Dict[str, int] = {kind: 0 for kind in ENTITY_KINDS}
+        self.clear()
+
+    def clear(self):
+        """Drop all samples (current counts are kept)"""
+        self.frame_timestamps = array("d")
+        self.frame_times = array("d")
+        self.gauge_timestamps = array("d")
+        self.gauge_counts: Dict[str, array] = {kind: array("I") for kind in ENTITY_KINDS}
+
+    def set_counts(self, timestamp: float, attackers: Optional[int] = None,
+                   projectiles: Optional[int] = None, defenders: Optional[int] = None):
+        """Update some or all counts as of ``timestamp``"""
+        current = self.current
+        if attackers is not None:
+            current["attackers"] = max(0, int(attackers))
+        if projectiles is not None:
+            current["projectiles"] = max(0, int(projectiles))
+        if defenders is not None:
+            current["defenders"] = max(0, int(defenders))
+
+        self.gauge_timestamps.append(timestamp)
+        for kind, column in self.gauge_counts.items():
+            column.append(current[kind])
+        if len(self.gauge_timestamps) >= 2 * self.gauge_capacity:
+            del self.gauge_timestamps[:self.gauge_capacity]
+            for column in self.gauge_counts.values():
+                del column[:self.gauge_capacity]
+
+    def add_frame(self, timestamp: float, frame_time: float):
+        """Record one frame's duration (seconds) at ``timestamp``"""
+        if not self.gauge_timestamps:
+            return
+        self.frame_timestamps.append(timestamp)
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) >= 2 * self.frame_capacity:
+            del self.frame_timestamps[:self.frame_capacity]
+            del self.frame_times[:self.frame_capacity]
+
+    def frames(self) -> Tuple[array, array]:
+        """(timestamps, frame times in seconds)"""
+        return self.frame_timestamps, self.frame_times
+
+    def gauges(self) -> Tuple[array, Dict[str, array]]:
+        """(update timestamps, counts per entity kind)"""
+        return self.gauge_timestamps, self.gauge_counts
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Frame-Time Statistics for TopDeck Stats Dashboard
+Streaming frame-time engine with constant per-frame cost.
+Tracks sliding-window mean/min/max with running sums and monotonic deques,
+and session-long percentiles and budget counts with a constant-memory HDR
+histogram of frame times in microseconds. The mergeable log-bucket
+quantile sketch serves the rollups and latency figures.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+
+class SlidingWindowStats:
+    """Mean, min and max over the last ``size`` values in O(1) amortized time"""
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        self.size = size
+        self.values: deque = deque()
+        self.total = 0.0
+        self._adds_since_resum = 0
+
+        # Monotonic deques of (index, value): front is the window min/max
+        self._min_queue: deque = deque()
+        self._max_queue: deque = deque()
+        self._index = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float):
+        """Push a value, evicting the oldest once the window is full"""
+        values = self.values
+        values.append(value)
+        self.total += value
+        if len(values) > self.size:
+            self.total -= values.popleft()
+
+        # Re-sum once per window to stop floating-point drift accumulating
+        self._adds_since_resum += 1
+        if self._adds_since_resum >= self.size:
+            self.total = math.fsum(values)
+            self._adds_since_resum = 0
+
+        index = self._index
+        self._index += 1
+        oldest = index - self.size + 1
+
+        min_queue = self._min_queue
+        while min_queue and min_queue[-1][1] >= value:
+            min_queue.pop()
+        min_queue.append((index, value))
+        if min_queue[0][0] < oldest:
+            min_queue.popleft()
+
+        max_queue = self._max_queue
+        while max_queue and max_queue[-1][1] <= value:
+            max_queue.pop()
+        max_queue.append((index, value))
+        if max_queue[0][0] < oldest:
+            max_queue.popleft()
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else 0.0
+
+    @property
+    def min(self) -> float:
+        return self._min_queue[0][1] if self._min_queue else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max_queue[0][1] if self._max_queue else 0.0
+
+    @property
+    def last(self) -> float:
+        return self.values[-1] if self.values else 0.0
+
+    def clear(self):
+        """Empty the window"""
+        self.values.clear()
+        self._min_queue.clear()
+        self._max_queue.clear()
+        self.total = 0.0
+        self._adds_since_resum = 0
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with bounded relative error.
+
+    Positive values are counted in logarithmic buckets of ratio
+    ``gamma = (1 + a) / (1 - a)``, so any reported quantile is within
+    relative accuracy ``a`` of the true value (DDSketch). Memory grows with
+    the log of the value range, not with the number of samples, and
+    sketches with equal accuracy can be merged.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1):
+        """Record ``count`` occurrences of a non-negative value"""
+        if value > 0.0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile ``q`` (0-1), or 0.0 when empty"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket's value range
+                estimate = 2.0 * self.gamma ** key / (self.gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def clear(self):
+        """Drop all samples"""
+        self.buckets.clear()
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+
+class HdrHistogram:
+    """High-dynamic-range histogram of integer values in constant memory.
+
+    Values from ``lowest`` to ``highest`` are counted in buckets whose
+    width grows with magnitude so every recorded value is kept to
+    ``significant_figures`` decimal digits (HdrHistogram layout). A 1 us
+    to 60 s range at 3 significant figures needs about 17K counters,
+    however many values are recorded. A running total per block of 64
+    counters keeps percentile and threshold queries from summing them all.
+    """
+
+    BLOCK_SHIFT = 6
+
+    def __init__(self, lowest: int = 1, highest: int = 60_000_000,
+                 significant_figures: int = 3):
+        if lowest < 1 or highest < 2 * lowest:
+            raise ValueError("need 1 <= lowest and highest >= 2 * lowest")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        self._sub_bucket_magnitude = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._half_magnitude = self._sub_bucket_magnitude - 1
+        self._sub_bucket_count = 1 << self._sub_bucket_magnitude
+        self._half_count = self._sub_bucket_count >> 1
+        self._unit_magnitude = int(math.floor(math.log2(lowest)))
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        buckets = 1
+        smallest_untrackable = self._sub_bucket_count << self._unit_magnitude
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            buckets += 1
+        self.counts = array("Q", [0]) * ((buckets + 1) * self._half_count)
+        # Counts per block of counters (index >> BLOCK_SHIFT)
+        self.block_counts = array("Q", [0]) * -(-len(self.counts) >> self.BLOCK_SHIFT)
+
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._sub_bucket_mask).bit_length() - self._unit_magnitude - self._sub_bucket_magnitude
+        sub_bucket = value >> (bucket + self._unit_magnitude)
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def _value_at(self, index: int) -> int:
+        """Lowest value counted at ``index``"""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return sub_bucket << (bucket + self._unit_magnitude)
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Highest value counted at ``index``"""
+        return self._value_at(index + 1) - 1 if index + 1 < len(self.counts) else self.highest
+
+    def record(self, value: int, count: int = 1):
+        """Count ``value``, clamped into [lowest, highest]"""
+        value = min(max(int(value), self.lowest), self.highest)
+        index = self._index(value)
+        self.counts[index] += count
+        self.block_counts[index >> self.BLOCK_SHIFT] += count
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "HdrHistogram"):
+        """Add another histogram with the same layout into this one"""
+        if (other.lowest, other.highest, other.significant_figures) != \
+                (self.lowest, self.highest, self.significant_figures):
+            raise ValueError("Cannot merge histograms with different layouts")
+        if other.count == 0:
+            return
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        block_counts = self.block_counts
+        for block, count in enumerate(other.block_counts):
+            block_counts[block] += count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Value at ``percentile`` (0-100), to the histogram's precision"""
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(min(percentile, 100.0) / 100.0 * self.count))
+        seen = 0
+        for block, count in enumerate(self.block_counts):
+            if seen + count >= rank:
+                break
+            seen += count
+        start = block << self.BLOCK_SHIFT
+        run = self.counts[start:start + (1 << self.BLOCK_SHIFT)]
+        index = start + bisect_left(list(accumulate(run, initial=seen)), rank) - 1
+        return min(self._highest_equivalent(index), self.max)
+
+    def counts_at_or_above(self, values: Sequence[int]) -> List[int]:
+        """Number of recorded values at or above each of ``values`` (to the histogram's precision)"""
+        result = []
+        for value in values:
+            index = self._index(min(max(int(value), self.lowest), self.highest))
+            block = index >> self.BLOCK_SHIFT
+            end = (block + 1) << self.BLOCK_SHIFT
+            result.append(sum(self.block_counts[block + 1:]) + sum(self.counts[index:end]))
+        return result
+
+    def reset(self):
+        """Drop all values"""
+        self.counts = array("Q", [0]) * len(self.counts)
+        self.block_counts = array("Q", [0]) * len(self.block_counts)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+
+class FrameTimeStats:
+    """Constant-cost frame-time statistics.
+
+    Frame times (seconds) are the primary measure. FPS figures are derived
+    from them: the average FPS of a window is frames / elapsed time, which is
+    what a player experiences, rather than the mean of per-frame FPS values
+    (that mean is skewed upward by short frames and hides hitches).
+    """
+
+    PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99, "p99_9": 0.999}
+
+    # Frame-time budgets (ms) reported as "frames at or over": 60/30/20/10/5 FPS
+    BUDGETS_MS = (16.7, 33.3, 50.0, 100.0, 200.0)
+
+    def __init__(self, window: int = 300, significant_figures: int = 3):
+        self.window = SlidingWindowStats(window)
+        self.histogram = HdrHistogram(significant_figures=significant_figures)  # microseconds, 1 us to 60 s
+        self.frames = 0
+        self.total_time = 0.0
+
+    def add(self, frame_time: float):
+        """Record one frame's duration in seconds"""
+        self.window.add(frame_time)
+        self.histogram.record(frame_time * 1_000_000.0)
+        self.frames += 1
+        self.total_time += frame_time
+
+    def reset_session(self):
+        """Restart the session-long aggregates, keeping the sliding window"""
+        self.histogram.reset()
+        self.frames = 0
+        self.total_time = 0.0
+
+    @staticmethod
+    def _fps(frame_time: float) -> float:
+        return 1.0 / frame_time if frame_time > 0 else 0.0
+
+    @property
+    def current_fps(self) -> float:
+        return self._fps(self.window.last)
+
+    @property
+    def average_fps(self) -> float:
+        """Frames per second over the sliding window"""
+        return self._fps(self.window.mean)
+
+    @property
+    def min_fps(self) -> float:
+        return self._fps(self.window.max)
+
+    @property
+    def max_fps(self) -> float:
+        return self._fps(self.window.min)
+
+    @property
+    def session_average_fps(self) -> float:
+        """Frames per second since the session started"""
+        return self.frames / self.total_time if self.total_time > 0 else 0.0
+
+    def frame_time_percentile(self, q: float) -> float:
+        """Session frame time at quantile ``q``, in seconds"""
+        return self.histogram.value_at_percentile(q * 100.0) / 1_000_000.0
+
+    def frame_time_percentiles_ms(self) -> Dict[str, float]:
+        """Session frame-time percentiles in milliseconds"""
+        return {
+            label: self.histogram.value_at_percentile(q * 100.0) / 1000.0
+            for label, q in self.PERCENTILES.items()
+        }
+
+    def frames_over_budget(self) -> Dict[float, int]:
+        """Session frames at or over each of BUDGETS_MS"""
+        counts = self.histogram.counts_at_or_above([ms * 1000.0 for ms in self.BUDGETS_MS])
+        return dict(zip(self.BUDGETS_MS, counts))
+
+    def summary(self) -> Optional[Dict[str, float]]:
+        """Snapshot of window and session figures, or None before any frame"""
+        if not len(self.window):
+            return None
+
+        p99 = self.frame_time_percentile(0.99)
+        return {
+            "current_fps": self.current_fps,
+            "average_fps": self.average_fps,
+            "min_fps": self.min_fps,
+            "max_fps": self.max_fps,
+            "stable": self.max_fps - self.min_fps < 20,
+            "average_frame_time_ms": self.window.mean * 1000.0,
+            "session_frames": self.frames,
+            "session_average_fps": self.session_average_fps,
+            "one_percent_low_fps": self._fps(p99),
+            "frame_time_ms": self.frame_time_percentiles_ms(),
+            "max_frame_time_ms": self.histogram.max / 1000.0,
+            "frames_over_ms": self.frames_over_budget()
+        }
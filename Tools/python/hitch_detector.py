@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Hitch Detector for TopDeck Stats Dashboard
+Online frame-hitch detection with configurable thresholds.
+A frame is a hitch when it exceeds an absolute budget, or when it is several
+times slower than the recent baseline. Each hitch is kept with its timestamp,
+the current wave and the gameplay events that led up to it.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from frame_stats import SlidingWindowStats
+
+
+@dataclass
+class HitchThresholds:
+    """When a frame counts as a hitch"""
+    absolute_ms: float = 50.0       # Any frame at least this long,
+    steady_factor: float = 1.5      # ...and this many times the baseline (a steadily slow game is not hitching)
+    relative_factor: float = 3.0    # ...or this many times the baseline frame time,
+    relative_min_ms: float = 25.0   # provided it is also at least this long
+    severe_ms: float = 200.0        # Hitches this long are reported as spikes
+    baseline_frames: int = 120      # Frames in the rolling baseline
+    warmup_frames: int = 30         # Baseline frames needed before the relative test applies
+    context_events: int = 10        # Gameplay events kept with each hitch
+
+
+@dataclass
+class Hitch:
+    """One detected hitch"""
+    timestamp: float
+    frame_time_ms: float
+    baseline_ms: float
+    wave: int
+    severity: str                   # "hitch" or "spike"
+    recent_events: List[Any] = field(default_factory=list)
+
+
+class HitchDetector:
+    """Streaming hitch detector with O(1) work per frame.
+
+    The baseline is the mean of recent non-hitch frames, so a burst of
+    hitches does not raise the bar for detecting the next one. Frames
+    close to the baseline are never hitches, so a game running steadily
+    slow follows its baseline down instead of hitching every frame. Counts cover
+    the whole session; only the latest ``max_hitches`` Hitch records are kept.
+    """
+
+    def __init__(self, thresholds: Optional[HitchThresholds] = None, max_hitches: int = 256):
+        self.thresholds = thresholds or HitchThresholds()
+        self.baseline = SlidingWindowStats(self.thresholds.baseline_frames)
+        self.hitches: deque = deque(maxlen=max_hitches)
+        self.hitch_count = 0
+        self.spike_count = 0
+        self.worst_ms = 0.0
+        self.elapsed = 0.0
+
+    def check(self, frame_time: float) -> Optional[str]:
+        """Feed one frame time (seconds). Returns "hitch"/"spike" if it is one."""
+        thresholds = self.thresholds
+        frame_ms = frame_time * 1000.0
+        self.elapsed += frame_time
+
+        baseline_ms = self.baseline_ms
+        severity = None
+        if frame_ms >= thresholds.absolute_ms and frame_ms >= thresholds.steady_factor * baseline_ms:
+            severity = "hitch"
+        elif (len(self.baseline) >= thresholds.warmup_frames
+              and frame_ms >= thresholds.relative_min_ms
+              and frame_ms >= thresholds.relative_factor * baseline_ms):
+            severity = "hitch"
+
+        # The first frame seeds the baseline even if it is a hitch
+        if severity is None or not len(self.baseline):
+            self.baseline.add(frame_time)
+        if severity is None:
+            return None
+
+        if frame_ms >= thresholds.severe_ms:
+            severity = "spike"
+            self.spike_count += 1
+        self.hitch_count += 1
+        if frame_ms > self.worst_ms:
+            self.worst_ms = frame_ms
+        return severity
+
+    @property
+    def baseline_ms(self) -> float:
+        return self.baseline.mean * 1000.0 if len(self.baseline) else 0.0
+
+    def record(self, hitch: Hitch):
+        """Keep the details of a hitch reported by ``check``"""
+        self.hitches.append(hitch)
+
+    @property
+    def per_minute(self) -> float:
+        """Hitches per minute of frame time"""
+        return self.hitch_count / (self.elapsed / 60.0) if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.hitch_count,
+            "spikes": self.spike_count,
+            "per_minute": self.per_minute,
+            "worst_ms": self.worst_ms,
+        }
+
+    def reset(self):
+        """Start counting again (e.g. for a new session)"""
+        self.baseline.clear()
+        self.hitches.clear()
+        self.hitch_count = 0
+        self.spike_count = 0
+        self.worst_ms = 0.0
+        self.elapsed = 0.0
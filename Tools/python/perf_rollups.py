@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Performance Rollups for TopDeck Stats Dashboard
+Downsampling pipeline for per-frame performance samples.
+Keeps raw frame times for a short window and aggregates older data into
+1s/10s/60s rollup tiers (count/min/max/mean/p99 per bucket) so hour-long
+sessions fit in bounded memory.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from frame_stats import QuantileSketch
+
+# A bucket as archived with its session: one PERFORMANCE event per field,
+# all stamped with the bucket's start, as (metric name, unit)
+ARCHIVED_BUCKET_FIELDS: Sequence[Tuple[str, str]] = (
+    ("frame_rollup_count", "frames"),
+    ("frame_rollup_mean_ms", "ms"),
+    ("frame_rollup_min_ms", "ms"),
+    ("frame_rollup_p99_ms", "ms"),
+    ("frame_rollup_max_ms", "ms"),
+)
+
+
+@dataclass
+class RollupBucket:
+    """Aggregated frame times for one time bucket"""
+    start: float
+    resolution: float
+    count: int
+    min: float
+    max: float
+    mean: float
+    p99: float
+
+    def archived_values(self) -> Tuple[float, ...]:
+        """Values of the ``ARCHIVED_BUCKET_FIELDS`` events"""
+        return (float(self.count), self.mean * 1000.0, self.min * 1000.0,
+                self.p99 * 1000.0, self.max * 1000.0)
+
+    @classmethod
+    def from_archived(cls, start: float, resolution: float, values: Sequence[float]) -> "RollupBucket":
+        """Rebuild a bucket from its ``ARCHIVED_BUCKET_FIELDS`` values"""
+        count, mean_ms, min_ms, p99_ms, max_ms = values
+        return cls(start=start, resolution=resolution, count=int(count), min=min_ms / 1000.0,
+                   max=max_ms / 1000.0, mean=mean_ms / 1000.0, p99=p99_ms / 1000.0)
+
+
+class _OpenBucket:
+    """Accumulator for the bucket currently being filled"""
+
+    __slots__ = ("index", "count", "min", "max", "total", "sketch")
+
+    def __init__(self, index: int, relative_accuracy: float):
+        self.index = index
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.sketch = QuantileSketch(relative_accuracy)
+
+
+class RollupTier:
+    """Ring of closed buckets at one resolution plus the open bucket"""
+
+    def __init__(self, resolution: float, capacity: int,
+                 relative_accuracy: float = 0.01):
+        if resolution <= 0 or capacity <= 0:
+            raise ValueError("resolution and capacity must be positive")
+
+        self.resolution = resolution
+        self.capacity = capacity
+        self.relative_accuracy = relative_accuracy
+
+        self.starts = array("d", [0.0]) * capacity
+        self.counts = array("Q", [0]) * capacity
+        self.mins = array("d", [0.0]) * capacity
+        self.maxs = array("d", [0.0]) * capacity
+        self.means = array("d", [0.0]) * capacity
+        self.p99s = array("d", [0.0]) * capacity
+        self._head = 0
+        self._count = 0
+
+        self.open: Optional[_OpenBucket] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bucket_for(self, timestamp: float) -> Tuple[_OpenBucket, Optional[_OpenBucket]]:
+        """Open bucket covering ``timestamp`` and the bucket closed to make room, if any"""
+        index = math.floor(timestamp / self.resolution)
+        current = self.open
+        if current is not None and current.index == index:
+            return current, None
+
+        self.open = _OpenBucket(index, self.relative_accuracy)
+        if current is not None:
+            self._store(current)
+        return self.open, current
+
+    def add_sample(self, timestamp: float, value: float) -> Optional[_OpenBucket]:
+        """Add a raw sample. Returns the bucket it closed, if any."""
+        bucket, closed = self._bucket_for(timestamp)
+        bucket.count += 1
+        bucket.total += value
+        if value < bucket.min:
+            bucket.min = value
+        if value > bucket.max:
+            bucket.max = value
+        bucket.sketch.add(value)
+        return closed
+
+    def add_bucket(self, timestamp: float, other: _OpenBucket) -> Optional[_OpenBucket]:
+        """Fold a closed finer-grained bucket in. Returns the bucket it closed, if any."""
+        bucket, closed = self._bucket_for(timestamp)
+        bucket.count += other.count
+        bucket.total += other.total
+        bucket.min = min(bucket.min, other.min)
+        bucket.max = max(bucket.max, other.max)
+        bucket.sketch.merge(other.sketch)
+        return closed
+
+    def _store(self, bucket: _OpenBucket):
+        """Write a closed bucket into the ring"""
+        slot = self._head
+        self.starts[slot] = bucket.index * self.resolution
+        self.counts[slot] = bucket.count
+        self.mins[slot] = bucket.min
+        self.maxs[slot] = bucket.max
+        self.means[slot] = bucket.total / bucket.count
+        self.p99s[slot] = bucket.sketch.quantile(0.99)
+
+        self._head = (slot + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _bucket_at(self, slot: int) -> RollupBucket:
+        return RollupBucket(
+            start=self.starts[slot],
+            resolution=self.resolution,
+            count=self.counts[slot],
+            min=self.mins[slot],
+            max=self.maxs[slot],
+            mean=self.means[slot],
+            p99=self.p99s[slot]
+        )
+
+    def newest(self) -> Optional[RollupBucket]:
+        """The most recently closed bucket"""
+        return self._bucket_at((self._head - 1) % self.capacity) if self._count else None
+
+    def buckets(self, since: Optional[float] = None) -> List[RollupBucket]:
+        """Closed buckets in chronological order, optionally only those starting at or after ``since``"""
+        result = []
+        for position in range(self._count):
+            slot = (self._head - self._count + position) % self.capacity
+            if since is not None and self.starts[slot] < since:
+                continue
+            result.append(self._bucket_at(slot))
+        return result
+
+
+class PerformanceRollups:
+    """Raw frame window feeding a cascade of rollup tiers.
+
+    Each frame touches only the raw ring and the finest tier's open bucket.
+    When a bucket closes it is merged into the next coarser tier, so the
+    per-frame cost stays constant regardless of how many tiers there are.
+
+    Default retention: 1s buckets for 1 hour, 10s buckets for 6 hours and
+    60s buckets for 24 hours, about 350 KB in total.
+    """
+
+    DEFAULT_TIERS: Sequence[Tuple[float, int]] = ((1.0, 3600), (10.0, 2160), (60.0, 1440))
+
+    def __init__(self, raw_frames: int = 1200,
+                 tiers: Sequence[Tuple[float, int]] = DEFAULT_TIERS,
+                 relative_accuracy: float = 0.01):
+        if raw_frames <= 0:
+            raise ValueError("raw_frames must be positive")
+        resolutions = [resolution for resolution, _ in tiers]
+        if not resolutions or resolutions != sorted(resolutions):
+            raise ValueError("tiers must be ordered from finest to coarsest")
+
+        self.raw_frames = raw_frames
+        self.raw_timestamps = array("d", [0.0]) * raw_frames
+        self.raw_frame_times = array("d", [0.0]) * raw_frames
+        self._raw_head = 0
+        self._raw_count = 0
+
+        self.tiers = [RollupTier(resolution, capacity, relative_accuracy)
+                      for resolution, capacity in tiers]
+        self.total_frames = 0
+
+    def add(self, timestamp: float, frame_time: float) -> Optional[RollupBucket]:
+        """Record one frame's duration (seconds) at ``timestamp``.
+
+        Returns the finest-tier bucket this frame closed, if any.
+        """
+        slot = self._raw_head
+        self.raw_timestamps[slot] = timestamp
+        self.raw_frame_times[slot] = frame_time
+        self._raw_head = (slot + 1) % self.raw_frames
+        if self._raw_count < self.raw_frames:
+            self._raw_count += 1
+        self.total_frames += 1
+
+        finest = self.tiers[0]
+        closed = finest.add_sample(timestamp, frame_time)
+        if closed is None:
+            return None
+        result = finest.newest()
+        level = 1
+        while closed is not None and level < len(self.tiers):
+            closed_start = closed.index * self.tiers[level - 1].resolution
+            closed = self.tiers[level].add_bucket(closed_start, closed)
+            level += 1
+        return result
+
+    def tier(self, resolution: float) -> RollupTier:
+        """Get the tier with the given bucket resolution"""
+        for tier in self.tiers:
+            if tier.resolution == resolution:
+                return tier
+        raise KeyError(f"No rollup tier with resolution {resolution}s")
+
+    def buckets(self, resolution: float,
+                since: Optional[float] = None) -> List[RollupBucket]:
+        """Closed and in-progress buckets of one tier in chronological order.
+
+        A coarse tier only receives finer buckets once they close, so its
+        in-progress buckets are completed here from the open buckets of
+        every finer tier.
+        """
+        level = self.tiers.index(self.tier(resolution))
+        result = self.tiers[level].buckets(since)
+
+        partial = {}
+        for finer in self.tiers[:level + 1]:
+            bucket = finer.open
+            if bucket is None or bucket.count == 0:
+                continue
+            index = math.floor(bucket.index * finer.resolution / resolution)
+            merged = partial.get(index)
+            if merged is None:
+                merged = partial[index] = _OpenBucket(index, finer.relative_accuracy)
+            merged.count += bucket.count
+            merged.total += bucket.total
+            merged.min = min(merged.min, bucket.min)
+            merged.max = max(merged.max, bucket.max)
+            merged.sketch.merge(bucket.sketch)
+
+        for index in sorted(partial):
+            bucket = partial[index]
+            start = index * resolution
+            if since is not None and start < since:
+                continue
+            result.append(RollupBucket(
+                start=start,
+                resolution=resolution,
+                count=bucket.count,
+                min=bucket.min,
+                max=bucket.max,
+                mean=bucket.total / bucket.count,
+                p99=bucket.sketch.quantile(0.99)
+            ))
+        return result
+
+    def finest_buckets(self, since: Optional[float] = None,
+                       until: Optional[float] = None) -> Iterator[RollupBucket]:
+        """Buckets at the finest resolution still retained for each period.
+
+        Older stretches of a long session only survive in the coarse tiers,
+        so each tier contributes the buckets that precede the next finer tier.
+        """
+        pieces: List[List[RollupBucket]] = []
+        cutoff = None
+        for tier in self.tiers:
+            resolution = tier.resolution
+            if cutoff is not None:
+                # Hand over on a boundary of this tier so no period is covered twice
+                cutoff = math.ceil(cutoff / resolution) * resolution
+                pieces = [[b for b in piece if b.start >= cutoff] for piece in pieces]
+            buckets = [b for b in self.buckets(resolution)
+                       if (since is None or b.start + b.resolution > since)
+                       and (until is None or b.start <= until)
+                       and (cutoff is None or b.start + b.resolution <= cutoff)]
+            if buckets:
+                pieces.append(buckets)
+                cutoff = buckets[0].start if cutoff is None else min(cutoff, buckets[0].start)
+        for buckets in reversed(pieces):
+            yield from buckets
+
+    def raw(self, since: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Raw (timestamp, frame_time) samples still in the short window"""
+        result = []
+        for position in range(self._raw_count):
+            slot = (self._raw_head - self._raw_count + position) % self.raw_frames
+            timestamp = self.raw_timestamps[slot]
+            if since is None or timestamp >= since:
+                result.append((timestamp, self.raw_frame_times[slot]))
+        return result
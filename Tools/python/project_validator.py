@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Project Validator for TopDeck Config Validator
+Validates every ScriptableObject asset under a Unity project's Assets/
+folder. Results are kept between runs, keyed by the asset's content and
+the content of everything it references (directly or through other
+assets), so only assets that changed, or whose references changed, are
+re-validated; an unchanged project costs one stat() per file.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import animation_curve
+import config_validator
+import unity_yaml
+from config_validator import ASSET_CONFIGS, ConfigValidator, ValidationLevel, ValidationResult, pool_validator
+from unity_yaml import (UNITY_YAML_SUFFIXES, AssetCache, UnityYamlError, default_cache_path, find_project_root,
+                        load_unity_asset, read_meta_guid)
+
+RESULT_CACHE_VERSION = 1
+
+# (asset digest, script classes, ((referenced path, digest), ...)) - results are reused while it matches
+Fingerprint = Tuple[str, Tuple[Optional[str], ...], Tuple[Tuple[str, str], ...]]
+
+
+@dataclass(frozen=True)
+class AssetInfo:
+    """What the project walk needs from one Unity YAML file, cached by content digest"""
+    scripts: Tuple[Tuple[Optional[str], Optional[str]], ...] = ()   # (script class, script GUID) per ScriptableObject
+    references: Tuple[str, ...] = ()                                # GUIDs of referenced assets
+    loadable: bool = True
+
+
+@dataclass
+class ProjectValidation:
+    """Outcome of one ProjectValidator.validate() run"""
+    root: str
+    results: Dict[str, List[ValidationResult]] = field(default_factory=dict)   # asset path -> results
+    scriptable_objects: int = 0
+    validated: List[str] = field(default_factory=list)    # re-validated this run
+    reused: int = 0                                       # reported from the result cache
+    unloadable: List[str] = field(default_factory=list)   # .asset files that are not text YAML
+    seconds: float = 0.0
+
+    def all_results(self) -> List[ValidationResult]:
+        return [result for results in self.results.values() for result in results]
+
+    @property
+    def errors(self) -> List[ValidationResult]:
+        return [result for result in self.all_results() if result.level == ValidationLevel.ERROR]
+
+
+def rules_digest(validator: ConfigValidator) -> str:
+    """Digest of the validator's code and rules; when it changes every cached result is stale"""
+    digest = hashlib.blake2b(digest_size=16)
+    for module in (config_validator, unity_yaml, animation_curve):
+        with open(module.__file__, "rb") as source:
+            digest.update(source.read())
+    digest.update(json.dumps([validator.rules, validator.curve_rules, validator.curve_clamps], sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ProjectValidator:
+    """Incremental validation of a whole Unity project.
+
+    File digests come from an AssetCache (stat-only for unchanged files);
+    per-digest AssetInfo and per-asset results live in a second cache
+    file. An asset is re-validated when its fingerprint (its digest, its
+    script classes and the digests of every asset reachable through its
+    GUID references) differs from the cached one, or when the validator
+    itself changed. Scripts are referenced by path only, so editing C#
+    code does not invalidate the assets that use it.
+    """
+
+    def __init__(self, root: str, cache_path: Optional[str] = None, asset_cache_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path
+        self.assets = AssetCache(asset_cache_path)
+        self.infos: Dict[str, AssetInfo] = {}                              # digest -> info
+        self.meta_guids: Dict[str, str] = {}                               # .meta digest -> GUID
+        self.results: Dict[str, Tuple[Fingerprint, List[ValidationResult]]] = {}   # asset path -> results
+        self.rules = ""
+        self.dirty = False
+        if cache_path and os.path.exists(cache_path):
+            self._read(cache_path)
+
+    def _read(self, path: str):
+        try:
+            with open(path, "rb") as source:
+                version, rules, infos, meta_guids, results = pickle.load(source)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return
+        if version == RESULT_CACHE_VERSION:
+            self.rules, self.infos, self.meta_guids, self.results = rules, infos, meta_guids, results
+
+    def _relative(self, path: str) -> str:
+        # Every path comes from walking self.root, so no os.path.relpath needed
+        return path[len(self.root) + 1:].replace(os.sep, "/")
+
+    def _walk(self) -> Tuple[List[str], Dict[str, str]]:
+        """Unity YAML files under Assets/ and GUID -> path from every ``.meta``"""
+        assets: List[str] = []
+        guid_paths: Dict[str, str] = {}
+        for directory, subdirectories, files in os.walk(os.path.join(self.root, "Assets")):
+            # Unity skips hidden folders and folders ending in '~'
+            subdirectories[:] = sorted(name for name in subdirectories
+                                       if not name.startswith(".") and not name.endswith("~"))
+            for name in sorted(files):
+                path = os.path.join(directory, name)
+                if name.endswith(".meta"):
+                    guid = self._meta_guid(path)
+                    if guid:
+                        guid_paths[guid] = path[:-len(".meta")]
+                elif name.endswith(UNITY_YAML_SUFFIXES):
+                    assets.append(path)
+        return assets, guid_paths
+
+    def _meta_guid(self, path: str) -> Optional[str]:
+        try:
+            digest = self.assets.digest(path)
+        except OSError:
+            return None
+        guid = self.meta_guids.get(digest)
+        if guid is None:
+            guid = read_meta_guid(path)
+            if guid:
+                self.meta_guids[digest] = guid
+                self.dirty = True
+        return guid
+
+    def _dependencies(self, path: str, info: AssetInfo, guid_paths: Dict[str, str],
+                      scanned: Dict[str, Tuple[str, AssetInfo]]) -> Tuple[Tuple[str, str], ...]:
+        """(path, digest) of every asset reachable from ``path`` through GUID references"""
+        reached: Dict[str, str] = {}
+        pending = list(info.references)
+        while pending:
+            dependency = guid_paths.get(pending.pop())
+            if dependency is None or dependency == path or dependency in reached:
+                continue
+            if dependency.endswith(".cs"):
+                reached[dependency] = ""
+                continue
+            if dependency not in scanned:
+                # Not a Unity YAML file (those were all scanned), so there is nothing to follow
+                try:
+                    scanned[dependency] = (self.assets.digest(dependency), AssetInfo())
+                except OSError:   # folders, or deleted since the walk
+                    scanned[dependency] = ("", AssetInfo())
+            digest, dependency_info = scanned[dependency]
+            reached[dependency] = digest
+            pending.extend(dependency_info.references)
+        return tuple(sorted((self._relative(dependency), digest) for dependency, digest in reached.items()))
+
+    def validate(self, jobs: Optional[int] = 1) -> ProjectValidation:
+        """Validate every ScriptableObject asset, re-checking only stale ones.
+
+        Files with new content are parsed (and validated, if they have
+        rules) across ``jobs`` processes, then so are the assets that are
+        stale only because something they reference changed.
+        """
+        start = time.perf_counter()
+        report = ProjectValidation(self.root)
+        paths, guid_paths = self._walk()
+        validator = ConfigValidator(script_guids={guid: os.path.basename(path)[:-len(".cs")]
+                                                  for guid, path in guid_paths.items() if path.endswith(".cs")})
+        rules = rules_digest(validator)
+        previous = self.results if rules == self.rules else {}
+
+        digests: Dict[str, str] = {}
+        for path in paths:
+            try:
+                digests[path] = self.assets.digest(path)
+            except OSError:
+                continue
+        new = [path for path, digest in digests.items() if digest not in self.infos]
+        analyzed = dict(zip(new, validator.map_assets(_analyze, new, jobs)))
+        for path, (info, _) in analyzed.items():
+            self.infos[digests[path]] = info
+            self.dirty = True
+        scanned = {path: (digest, self.infos[digest]) for path, digest in digests.items()}
+
+        results: Dict[str, Tuple[Fingerprint, List[ValidationResult]]] = {}
+        stale: List[Tuple[str, str, Fingerprint]] = []
+        for path in paths:
+            if path not in scanned or not path.endswith(".asset"):
+                continue
+            relative = self._relative(path)
+            digest, info = scanned[path]
+            if not info.loadable:
+                report.unloadable.append(relative)
+                continue
+            if not info.scripts:
+                continue
+            report.scriptable_objects += 1
+            classes = tuple(script or validator.script_guids.get(guid) for script, guid in info.scripts)
+            if not any(script in ASSET_CONFIGS for script in classes):
+                continue
+
+            fingerprint = (digest, classes, self._dependencies(path, info, guid_paths, scanned))
+            cached = previous.get(relative)
+            if cached is not None and cached[0] == fingerprint:
+                results[relative] = cached
+                report.reused += 1
+            else:
+                stale.append((path, relative, fingerprint))
+                results[relative] = (fingerprint, [])
+
+        unvalidated = [path for path, _, _ in stale if analyzed.get(path, (None, None))[1] is None]
+        analyzed.update(zip(unvalidated, validator.map_assets(_analyze, unvalidated, jobs)))
+        for path, relative, fingerprint in stale:
+            results[relative] = (fingerprint, analyzed[path][1] or [])
+            report.validated.append(relative)
+        for relative, (_, asset_results) in results.items():
+            report.results[relative] = asset_results
+
+        if rules != self.rules or results != self.results:
+            self.rules, self.results = rules, results
+            self.dirty = True
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def save(self):
+        """Write both caches (dropping infos no current file has)"""
+        self.assets.save()
+        if not self.cache_path or not self.dirty:
+            return
+        live = {entry[3] for entry in self.assets.stats.values()}
+        self.infos = {digest: info for digest, info in self.infos.items() if digest in live}
+        self.meta_guids = {digest: guid for digest, guid in self.meta_guids.items() if digest in live}
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        temporary = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as out:
+            pickle.dump((RESULT_CACHE_VERSION, self.rules, self.infos, self.meta_guids, self.results),
+                        out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.cache_path)
+        self.dirty = False
+
+    def __enter__(self) -> "ProjectValidator":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.save()
+
+
+def analyze_asset(path: str, validator: ConfigValidator) -> Tuple[AssetInfo, Optional[List[ValidationResult]]]:
+    """Parse a Unity YAML file once for its AssetInfo and, if it has rules, its results"""
+    try:
+        asset = load_unity_asset(path)
+    except (OSError, UnicodeDecodeError, UnityYamlError):
+        return AssetInfo(loadable=False), None
+    scriptable = asset.scriptable_objects()
+    info = AssetInfo(scripts=tuple((obj.script_class, obj.script_guid) for obj in scriptable),
+                     references=tuple(asset.references()))
+    if not any(validator.script_class(obj) in ASSET_CONFIGS for obj in scriptable):
+        return info, None
+    return info, validator.validate_unity_asset(asset)
+
+
+def _analyze(path: str) -> Tuple[AssetInfo, Optional[List[ValidationResult]]]:
+    return analyze_asset(path, pool_validator())
+
+
+def validate_project(root: str, use_cache: bool = True, verbose: bool = False, jobs: Optional[int] = 1) -> int:
+    """Validate a Unity project and print one report; returns the exit code"""
+    project = find_project_root(root)
+    if project is None:
+        print(f"❌ No Unity project (a folder with Assets/) at or above {root}")
+        return 1
+    cache_path = default_cache_path(project, "validation_cache.pickle") if use_cache else None
+    asset_cache_path = default_cache_path(project) if use_cache else None
+    with ProjectValidator(project, cache_path, asset_cache_path) as validator:
+        report = validator.validate(jobs)
+
+    if verbose:
+        for path in report.validated:
+            print(f"Validated {path}")
+    for path in report.unloadable:
+        print(f"⚠️ Skipped {path}: not a text-serialized Unity asset")
+    summary = ConfigValidator()
+    summary.results = report.all_results()
+    print("\n" + summary.generate_report())
+    print(f"{len(report.results)} of {report.scriptable_objects} ScriptableObject assets have rules: "
+          f"{len(report.validated)} validated, {report.reused} unchanged ({report.seconds:.3f}s)")
+    return 0 if not report.errors else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate every ScriptableObject asset in a Unity project"""
+    parser = argparse.ArgumentParser(description="Incrementally validate a TopDeck Unity project")
+    parser.add_argument("root", nargs="?", default=".", help="project folder, or any folder inside it")
+    parser.add_argument("--no-cache", action="store_true", help="validate everything and save nothing")
+    parser.add_argument("--verbose", "-v", action="store_true", help="list the assets re-validated")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for parsing and validating (default: one per core)")
+    args = parser.parse_args(argv)
+    return validate_project(args.root, use_cache=not args.no_cache, verbose=args.verbose, jobs=args.jobs or None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
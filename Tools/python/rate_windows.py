@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Rate Windows for TopDeck Stats Dashboard
+Bucketed sliding-window counters for gameplay rates (kills/min, DPS,
+income and spend) over the last 10s, the last 60s and the current wave.
+Updates and reads are O(1) amortized, independent of session length.
+"""
+
+import math
+from array import array
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class WindowedSum:
+    """Sum of amounts added during the trailing ``window`` seconds.
+
+    The window is split into ``buckets`` equal time buckets held in a ring;
+    moving forward only clears the buckets that fell out, so the window
+    slides in steps of ``window / buckets`` seconds. Samples older than the
+    newest bucket are counted in the newest bucket.
+    """
+
+    __slots__ = ("window", "bucket_width", "sums", "total", "_index", "_start")
+
+    def __init__(self, window: float, buckets: int):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("window and buckets must be positive")
+        self.window = window
+        self.bucket_width = window / buckets
+        self.sums = array("d", [0.0]) * buckets
+        self.total = 0.0
+        self._index: Optional[int] = None
+        self._start = 0.0
+
+    def reset(self, timestamp: float):
+        """Empty the window; rates are measured from ``timestamp`` until it fills"""
+        for slot in range(len(self.sums)):
+            self.sums[slot] = 0.0
+        self.total = 0.0
+        self._index = math.floor(timestamp / self.bucket_width)
+        self._start = timestamp
+
+    def _advance(self, timestamp: float) -> int:
+        index = math.floor(timestamp / self.bucket_width)
+        if self._index is None:
+            self.reset(timestamp)
+            return index
+        if index <= self._index:
+            return self._index
+
+        buckets = len(self.sums)
+        if index - self._index >= buckets:
+            for slot in range(buckets):
+                self.sums[slot] = 0.0
+            self.total = 0.0
+        else:
+            for expired in range(self._index + 1, index + 1):
+                slot = expired % buckets
+                self.total -= self.sums[slot]
+                self.sums[slot] = 0.0
+                if slot == 0:
+                    # Re-sum once per lap so subtraction error cannot build up
+                    self.total = math.fsum(self.sums)
+        self._index = index
+        return index
+
+    def add(self, timestamp: float, amount: float = 1.0):
+        """Add ``amount`` at ``timestamp``"""
+        index = self._advance(timestamp)
+        self.sums[index % len(self.sums)] += amount
+        self.total += amount
+
+    def sum(self, now: float) -> float:
+        """Total added within the window ending at ``now``"""
+        self._advance(now)
+        return self.total
+
+    def rate(self, now: float) -> float:
+        """Amount per second over the window ending at ``now``.
+
+        Until a full window has passed since the first sample or reset, the
+        rate is taken over the time actually covered.
+        """
+        index = self._advance(now)
+        covered = (len(self.sums) - 1) * self.bucket_width + (now - index * self.bucket_width)
+        span = min(covered, now - self._start)
+        return self.total / span if span > 0 else 0.0
+
+
+class RunningSum:
+    """Sum of amounts since the last reset, e.g. since the wave started"""
+
+    __slots__ = ("total", "_start")
+
+    def __init__(self):
+        self.total = 0.0
+        self._start: Optional[float] = None
+
+    def reset(self, timestamp: float):
+        self.total = 0.0
+        self._start = timestamp
+
+    def add(self, timestamp: float, amount: float = 1.0):
+        if self._start is None:
+            self._start = timestamp
+        self.total += amount
+
+    def rate(self, now: float) -> float:
+        span = now - self._start if self._start is not None else 0.0
+        return self.total / span if span > 0 else 0.0
+
+
+class RateTracker:
+    """10s/60s/current-wave rates for a fixed set of named metrics"""
+
+    DEFAULT_WINDOWS: Sequence[Tuple[str, float, int]] = (("10s", 10.0, 10), ("60s", 60.0, 12))
+
+    def __init__(self, metrics: Sequence[str],
+                 windows: Sequence[Tuple[str, float, int]] = DEFAULT_WINDOWS):
+        self.window_names = [name for name, _, _ in windows] + ["wave"]
+        self.metrics: Dict[str, Dict[str, object]] = {}
+        for metric in metrics:
+            counters = {name: WindowedSum(window, buckets) for name, window, buckets in windows}
+            counters["wave"] = RunningSum()
+            self.metrics[metric] = counters
+
+    def add(self, metric: str, timestamp: float, amount: float = 1.0):
+        """Add ``amount`` of ``metric`` at ``timestamp`` to every window"""
+        for counter in self.metrics[metric].values():
+            counter.add(timestamp, amount)
+
+    def reset(self, timestamp: float):
+        """Start every window over (e.g. at session start)"""
+        for counters in self.metrics.values():
+            for counter in counters.values():
+                counter.reset(timestamp)
+
+    def start_wave(self, timestamp: float):
+        """Start the current-wave window over"""
+        for counters in self.metrics.values():
+            counters["wave"].reset(timestamp)
+
+    def rate(self, metric: str, window: str, now: float) -> float:
+        """Per-second rate of ``metric`` over ``window`` ("10s", "60s", "wave")"""
+        return self.metrics[metric][window].rate(now)
+
+    def rates(self, metric: str, now: float, scale: float = 1.0) -> Dict[str, float]:
+        """Rates of ``metric`` over every window, multiplied by ``scale``"""
+        return {name: counter.rate(now) * scale for name, counter in self.metrics[metric].items()}
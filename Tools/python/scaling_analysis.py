@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Scaling Analysis for TopDeck Stats Dashboard
+How frame time scales with the number of live attackers, projectiles and
+defenders. Joins each frame to the entity counts in effect when it ran,
+fits frame time against the counts, and predicts the attacker count at
+which the game drops below 60 and 30 FPS.
+
+Requires numpy.
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from entity_gauges import ENTITY_KINDS, EntityGauges
+from session_analytics import GroupedDistribution, group_distribution
+
+FPS_TARGETS = (60.0, 30.0)
+
+
+@dataclass
+class ScalingFit:
+    """Linear model: frame_ms = intercept_ms + sum(marginal_ms[kind] * count[kind]).
+
+    A kind's marginal cost is None when its count never varied
+    independently of the others in the fitted frames; its cost is then
+    part of the intercept (or of the kinds it moved with).
+    """
+    intercept_ms: float
+    marginal_ms: Dict[str, Optional[float]]
+    r_squared: float
+    samples: int
+    mean_counts: Dict[str, float]
+
+    def predict_ms(self, counts: Dict[str, float]) -> float:
+        return self.intercept_ms + sum(slope * counts.get(kind, 0.0)
+                                       for kind, slope in self.marginal_ms.items() if slope is not None)
+
+    def count_at_fps(self, fps: float, kind: str = "attackers",
+                     others: Optional[Dict[str, float]] = None) -> Optional[float]:
+        """``kind`` count at which predicted frame time reaches 1/``fps``.
+
+        Other kinds are held at ``others`` (their session means by default).
+        Returns None when frame time does not grow with ``kind``.
+        """
+        slope = self.marginal_ms[kind]
+        if slope is None or slope <= 0:
+            return None
+        held = dict(others if others is not None else self.mean_counts)
+        held[kind] = 0.0
+        return max(0.0, (1000.0 / fps - self.predict_ms(held)) / slope)
+
+
+@dataclass
+class ScalingReport:
+    fit: ScalingFit
+    p95_fit: Optional[ScalingFit]
+    by_attackers: GroupedDistribution
+    predictions: Dict[float, Dict[str, Optional[float]]] = field(default_factory=dict)
+
+
+def align_frames(gauges: EntityGauges) -> Tuple[np.ndarray, np.ndarray]:
+    """Frame times (ms) and an (n, kinds) matrix of the counts in effect for each frame.
+
+    Frames before the first gauge update are dropped.
+    """
+    frame_ts = np.frombuffer(gauges.frame_timestamps, dtype=np.float64)
+    frame_ms = np.frombuffer(gauges.frame_times, dtype=np.float64) * 1000.0
+    gauge_ts = np.frombuffer(gauges.gauge_timestamps, dtype=np.float64)
+    if len(gauge_ts) == 0 or len(frame_ts) == 0:
+        return np.empty(0), np.empty((0, len(ENTITY_KINDS)))
+
+    # Gauge updates arrive in time order; stable-sort just in case
+    order = np.argsort(gauge_ts, kind="stable")
+    gauge_ts = gauge_ts[order]
+    counts = np.column_stack([
+        np.frombuffer(gauges.gauge_counts[kind], dtype=np.uint32)[order].astype(np.float64)
+        for kind in ENTITY_KINDS
+    ])
+
+    # A frame's timestamp marks its end, so use the counts at or before it
+    index = np.searchsorted(gauge_ts, frame_ts, side="right") - 1
+    valid = index >= 0
+    return frame_ms[valid], counts[index[valid]]
+
+
+def fit_scaling(frame_ms: np.ndarray, counts: np.ndarray,
+                kinds: Sequence[str] = ENTITY_KINDS) -> ScalingFit:
+    """Ordinary least squares of frame time against entity counts.
+
+    Kinds whose counts move in lockstep (projectiles tracking attackers)
+    cannot be told apart, and their combined cost is split between them.
+    A kind whose count is constant, or an exact combination of the kinds
+    before it, is left out of the fit and gets no marginal cost.
+    """
+    design = np.ones((len(frame_ms), 1))
+    fitted = []
+    for column, kind in enumerate(kinds):
+        candidate = np.column_stack([design, counts[:, column]])
+        if np.linalg.matrix_rank(candidate) == candidate.shape[1]:
+            design = candidate
+            fitted.append(kind)
+    if len(frame_ms) < design.shape[1]:
+        raise ValueError("not enough frames to fit")
+    coefficients, _, _, _ = np.linalg.lstsq(design, frame_ms, rcond=None)
+    residual = frame_ms - design @ coefficients
+    total = np.sum((frame_ms - frame_ms.mean()) ** 2)
+    slopes = dict(zip(fitted, coefficients[1:]))
+    return ScalingFit(
+        intercept_ms=float(coefficients[0]),
+        marginal_ms={kind: float(slopes[kind]) if kind in slopes else None for kind in kinds},
+        r_squared=float(1.0 - np.sum(residual ** 2) / total) if total > 0 else 0.0,
+        samples=len(frame_ms),
+        mean_counts={kind: float(m) for kind, m in zip(kinds, counts.mean(axis=0))}
+    )
+
+
+def _p95_fit(frame_ms: np.ndarray, counts: np.ndarray, bins: int) -> Optional[ScalingFit]:
+    """Fit through the p95 frame time of each combination of binned counts (worst-case trend)"""
+    widths = np.maximum(1.0, np.ceil((counts.max(axis=0) + 1) / bins))
+    cells = np.floor(counts / widths).astype(np.int64)
+    keys = np.ravel_multi_index(cells.T, tuple(cells.max(axis=0) + 1))
+    groups = group_distribution(keys, frame_ms, percentiles=(95.0,))
+    populated = groups.counts >= 20
+    if populated.sum() < len(ENTITY_KINDS) + 1:
+        return None
+    # Mean entity counts of each populated cell
+    order = np.argsort(keys, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(keys[order]) != 0])
+    cell_counts = np.add.reduceat(counts[order], starts, axis=0) / groups.counts[:, None]
+    return fit_scaling(groups.percentiles[95.0][populated], cell_counts[populated])
+
+
+def scaling_report(gauges: EntityGauges, bins: int = 20) -> ScalingReport:
+    """Fit frame time vs. entity counts and predict the 60/30 FPS limits"""
+    frame_ms, counts = align_frames(gauges)
+    fit = fit_scaling(frame_ms, counts)
+    p95_fit = _p95_fit(frame_ms, counts, bins)
+
+    attackers = counts[:, ENTITY_KINDS.index("attackers")]
+    width = max(1, int(np.ceil((attackers.max() + 1) / bins)))
+    by_attackers = group_distribution((attackers // width * width).astype(np.int64), frame_ms,
+                                      (50.0, 95.0, 99.0), "attackers", "frame_time_ms")
+
+    predictions = {
+        fps: {"mean": fit.count_at_fps(fps), "p95": p95_fit.count_at_fps(fps) if p95_fit else None}
+        for fps in FPS_TARGETS
+    }
+    return ScalingReport(fit, p95_fit, by_attackers, predictions)
+
+
+def format_report(report: ScalingReport) -> str:
+    fit = report.fit
+    lines = ["=" * 60, "FRAME TIME SCALING", "=" * 60]
+    lines.append(f"  Frames analysed: {fit.samples:,}   R²: {fit.r_squared:.3f}")
+    lines.append(f"  Base frame time: {fit.intercept_ms:.2f} ms")
+    for kind, slope in fit.marginal_ms.items():
+        slope_text = f"{slope * 1000.0:+8.1f} µs/frame" if slope is not None else f"{'n/a':>8} µs/frame"
+        lines.append(f"  +1 {kind[:-1]:<10} {slope_text} (mean {fit.mean_counts[kind]:.1f} alive)")
+    lines.append("")
+    for fps, prediction in report.predictions.items():
+        mean = prediction["mean"]
+        p95 = prediction["p95"]
+        mean_text = f"{mean:,.0f}" if mean is not None else "n/a"
+        p95_text = f"{p95:,.0f}" if p95 is not None else "n/a"
+        lines.append(f"  Attackers at {fps:.0f} FPS: ~{mean_text} (mean frame), ~{p95_text} (p95 frame)")
+    lines.append("")
+    lines.append("  Frame time by live attackers:")
+    for row in report.by_attackers.rows():
+        lines.append(f"    {row['attackers']:>5}+  n={row['count']:<7,} p50={row['p50']:.2f}  "
+                     f"p95={row['p95']:.2f}  p99={row['p99']:.2f} ms")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+def simulate(gauges: EntityGauges, seconds: float, fps: float = 60.0, seed: int = 3):
+    """Fill ``gauges`` with a synthetic session whose cost grows with entities"""
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * fps)
+    t = 1_700_000_000.0 + np.arange(frames) / fps
+    wave_phase = (np.arange(frames) % int(90 * fps)) / (90 * fps)
+    attackers = np.round(400 * np.sin(np.pi * wave_phase) ** 2 + rng.normal(0, 5, frames)).clip(0)
+    projectiles = np.round(attackers * 1.5 + rng.normal(0, 10, frames)).clip(0)
+    defenders = np.minimum(40, 5 + np.arange(frames) // int(120 * fps))
+    frame_s = (6.0 + 0.035 * attackers + 0.004 * projectiles + 0.05 * defenders
+               + rng.gamma(2.0, 0.4, frames)) / 1000.0
+
+    # One gauge update every 6 frames (10 Hz), as a game would send
+    for i in range(0, frames, 6):
+        gauges.set_counts(t[i], int(attackers[i]), int(projectiles[i]), int(defenders[i]))
+    gauges.frame_timestamps.extend(t + frame_s)
+    gauges.frame_times.extend(frame_s)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the scaling analysis on a synthetic hour-long session"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=3600.0, help="synthetic session length")
+    args = parser.parse_args(argv)
+
+    gauges = EntityGauges()
+    simulate(gauges, args.seconds)
+    start = time.perf_counter()
+    report = scaling_report(gauges)
+    elapsed = time.perf_counter() - start
+    print(format_report(report))
+    print(f"  Analysed {len(gauges.frame_times):,} frames in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
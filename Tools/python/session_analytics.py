@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Session Analytics for TopDeck Stats Dashboard
+NumPy-backed balance analytics across many GameSessions.
+Sessions are held as columns, and every group-by computes count, mean,
+min, max and percentiles for all groups in one vectorized pass.
+
+Requires numpy.
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from session_archive import SessionArchive
+from stats_dashboard import GameSession, StatCategory
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+# Mirrors session_archive's fixed record layout field for field
+RECORD_DTYPE = np.dtype([
+    ("session_id", "S48"),
+    ("start_time", "<f8"), ("end_time", "<f8"),
+    ("waves_completed", "<u4"), ("enemies_killed", "<u4"), ("defenders_lost", "<u4"),
+    ("money_earned", "<i8"), ("money_spent", "<i8"),
+    ("upgrades_purchased", "<u4"), ("highest_wave", "<u4"),
+    ("total_damage_dealt", "<f8"), ("total_damage_taken", "<f8"),
+    ("frames", "<u8"),
+    ("frame_time_p50_ms", "<f8"), ("frame_time_p95_ms", "<f8"), ("frame_time_p99_ms", "<f8"),
+    ("segment", "<u4"), ("offset", "<u8"), ("event_count", "<u8"),
+])
+
+_NUMERIC_FIELDS = [f.name for f in fields(GameSession) if f.name != "session_id"]
+
+# Per-session frame-time percentiles kept by the archive
+FRAME_FIELDS = ("frame_time_p50_ms", "frame_time_p95_ms", "frame_time_p99_ms")
+
+
+@dataclass
+class GroupedDistribution:
+    """Per-group distribution of one value, with one array entry per group"""
+    key: str
+    value: str
+    keys: np.ndarray
+    counts: np.ndarray
+    mean: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    percentiles: Dict[float, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows(self) -> List[Dict[str, float]]:
+        """One dict per group, for printing or JSON export"""
+        rows = []
+        for i, key in enumerate(self.keys.tolist()):
+            row = {self.key: key, "count": int(self.counts[i]), "mean": float(self.mean[i]),
+                   "min": float(self.min[i]), "max": float(self.max[i])}
+            for q, values in self.percentiles.items():
+                row[f"p{q:g}"] = float(values[i])
+            rows.append(row)
+        return rows
+
+
+def group_distribution(keys: np.ndarray, values: np.ndarray,
+                       percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                       key_name: str = "key", value_name: str = "value") -> GroupedDistribution:
+    """Distribution of ``values`` for each distinct ``keys`` entry.
+
+    Rows with a NaN value are ignored. One lexsort orders the rows by
+    (key, value); group boundaries then give count/min/max directly and
+    percentiles by linear interpolation within each group, matching
+    ``numpy.percentile``'s default method.
+    """
+    keys = np.asarray(keys)
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    keys, values = keys[valid], values[valid]
+
+    empty = np.empty(0)
+    if len(values) == 0:
+        return GroupedDistribution(key_name, value_name, keys[:0], np.empty(0, np.int64),
+                                   empty, empty, empty, {q: empty for q in percentiles})
+
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    ends = starts + counts - 1
+
+    result = {}
+    for q in percentiles:
+        position = starts + (counts - 1) * (q / 100.0)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, ends)
+        fraction = position - low
+        result[q] = values[low] + (values[high] - values[low]) * fraction
+
+    return GroupedDistribution(
+        key=key_name,
+        value=value_name,
+        keys=keys[starts],
+        counts=counts,
+        mean=np.add.reduceat(values, starts) / counts,
+        min=values[starts],
+        max=values[ends],
+        percentiles=result
+    )
+
+
+class SessionTable:
+    """Column-oriented view of many GameSessions.
+
+    Each GameSession field is one NumPy array (``end_time`` is NaN for
+    sessions that never ended); tables read from an archive also hold the
+    per-session frame-time percentiles (NaN for sessions without frames). Derived per-session metrics are computed
+    for every session at once; a metric that is undefined for a session
+    (no kills, no duration) is NaN and drops out of group-bys.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], session_ids: Optional[np.ndarray] = None,
+                 waves: Optional["WaveTable"] = None):
+        self.columns = columns
+        self.session_ids = session_ids
+        self.waves = waves
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[GameSession]) -> "SessionTable":
+        """Build from GameSession objects (e.g. ``StatsDashboard.sessions``)"""
+        sessions = list(sessions)
+        columns = {}
+        for name in _NUMERIC_FIELDS:
+            if name != "end_time":
+                columns[name] = np.fromiter((getattr(s, name) for s in sessions),
+                                            dtype=np.float64, count=len(sessions))
+        columns["end_time"] = np.fromiter(
+            (np.nan if s.end_time is None else s.end_time for s in sessions),
+            dtype=np.float64, count=len(sessions)
+        )
+        ids = np.array([s.session_id for s in sessions], dtype=object)
+        return cls(columns, ids)
+
+    @classmethod
+    def from_archive(cls, archive: SessionArchive, with_waves: bool = True) -> "SessionTable":
+        """Build straight from an archive's mapped records, without per-session decoding"""
+        records = np.frombuffer(archive.records_view(), dtype=RECORD_DTYPE)
+        columns = {name: records[name].astype(np.float64) for name in _NUMERIC_FIELDS}
+        has_frames = records["frames"] > 0
+        for name in FRAME_FIELDS:
+            columns[name] = np.where(has_frames, records[name], np.nan)
+        waves = WaveTable.from_archive(archive, records) if with_waves else None
+        return cls(columns, records["session_id"].copy(), waves)
+
+    def __len__(self) -> int:
+        return len(self.columns["start_time"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    # -- derived per-session metrics -----------------------------------------
+
+    @property
+    def duration(self) -> np.ndarray:
+        """Session length in seconds (NaN while running)"""
+        return self.columns["end_time"] - self.columns["start_time"]
+
+    @property
+    def kills_per_minute(self) -> np.ndarray:
+        minutes = self.duration / 60.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(minutes > 0, self.columns["enemies_killed"] / minutes, np.nan)
+
+    @property
+    def cost_per_kill(self) -> np.ndarray:
+        kills = self.columns["enemies_killed"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(kills > 0, self.columns["money_spent"] / kills, np.nan)
+
+    @property
+    def kills_per_wave(self) -> np.ndarray:
+        return self.columns["enemies_killed"] / np.maximum(1, self.columns["waves_completed"])
+
+    @property
+    def money_efficiency(self) -> np.ndarray:
+        return self.columns["money_spent"] / np.maximum(1, self.columns["money_earned"])
+
+    @property
+    def damage_ratio(self) -> np.ndarray:
+        return self.columns["total_damage_dealt"] / np.maximum(1, self.columns["total_damage_taken"])
+
+    def metric(self, name: str) -> np.ndarray:
+        """A stored column or derived metric by name"""
+        if name in self.columns:
+            return self.columns[name]
+        value = getattr(type(self), name, None)
+        if not isinstance(value, property):
+            raise KeyError(f"Unknown session metric: {name}")
+        return getattr(self, name)
+
+    # -- group-bys ---------------------------------------------------------
+
+    def group_by(self, key: str, value: str,
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> GroupedDistribution:
+        """Distribution of metric ``value`` for each distinct ``key``"""
+        return group_distribution(self.metric(key).astype(np.int64), self.metric(value),
+                                  percentiles, key, value)
+
+    def kills_per_minute_by_upgrades(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES):
+        return self.group_by("upgrades_purchased", "kills_per_minute", percentiles)
+
+    def cost_per_kill_by_highest_wave(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES):
+        return self.group_by("highest_wave", "cost_per_kill", percentiles)
+
+    def wave_duration_by_wave(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES):
+        if self.waves is None:
+            raise ValueError("No wave data; build the table from an archive with with_waves=True")
+        return group_distribution(self.waves.wave, self.waves.duration, percentiles,
+                                  "wave", "wave_duration")
+
+
+def _gather(buffer: np.ndarray, starts: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Read one ``dtype`` item at each byte offset in ``starts``"""
+    positions = (starts[:, None] + np.arange(dtype.itemsize)).ravel()
+    return buffer[positions].view(dtype)
+
+
+@dataclass
+class WaveTable:
+    """One row per completed wave across all archived sessions"""
+    session_index: np.ndarray
+    wave: np.ndarray
+    duration: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.wave)
+
+    @classmethod
+    def from_archive(cls, archive: SessionArchive,
+                     records: Optional[np.ndarray] = None) -> "WaveTable":
+        """Pair each archived ``wave_duration`` event with the preceding ``wave_completed``.
+
+        ``StatsDashboard.complete_wave`` records the wave number and then
+        its duration, so each duration belongs to the most recent wave
+        number recorded in the same session.
+        """
+        completed_id = archive.find_metric(StatCategory.WAVES, "wave_completed")
+        duration_id = archive.find_metric(StatCategory.WAVES, "wave_duration")
+        empty = cls(np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0))
+        if completed_id is None or duration_id is None:
+            return empty
+        if records is None:
+            records = np.frombuffer(archive.records_view(), dtype=RECORD_DTYPE)
+
+        # Gather the ID and value columns of every session in a segment at
+        # once. Column blocks start at arbitrary byte offsets, so they are
+        # gathered bytewise and reinterpreted.
+        session_parts, value_parts, id_parts = [], [], []
+        has_events = records["event_count"] > 0
+        for segment in np.unique(records["segment"][has_events]).tolist():
+            indexes = np.flatnonzero(has_events & (records["segment"] == segment))
+            counts = records["event_count"][indexes].astype(np.int64)
+            offsets = records["offset"][indexes].astype(np.int64)
+            row_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            segment_bytes = np.frombuffer(archive.segment_view(segment), dtype=np.uint8)
+
+            metric_ids = _gather(segment_bytes, np.repeat(offsets + 16 * counts, counts) + 4 * row_offsets,
+                                 np.dtype("<u4"))
+            wanted = np.flatnonzero((metric_ids == completed_id) | (metric_ids == duration_id))
+            value_starts = np.repeat(offsets + 8 * counts, counts)[wanted] + 8 * row_offsets[wanted]
+            session_parts.append(np.repeat(indexes, counts)[wanted])
+            value_parts.append(_gather(segment_bytes, value_starts, np.dtype("<f8")))
+            id_parts.append(metric_ids[wanted])
+            del segment_bytes
+        if not session_parts:
+            return empty
+
+        sessions = np.concatenate(session_parts)
+        values = np.concatenate(value_parts)
+        metric_ids = np.concatenate(id_parts)
+
+        # Latest wave_completed row at or before each row, ignoring rows
+        # from an earlier session
+        positions = np.arange(len(values))
+        is_completed = metric_ids == completed_id
+        latest = np.maximum.accumulate(np.where(is_completed, positions, -1))
+        session_start = np.r_[True, sessions[1:] != sessions[:-1]]
+        first_row = np.maximum.accumulate(np.where(session_start, positions, 0))
+        latest[latest < first_row] = -1
+
+        is_duration = ~is_completed & (latest >= 0)
+        return cls(
+            session_index=sessions[is_duration],
+            wave=values[latest[is_duration]].astype(np.int64),
+            duration=values[is_duration]
+        )
+
+
+def naive_group_by(sessions: Sequence[GameSession], key, value,
+                   percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[int, Dict[str, float]]:
+    """Per-session Python loop equivalent of SessionTable.group_by (benchmark baseline)"""
+    groups: Dict[int, List[float]] = {}
+    for session in sessions:
+        result = value(session)
+        if result is not None:
+            groups.setdefault(key(session), []).append(result)
+    summary = {}
+    for group_key in sorted(groups):
+        samples = sorted(groups[group_key])
+        stats = {"count": len(samples), "mean": sum(samples) / len(samples),
+                 "min": samples[0], "max": samples[-1]}
+        for q in percentiles:
+            position = (len(samples) - 1) * q / 100.0
+            low = int(position)
+            high = min(low + 1, len(samples) - 1)
+            stats[f"p{q:g}"] = samples[low] + (samples[high] - samples[low]) * (position - low)
+        summary[group_key] = stats
+    return summary
+
+
+def print_distribution(distribution: GroupedDistribution, limit: int = 20):
+    """Print a group-by as a table"""
+    print(f"\n📊 {distribution.value} by {distribution.key}")
+    print("-" * 60)
+    for row in distribution.rows()[:limit]:
+        quantiles = "  ".join(f"{k}={v:,.2f}" for k, v in row.items() if k.startswith("p"))
+        print(f"  {distribution.key}={row[distribution.key]:<4} n={row['count']:<6} "
+              f"mean={row['mean']:,.2f}  {quantiles}")
+    if len(distribution) > limit:
+        print(f"  ... {len(distribution) - limit} more groups")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print balance distributions for an archive directory"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: session_analytics.py <archive_dir>")
+        return 1
+
+    with SessionArchive(argv[0]) as archive:
+        table = SessionTable.from_archive(archive)
+        print("=" * 60)
+        print(f"SESSION ANALYTICS - {len(table):,} sessions, {len(table.waves):,} waves")
+        print("=" * 60)
+        print_distribution(table.wave_duration_by_wave())
+        print_distribution(table.kills_per_minute_by_upgrades())
+        print_distribution(table.cost_per_kill_by_highest_wave())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Session Archive for TopDeck Stats Dashboard
+Append-only, memory-mapped store for GameSession history.
+
+Layout of an archive directory:
+
+    sessions.dat     header + one fixed-size binary record per session
+    events-NNNNN.seg append-only segments of per-session event columns
+    metrics.tsv      interned "category<TAB>name" lines (line number = ID)
+    units.tsv        interned unit strings (line number = ID)
+
+Opening an archive maps sessions.dat and reads the two small name tables;
+session records and event columns are decoded straight from the mapping,
+so nothing is parsed up front.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from stat_store import KIND_BOOL, KIND_INT, KIND_OBJECT
+from stats_dashboard import GameSession, StatCategory, StatEntry, CATEGORY_BY_NAME
+
+MAGIC = b"TDSA"
+VERSION = 1
+
+# magic, version, record size, flags (bit 0: records appended in start_time order)
+_HEADER = struct.Struct("<4sHHI")
+_FLAG_SORTED = 1
+
+_SESSION_ID_BYTES = 48
+_RECORD = struct.Struct(
+    "<48s"   # session_id (UTF-8, NUL padded)
+    "dd"     # start_time, end_time (NaN while running)
+    "IIIqq"  # waves_completed, enemies_killed, defenders_lost, money_earned, money_spent
+    "II"     # upgrades_purchased, highest_wave
+    "dd"     # total_damage_dealt, total_damage_taken
+    "Q"      # frames
+    "ddd"    # frame_time_p50_ms, frame_time_p95_ms, frame_time_p99_ms
+    "IQQ"    # segment, offset, event_count
+)
+_START_TIME_OFFSET = _SESSION_ID_BYTES
+
+# Bytes per archived event: timestamp, value, metric ID, unit/kind flags
+EVENT_BYTES = 8 + 8 + 4 + 2
+
+
+def _pack_session_id(session_id: str) -> bytes:
+    """Session ID as stored in a record: UTF-8, NUL padded.
+
+    IDs longer than the field keep a prefix cut at a character boundary
+    plus "~" and a hash of the full ID, so they still decode and stay
+    distinct in ``get``.
+    """
+    raw = session_id.encode("utf-8")
+    if len(raw) > _SESSION_ID_BYTES:
+        digest = hashlib.blake2b(raw, digest_size=8).hexdigest().encode("ascii")
+        prefix = raw[:_SESSION_ID_BYTES - len(digest) - 1].decode("utf-8", "ignore").encode("utf-8")
+        raw = prefix + b"~" + digest
+    return raw.ljust(_SESSION_ID_BYTES, b"\0")
+
+
+@dataclass
+class ArchivedSession:
+    """A GameSession summary read back from a SessionArchive"""
+    index: int
+    session_id: str
+    start_time: float
+    end_time: Optional[float]
+    waves_completed: int
+    enemies_killed: int
+    defenders_lost: int
+    money_earned: int
+    money_spent: int
+    upgrades_purchased: int
+    highest_wave: int
+    total_damage_dealt: float
+    total_damage_taken: float
+    frames: int
+    frame_time_p50_ms: float
+    frame_time_p95_ms: float
+    frame_time_p99_ms: float
+    segment: int
+    offset: int
+    event_count: int
+
+    def duration(self) -> float:
+        """Session duration in seconds (0 if it never ended)"""
+        return (self.end_time - self.start_time) if self.end_time is not None else 0.0
+
+    def to_game_session(self) -> GameSession:
+        """Rebuild the GameSession this record was written from"""
+        names = {f.name for f in fields(GameSession)}
+        return GameSession(**{k: v for k, v in self.__dict__.items() if k in names})
+
+
+@dataclass
+class EventColumns:
+    """Zero-copy views of one session's archived events"""
+    timestamps: memoryview
+    values: memoryview
+    metric_ids: memoryview
+    flags: memoryview
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class SessionArchive:
+    """Persistent archive of GameSession summaries and their event streams.
+
+    Records are fixed-size, so record ``i`` lives at a known offset and
+    lookups by position are O(1). Lookups by ``session_id`` use a dictionary
+    built on first use with one C-level pass over the ID column. Start-time
+    range queries binary-search the records directly while they were
+    appended in start_time order (the normal case), falling back to a
+    sorted index built on first use otherwise.
+    """
+
+    def __init__(self, path: str, segment_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        os.makedirs(path, exist_ok=True)
+
+        self._sessions_path = os.path.join(path, "sessions.dat")
+        if not os.path.exists(self._sessions_path):
+            with open(self._sessions_path, "wb") as out:
+                out.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size, _FLAG_SORTED))
+
+        self._file = open(self._sessions_path, "r+b")
+        magic, version, record_size, flags = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self._sessions_path} is not a session archive")
+        if version != VERSION or record_size != _RECORD.size:
+            raise ValueError(f"Unsupported session archive version {version}")
+        self._flags = flags
+
+        self._metrics: List[Tuple[StatCategory, str]] = []
+        self._metric_ids: Dict[Tuple[StatCategory, str], int] = {}
+        for line in self._read_table("metrics.tsv"):
+            category, name = line.split("\t", 1)
+            key = (CATEGORY_BY_NAME[category], name)
+            self._metric_ids[key] = len(self._metrics)
+            self._metrics.append(key)
+
+        self._units: List[str] = list(self._read_table("units.tsv"))
+        self._unit_ids = {unit: i for i, unit in enumerate(self._units)}
+        if not self._units:
+            self._append_table("units.tsv", [""])
+            self._units, self._unit_ids = [""], {"": 0}
+
+        self._map: Optional[mmap.mmap] = None
+        self._segment_maps: Dict[int, mmap.mmap] = {}
+        self._retired_maps: List[mmap.mmap] = []
+        self._segment: Optional[int] = None
+        self._id_index: Optional[Dict[str, int]] = None
+        self._start_index: Optional[Tuple[array, array]] = None
+        self._remap()
+
+    # -- name tables -------------------------------------------------------
+
+    def _read_table(self, filename: str) -> Iterator[str]:
+        table_path = os.path.join(self.path, filename)
+        if not os.path.exists(table_path):
+            return iter(())
+        with open(table_path, encoding="utf-8") as table:
+            return iter(table.read().split("\n")[:-1])
+
+    def _append_table(self, filename: str, lines: Sequence[str]):
+        with open(os.path.join(self.path, filename), "a", encoding="utf-8") as table:
+            table.write("".join(f"{line}\n" for line in lines))
+
+    def _metric_id(self, category: StatCategory, name: str) -> int:
+        key = (category, name)
+        metric_id = self._metric_ids.get(key)
+        if metric_id is None:
+            metric_id = len(self._metrics)
+            self._append_table("metrics.tsv", [f"{category.value}\t{name}"])
+            self._metric_ids[key] = metric_id
+            self._metrics.append(key)
+        return metric_id
+
+    def _unit_id(self, unit: str) -> int:
+        unit_id = self._unit_ids.get(unit)
+        if unit_id is None:
+            unit_id = len(self._units)
+            self._append_table("units.tsv", [unit])
+            self._unit_ids[unit] = unit_id
+            self._units.append(unit)
+        return unit_id
+
+    # -- session records ---------------------------------------------------
+
+    def _retire(self, old_map: Optional[mmap.mmap]):
+        """Close a replaced mapping, or keep it until the views exported from it are released"""
+        if old_map is not None:
+            self._retired_maps.append(old_map)
+        still_exported = []
+        for retired in self._retired_maps:
+            try:
+                retired.close()
+            except BufferError:
+                still_exported.append(retired)
+        self._retired_maps = still_exported
+
+    def _remap(self):
+        """(Re)map sessions.dat after it grows"""
+        self._retire(self._map)
+        size = os.path.getsize(self._sessions_path)
+        self._count = (size - _HEADER.size) // _RECORD.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._count else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def sorted_by_start(self) -> bool:
+        """Whether records were appended in start_time order"""
+        return bool(self._flags & _FLAG_SORTED)
+
+    def record(self, index: int) -> ArchivedSession:
+        """Read the session record at position ``index``"""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        values = list(_RECORD.unpack_from(self._map, _HEADER.size + index * _RECORD.size))
+        values[0] = values[0].rstrip(b"\0").decode("utf-8")
+        if math.isnan(values[2]):
+            values[2] = None
+        return ArchivedSession(index, *values)
+
+    def records_view(self) -> memoryview:
+        """Raw bytes of the session records appended so far (later appends are not included)"""
+        if self._map is None:
+            return memoryview(b"")
+        return memoryview(self._map)[_HEADER.size:_HEADER.size + self._count * _RECORD.size]
+
+    def __iter__(self) -> Iterator[ArchivedSession]:
+        for index in range(self._count):
+            yield self.record(index)
+
+    def _start_time_at(self, index: int) -> float:
+        return struct.unpack_from(
+            "<d", self._map, _HEADER.size + index * _RECORD.size + _START_TIME_OFFSET
+        )[0]
+
+    def get(self, session_id: str) -> Optional[ArchivedSession]:
+        """Look up a session by ID (the latest record wins on duplicates)"""
+        if self._id_index is None:
+            self._id_index = {}
+            if self._count:
+                id_column = struct.Struct(f"<{_SESSION_ID_BYTES}s{_RECORD.size - _SESSION_ID_BYTES}x")
+                body = memoryview(self._map)[_HEADER.size:_HEADER.size + self._count * _RECORD.size]
+                # Keyed by the raw padded field so building skips per-record decoding
+                self._id_index = {raw: index for index, (raw,) in enumerate(id_column.iter_unpack(body))}
+                body.release()
+        index = self._id_index.get(_pack_session_id(session_id))
+        return self.record(index) if index is not None else None
+
+    def find_by_start(self, since: Optional[float] = None,
+                      until: Optional[float] = None) -> List[ArchivedSession]:
+        """Sessions whose start_time falls in [since, until], oldest first"""
+        if self.sorted_by_start:
+            positions = range(self._count)
+            low = 0 if since is None else bisect_left(positions, since, key=self._start_time_at)
+            high = self._count if until is None else bisect_right(positions, until, key=self._start_time_at)
+            return [self.record(index) for index in range(low, high)]
+
+        if self._start_index is None:
+            start_column = struct.Struct(
+                f"<{_START_TIME_OFFSET}xd{_RECORD.size - _START_TIME_OFFSET - 8}x"
+            )
+            body = memoryview(self._map)[_HEADER.size:_HEADER.size + self._count * _RECORD.size]
+            pairs = sorted((start, index) for index, (start,) in enumerate(start_column.iter_unpack(body)))
+            body.release()
+            self._start_index = (array("d", [p[0] for p in pairs]), array("Q", [p[1] for p in pairs]))
+        starts, order = self._start_index
+        low = 0 if since is None else bisect_left(starts, since)
+        high = len(starts) if until is None else bisect_right(starts, until)
+        return [self.record(order[position]) for position in range(low, high)]
+
+    # -- appending ---------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"events-{segment:05d}.seg")
+
+    def _write_events(self, columns: Tuple[array, array, array, array]) -> Tuple[int, int]:
+        """Append event columns to the current segment. Returns (segment, offset)."""
+        if self._segment is None:
+            self._segment = 0
+            while os.path.exists(self._segment_path(self._segment + 1)):
+                self._segment += 1
+        segment = self._segment
+        path = self._segment_path(segment)
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        size = len(columns[0]) * EVENT_BYTES
+        if offset and offset + size > self.segment_bytes:
+            segment, offset = segment + 1, 0
+            path = self._segment_path(segment)
+            self._segment = segment
+
+        with open(path, "ab") as out:
+            for column in columns:
+                column.tofile(out)
+        # Remapped on next use to cover the new events
+        self._retire(self._segment_maps.pop(segment, None))
+        return segment, offset
+
+    def append(self, session: GameSession, events: Optional[Tuple[array, array, array, array]] = None,
+               metric_table: Optional[Sequence[Tuple[StatCategory, str]]] = None,
+               unit_table: Optional[Sequence[str]] = None,
+               frame_summary: Optional[Dict[str, Any]] = None) -> int:
+        """Append a session summary and, optionally, its event columns.
+
+        ``events`` are (timestamps, values, metric_ids, flags) columns as
+        produced by ``StatRingBuffer.columns``; ``metric_table`` and
+        ``unit_table`` name the IDs they use. Returns the record index.
+        """
+        segment, offset, event_count = 0, 0, 0
+        if events is not None and len(events[0]):
+            metric_map = [self._metric_id(category, name) for category, name in metric_table]
+            unit_map = [self._unit_id(unit) for unit in unit_table]
+            timestamps, values, metric_ids, flags = events
+            columns = (
+                timestamps,
+                values,
+                array("I", [metric_map[m] for m in metric_ids]),
+                array("H", [unit_map[f >> 2] << 2 | (f & 0b11) for f in flags]),
+            )
+            segment, offset = self._write_events(columns)
+            event_count = len(timestamps)
+
+        frame_summary = frame_summary or {}
+        frame_ms = frame_summary.get("frame_time_ms", {})
+        record = _RECORD.pack(
+            _pack_session_id(session.session_id),
+            session.start_time,
+            session.end_time if session.end_time is not None else math.nan,
+            int(session.waves_completed), int(session.enemies_killed), int(session.defenders_lost),
+            int(session.money_earned), int(session.money_spent),
+            int(session.upgrades_purchased), int(session.highest_wave),
+            session.total_damage_dealt, session.total_damage_taken,
+            int(frame_summary.get("session_frames", 0)),
+            frame_ms.get("p50", 0.0), frame_ms.get("p95", 0.0), frame_ms.get("p99", 0.0),
+            segment, offset, event_count
+        )
+
+        if self._count and session.start_time < self._start_time_at(self._count - 1) and self.sorted_by_start:
+            self._flags &= ~_FLAG_SORTED
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size, self._flags))
+
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(record)
+        self._file.flush()
+
+        index = self._count
+        self._remap()
+        if self._id_index is not None:
+            self._id_index[_pack_session_id(session.session_id)] = index
+        self._start_index = None
+        return index
+
+    # -- events --------------------------------------------------------------
+
+    def segment_view(self, segment: int) -> memoryview:
+        """Raw bytes of one event segment file"""
+        segment_map = self._segment_maps.get(segment)
+        if segment_map is None:
+            with open(self._segment_path(segment), "rb") as segment_file:
+                segment_map = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._segment_maps[segment] = segment_map
+        return memoryview(segment_map)
+
+    def events(self, session: ArchivedSession) -> EventColumns:
+        """Zero-copy column views of a session's archived events"""
+        count = session.event_count
+        if count == 0:
+            empty = memoryview(b"")
+            return EventColumns(empty.cast("d"), empty.cast("d"), empty.cast("I"), empty.cast("H"))
+
+        view = self.segment_view(session.segment)
+        offset = session.offset
+        columns = []
+        for width, code in ((8, "d"), (8, "d"), (4, "I"), (2, "H")):
+            columns.append(view[offset:offset + count * width].cast(code))
+            offset += count * width
+        return EventColumns(*columns)
+
+    def iter_events(self, session: ArchivedSession) -> Iterator[StatEntry]:
+        """Decode a session's archived events as StatEntry objects"""
+        columns = self.events(session)
+        for timestamp, value, metric_id, flag in zip(columns.timestamps, columns.values,
+                                                     columns.metric_ids, columns.flags):
+            kind = flag & 0b11
+            if kind == KIND_INT:
+                value = int(value)
+            elif kind == KIND_BOOL:
+                value = bool(value)
+            elif kind == KIND_OBJECT:
+                value = None  # Non-numeric values are not archived
+            category, name = self._metrics[metric_id]
+            yield StatEntry(timestamp, category, name, value, self._units[flag >> 2])
+
+    def metric(self, metric_id: int) -> Tuple[StatCategory, str]:
+        """(category, name) for an archive metric ID"""
+        return self._metrics[metric_id]
+
+    def find_metric(self, category: StatCategory, name: str) -> Optional[int]:
+        """Archive metric ID for (category, name), if it has been seen"""
+        return self._metric_ids.get((category, name))
+
+    def close(self):
+        """Release the mappings and the records file.
+
+        Mappings that views are still exported from are closed once those
+        views are released.
+        """
+        for segment_map in self._segment_maps.values():
+            self._retire(segment_map)
+        self._segment_maps.clear()
+        self._retire(self._map)
+        self._map = None
+        self._retired_maps.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print a summary of an archive directory"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: session_archive.py <archive_dir> [session_id]")
+        return 1
+
+    start = time.perf_counter()
+    with SessionArchive(argv[0]) as archive:
+        opened = time.perf_counter()
+        print(f"Opened {argv[0]}: {len(archive):,} sessions in {(opened - start) * 1000:.1f} ms")
+        if len(argv) > 1:
+            session = archive.get(argv[1])
+            if session is None:
+                print(f"Session {argv[1]} not found")
+                return 1
+            print(session)
+            print(f"Events: {session.event_count:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
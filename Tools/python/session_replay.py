@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Session Replay for TopDeck Stats Dashboard
+Records the calls a game makes into StatsDashboard as an NDJSON log and
+re-drives a fresh dashboard with them at 1x, Nx or full speed. Every
+timestamp the dashboard takes comes from its injectable clock, so a replay
+reproduces the original summary, report, analytics and alerts exactly.
+Plain NDJSON event logs (``ingest_ndjson`` format) replay as record_stat calls.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from stats_dashboard import StatsDashboard, CATEGORY_BY_NAME
+
+# Dashboard methods that change its state; calls made from inside one of
+# them (e.g. record_stat from complete_wave) are not recorded separately
+RECORDED_CALLS = (
+    "start_session", "end_session", "record_stat", "record_many", "record_position_event",
+    "flush_positions", "update_wave_stats", "complete_wave", "update_combat_stats",
+    "update_economy_stats", "update_upgrade_stats", "update_entity_counts", "update_fps",
+)
+
+_CATEGORY_KEY = "__category__"
+
+
+class ReplayClock:
+    """A clock that only moves when told to; pass as ``StatsDashboard(clock=...)``"""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class ReplayCall:
+    """One recorded dashboard call, or a checkpoint with the expected state digest"""
+    timestamp: float
+    method: Optional[str]
+    args: List[Any] = field(default_factory=list)
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    digest: Optional[str] = None
+
+
+@dataclass
+class ReplayResult:
+    dashboard: StatsDashboard
+    calls: int = 0
+    wall_seconds: float = 0.0
+    checkpoints: int = 0
+    mismatches: List[float] = field(default_factory=list)   # Timestamps of failed checkpoints
+
+    @property
+    def identical(self) -> bool:
+        return not self.mismatches
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return {_CATEGORY_KEY: value.value}
+    if isinstance(value, (list, tuple)) or (hasattr(value, "__len__") and hasattr(value, "tolist")):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _encode_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _encode(value) for key, value in kwargs.items()}
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1 and _CATEGORY_KEY in value:
+        return CATEGORY_BY_NAME[value[_CATEGORY_KEY]]
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def snapshot(dashboard: StatsDashboard) -> Dict[str, Any]:
+    """Everything a replay must reproduce: summary, report, analytics and sessions"""
+    sessions = list(dashboard.sessions)
+    if dashboard.current_session is not None:
+        sessions.append(dashboard.current_session)
+    return {
+        "events": dashboard.stats_history.total_appended,
+        "summary": dashboard.get_summary(),
+        "report": dashboard.generate_report(),
+        "analytics": dashboard.get_analytics(),
+        "sessions": [dashboard.export_session_data(session) for session in sessions],
+    }
+
+
+def state_digest(dashboard: StatsDashboard) -> str:
+    """SHA-256 of the canonical JSON of ``snapshot(dashboard)``"""
+    canonical = json.dumps(snapshot(dashboard), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SessionRecorder:
+    """Logs a dashboard's state-changing calls as NDJSON while the game runs.
+
+    Each recorded call reads the dashboard's clock once, and the dashboard
+    sees that one reading for the whole call, in the original run and in
+    the replay alike. Direct writes to dashboard attributes are not seen.
+    """
+
+    def __init__(self, dashboard: StatsDashboard, out: TextIO):
+        self.dashboard = dashboard
+        self.out = out
+        self.calls_recorded = 0
+        self._clock = dashboard.clock
+        self._frozen: Optional[float] = None
+        dashboard.clock = self._now
+        for method in RECORDED_CALLS:
+            setattr(dashboard, method, self._wrap(method, getattr(dashboard, method)))
+
+    def _now(self) -> float:
+        return self._clock() if self._frozen is None else self._frozen
+
+    def _wrap(self, method: str, call: Callable) -> Callable:
+        def recorded(*args, **kwargs):
+            if self._frozen is not None:
+                return call(*args, **kwargs)
+            self._frozen = timestamp = self._clock()
+            try:
+                self._write({"t": timestamp, "call": method, "args": _encode(list(args)),
+                             "kwargs": _encode_kwargs(kwargs)})
+                return call(*args, **kwargs)
+            finally:
+                self._frozen = None
+        return recorded
+
+    def _write(self, record: Dict[str, Any]):
+        self.out.write(json.dumps(record, default=str) + "\n")
+        self.calls_recorded += 1
+
+    def checkpoint(self) -> str:
+        """Log the current state digest; a replay verifies it at the same point"""
+        self._frozen = timestamp = self._clock()
+        try:
+            digest = state_digest(self.dashboard)
+        finally:
+            self._frozen = None
+        self.out.write(json.dumps({"t": timestamp, "checkpoint": digest}) + "\n")
+        return digest
+
+    def detach(self):
+        """Stop recording and restore the dashboard's own methods and clock"""
+        for method in RECORDED_CALLS:
+            self.dashboard.__dict__.pop(method, None)
+        self.dashboard.clock = self._clock
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.detach()
+
+
+def load_calls(lines: Iterable[str]) -> Iterator[ReplayCall]:
+    """ReplayCalls from a recorder log or a plain NDJSON event log"""
+    last = 0.0
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "call" in record:
+            last = record["t"]
+            yield ReplayCall(last, record["call"], _decode(record.get("args", [])),
+                             _decode(record.get("kwargs", {})))
+        elif "checkpoint" in record:
+            last = record["t"]
+            yield ReplayCall(last, None, digest=record["checkpoint"])
+        else:
+            last = record.get("timestamp", last)
+            yield ReplayCall(last, "record_stat", [CATEGORY_BY_NAME[record["category"]], record["name"],
+                                                   record["value"], record.get("unit", "")])
+
+
+def replay(calls: Iterable[ReplayCall], dashboard: Optional[StatsDashboard] = None,
+           speed: float = 0.0, sleep: Callable[[float], None] = time.sleep) -> ReplayResult:
+    """Re-drive ``dashboard`` (a fresh one by default) with recorded calls.
+
+    ``speed`` is the playback rate relative to the recording (1.0 is real
+    time); 0 replays as fast as possible. The dashboard's clock must be a
+    ReplayClock. Checkpoints in the log are verified as they are reached.
+    """
+    if dashboard is None:
+        dashboard = StatsDashboard(clock=ReplayClock())
+    clock = dashboard.clock
+    if not isinstance(clock, ReplayClock):
+        raise ValueError("replay needs a dashboard created with clock=ReplayClock()")
+
+    result = ReplayResult(dashboard)
+    origin = None
+    start = time.perf_counter()
+    for call in calls:
+        if origin is None:
+            origin = call.timestamp
+        if speed > 0:
+            delay = (call.timestamp - origin) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                sleep(delay)
+        clock.now = call.timestamp
+        if call.method is None:
+            result.checkpoints += 1
+            if state_digest(dashboard) != call.digest:
+                result.mismatches.append(call.timestamp)
+            continue
+        if call.method not in RECORDED_CALLS:
+            raise ValueError(f"Not a replayable dashboard call: {call.method}")
+        getattr(dashboard, call.method)(*call.args, **call.kwargs)
+        result.calls += 1
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Replay a recorded session log; exit 1 if a checkpoint does not match"""
+    parser = argparse.ArgumentParser(description="Replay a TopDeck session log through StatsDashboard")
+    parser.add_argument("log", help="recorder log or NDJSON event log")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="playback rate, e.g. 1 for real time (default: as fast as possible)")
+    parser.add_argument("--history-size", type=int, default=1000)
+    parser.add_argument("--report", action="store_true", help="print the final report")
+    args = parser.parse_args(argv)
+
+    dashboard = StatsDashboard(history_size=args.history_size, clock=ReplayClock())
+    with open(args.log) as log:
+        result = replay(load_calls(log), dashboard, speed=args.speed)
+
+    if args.report:
+        print(dashboard.generate_report())
+    rate = result.calls / result.wall_seconds if result.wall_seconds > 0 else 0.0
+    print(f"✅ Replayed {result.calls:,} calls in {result.wall_seconds:.2f}s ({rate:,.0f} calls/s)")
+    if result.checkpoints:
+        if result.identical:
+            print(f"✅ {result.checkpoints} checkpoint(s) identical to the recording")
+        else:
+            print(f"❌ {len(result.mismatches)} of {result.checkpoints} checkpoint(s) differ "
+                  f"(first at t={result.mismatches[0]:.6f})")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
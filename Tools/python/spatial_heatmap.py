@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Spatial Heatmaps for TopDeck Stats Dashboard
+Where kills, leaks and defender losses happen on the map. Positions are
+binned into the MapController grid (width x height cells of cellSize), so
+memory is one counter per cell and kind no matter how many events or
+sessions are added. Heatmaps save to a compact .npz file and export as
+CSV/text grids and ranked placement candidates for TowerManager.TryPlaceTower.
+
+Requires numpy.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+HEATMAP_KINDS = ("kill", "leak", "defender_loss")
+
+# Characters used by the text grid, from empty to densest
+_SHADES = " .:-=+*#%@"
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """The map grid, as laid out by MapController.
+
+    Tile (x, y) is centred on world position (x * cell_size, 0, y * cell_size),
+    offset by the origin; world z maps to grid y.
+    """
+    width: int = 10
+    height: int = 10
+    cell_size: float = 1.0
+    origin_x: float = 0.0
+    origin_z: float = 0.0
+
+    def __post_init__(self):
+        if self.width <= 0 or self.height <= 0 or self.cell_size <= 0:
+            raise ValueError("grid dimensions and cell size must be positive")
+
+    def cells(self, xs: np.ndarray, zs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid (column, row) of world positions, rounded to the nearest tile centre"""
+        columns = np.floor((np.asarray(xs, dtype=np.float64) - self.origin_x) / self.cell_size + 0.5)
+        rows = np.floor((np.asarray(zs, dtype=np.float64) - self.origin_z) / self.cell_size + 0.5)
+        return columns.astype(np.int64), rows.astype(np.int64)
+
+    def world(self, column: int, row: int) -> Tuple[float, float, float]:
+        """World position (x, y, z) of a tile centre"""
+        return (self.origin_x + column * self.cell_size, 0.0, self.origin_z + row * self.cell_size)
+
+
+@dataclass
+class Hotspot:
+    """A grid cell ranked for tower placement"""
+    column: int
+    row: int
+    position: Tuple[float, float, float]
+    score: float
+    kills: int
+    leaks: int
+    defender_losses: int
+
+
+class SpatialHeatmaps:
+    """Per-cell event counts for each heatmap kind, accumulated across sessions.
+
+    ``counts[kind]`` is a (height, width) array indexed [row, column].
+    Events outside the grid are counted in ``outside`` rather than dropped
+    silently, so a grid that does not match the map shows up.
+    """
+
+    def __init__(self, grid: GridSpec, kinds: Sequence[str] = HEATMAP_KINDS):
+        self.grid = grid
+        self.kinds = tuple(kinds)
+        self.counts = np.zeros((len(self.kinds), grid.height, grid.width), dtype=np.uint64)
+        self.outside = np.zeros(len(self.kinds), dtype=np.uint64)
+        self.sessions = 0
+
+    def _layer(self, kind: str) -> int:
+        try:
+            return self.kinds.index(kind)
+        except ValueError:
+            raise ValueError(f"Unknown heatmap kind: {kind}") from None
+
+    def add(self, kind: str, x: float, z: float, count: int = 1):
+        """Add ``count`` events of ``kind`` at world position (x, z)"""
+        self.add_many(kind, [x], [z], count)
+
+    def add_many(self, kind: str, xs: Iterable[float], zs: Iterable[float], count: int = 1):
+        """Add one event of ``kind`` (or ``count`` each) per world position"""
+        layer = self._layer(kind)
+        xs = np.asarray(xs, dtype=np.float64)
+        zs = np.asarray(zs, dtype=np.float64)
+        if xs.shape != zs.shape:
+            raise ValueError("xs and zs must have the same length")
+        if xs.size == 0:
+            return
+        grid = self.grid
+        columns, rows = grid.cells(xs, zs)
+        inside = (columns >= 0) & (columns < grid.width) & (rows >= 0) & (rows < grid.height)
+        self.outside[layer] += int(np.count_nonzero(~inside)) * count
+        flat = rows[inside] * grid.width + columns[inside]
+        # bincount over the whole grid is cheaper than np.add.at for batches
+        binned = np.bincount(flat, minlength=grid.width * grid.height)
+        self.counts[layer] += (binned * count).astype(np.uint64).reshape(grid.height, grid.width)
+
+    def end_session(self):
+        """Count one more session in the totals (for per-session densities)"""
+        self.sessions += 1
+
+    def merge(self, other: "SpatialHeatmaps"):
+        """Add another heatmap set on the same grid into this one"""
+        if other.grid != self.grid:
+            raise ValueError("cannot merge heatmaps on different grids")
+        for kind in other.kinds:
+            layer, theirs = self._layer(kind), other._layer(kind)
+            self.counts[layer] += other.counts[theirs]
+            self.outside[layer] += other.outside[theirs]
+        self.sessions += other.sessions
+
+    def density(self, kind: str) -> np.ndarray:
+        """Events per session in each cell"""
+        return self.counts[self._layer(kind)] / max(1, self.sessions)
+
+    def coverage(self, kind: str, radius: int) -> np.ndarray:
+        """Events within ``radius`` cells (a square) of each cell, via 2D prefix sums"""
+        counts = self.counts[self._layer(kind)].astype(np.int64)
+        height, width = counts.shape
+        prefix = np.zeros((height + 1, width + 1), dtype=np.int64)
+        prefix[1:, 1:] = counts.cumsum(axis=0).cumsum(axis=1)
+        rows = np.arange(height)
+        columns = np.arange(width)
+        top = np.clip(rows - radius, 0, height)[:, None]
+        bottom = np.clip(rows + radius + 1, 0, height)[:, None]
+        left = np.clip(columns - radius, 0, width)[None, :]
+        right = np.clip(columns + radius + 1, 0, width)[None, :]
+        return prefix[bottom, right] - prefix[top, right] - prefix[bottom, left] + prefix[top, left]
+
+    def hotspots(self, radius: int = 2, top: int = 10, leak_weight: float = 2.0,
+                 loss_weight: float = 1.0, exclude: Iterable[Tuple[int, int]] = ()) -> List[Hotspot]:
+        """Cells ranked as tower sites.
+
+        A cell scores the kills and (weighted) leaks within ``radius`` cells,
+        minus the defender losses on the cell itself. ``exclude`` holds
+        (column, row) cells that cannot be built on, such as path tiles.
+        """
+        kills = self.coverage("kill", radius)
+        leaks = self.coverage("leak", radius)
+        losses = self.counts[self._layer("defender_loss")].astype(np.int64)
+        score = kills + leak_weight * leaks - loss_weight * losses
+        for column, row in exclude:
+            if 0 <= column < self.grid.width and 0 <= row < self.grid.height:
+                score[row, column] = -np.inf
+
+        flat = score.ravel()
+        count = min(top, int(np.count_nonzero(np.isfinite(flat))))
+        if count == 0:
+            return []
+        best = np.argpartition(-flat, count - 1)[:count]
+        best = best[np.argsort(-flat[best], kind="stable")]
+        result = []
+        for index in best:
+            row, column = divmod(int(index), self.grid.width)
+            result.append(Hotspot(
+                column=column, row=row, position=self.grid.world(column, row),
+                score=float(flat[index]), kills=int(kills[row, column]),
+                leaks=int(leaks[row, column]), defender_losses=int(losses[row, column])
+            ))
+        return result
+
+    def save(self, path: str):
+        """Write the heatmaps to a compressed .npz file"""
+        grid = self.grid
+        np.savez_compressed(
+            path, counts=self.counts, outside=self.outside, kinds=np.array(self.kinds),
+            sessions=np.int64(self.sessions),
+            grid=np.array([grid.width, grid.height, grid.cell_size, grid.origin_x, grid.origin_z])
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SpatialHeatmaps":
+        with np.load(path) as data:
+            width, height, cell_size, origin_x, origin_z = data["grid"].tolist()
+            heatmaps = cls(GridSpec(int(width), int(height), cell_size, origin_x, origin_z),
+                           [str(kind) for kind in data["kinds"]])
+            heatmaps.counts[...] = data["counts"]
+            heatmaps.outside[...] = data["outside"]
+            heatmaps.sessions = int(data["sessions"])
+        return heatmaps
+
+    def write_csv(self, kind: str, out: TextIO):
+        """One CSV row per grid row (y), one column per grid column (x)"""
+        counts = self.counts[self._layer(kind)]
+        out.write("y," + ",".join(f"x{column}" for column in range(self.grid.width)) + "\n")
+        for row in range(self.grid.height):
+            out.write(f"{row}," + ",".join(map(str, counts[row].tolist())) + "\n")
+
+    def format_grid(self, kind: str) -> str:
+        """Text heatmap with the top row drawn first (y grows upward as in the scene view)"""
+        counts = self.counts[self._layer(kind)]
+        peak = int(counts.max())
+        if peak:
+            shades = np.ceil(counts / peak * (len(_SHADES) - 1)).astype(np.int64)
+        else:
+            shades = np.zeros(counts.shape, dtype=np.int64)
+        lines = [f"{kind} (max {peak:,} per cell, {int(counts.sum()):,} total, "
+                 f"{int(self.outside[self._layer(kind)]):,} off-grid)"]
+        border = "+" + "-" * self.grid.width + "+"
+        lines.append(border)
+        for row in range(self.grid.height - 1, -1, -1):
+            lines.append("|" + "".join(_SHADES[s] for s in shades[row]) + "|")
+        lines.append(border)
+        return "\n".join(lines)
+
+
+def simulate(heatmaps: SpatialHeatmaps, sessions: int = 20, seed: int = 5):
+    """Fill ``heatmaps`` with synthetic sessions along a few left-to-right paths"""
+    rng = np.random.default_rng(seed)
+    grid = heatmaps.grid
+    lanes = rng.integers(0, grid.height, size=3)
+    for _ in range(sessions):
+        for lane in lanes:
+            # Kills cluster mid-map, leaks at the exit, losses near the kill zone
+            kills_x = rng.normal(grid.width * 0.5, grid.width * 0.15, 400) * grid.cell_size
+            kills_z = (lane + rng.normal(0, 0.8, 400)) * grid.cell_size
+            heatmaps.add_many("kill", kills_x, kills_z)
+            leaks_z = (lane + rng.normal(0, 0.3, 15)) * grid.cell_size
+            heatmaps.add_many("leak", np.full(15, (grid.width - 1) * grid.cell_size), leaks_z)
+            loss_x = rng.normal(grid.width * 0.55, 2.0, 10) * grid.cell_size
+            loss_z = (lane + rng.choice([-2, 2], 10)) * grid.cell_size
+            heatmaps.add_many("defender_loss", loss_x, loss_z)
+        heatmaps.end_session()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Show, merge or export spatial heatmaps"""
+    parser = argparse.ArgumentParser(description="TopDeck kill/leak/defender-loss heatmaps")
+    parser.add_argument("heatmaps", nargs="*", help=".npz heatmap files to merge (demo data if none)")
+    parser.add_argument("--kind", choices=HEATMAP_KINDS, help="only show this kind")
+    parser.add_argument("--save", metavar="NPZ", help="write the merged heatmaps to this file")
+    parser.add_argument("--csv", metavar="FILE", help="write the --kind grid (default kill) as CSV")
+    parser.add_argument("--radius", type=int, default=2, help="tower reach in cells for hotspots")
+    parser.add_argument("--top", type=int, default=5, help="number of placement candidates")
+    args = parser.parse_args(argv)
+
+    if args.heatmaps:
+        heatmaps = SpatialHeatmaps.load(args.heatmaps[0])
+        for path in args.heatmaps[1:]:
+            heatmaps.merge(SpatialHeatmaps.load(path))
+    else:
+        heatmaps = SpatialHeatmaps(GridSpec(width=40, height=20, cell_size=1.0))
+        simulate(heatmaps)
+
+    print(f"🗺️  {heatmaps.grid.width}x{heatmaps.grid.height} grid, {heatmaps.sessions} sessions")
+    for kind in ([args.kind] if args.kind else heatmaps.kinds):
+        print(heatmaps.format_grid(kind))
+
+    print(f"\n🏰 Tower placement candidates (reach {args.radius} cells):")
+    for spot in heatmaps.hotspots(args.radius, args.top):
+        x, _, z = spot.position
+        print(f"  ({x:g}, 0, {z:g})  score {spot.score:,.0f}  kills {spot.kills:,}  "
+              f"leaks {spot.leaks:,}  losses {spot.defender_losses:,}")
+
+    if args.save:
+        heatmaps.save(args.save)
+        print(f"✅ Saved heatmaps to {args.save}")
+    if args.csv:
+        with open(args.csv, "w") as out:
+            heatmaps.write_csv(args.kind or "kill", out)
+        print(f"✅ Wrote {args.kind or 'kill'} grid to {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
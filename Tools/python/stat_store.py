@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Columnar Stat Store for TopDeck Stats Dashboard
+Preallocated struct-of-arrays ring buffer for statistics events.
+Keeps timestamps, interned category/name/unit IDs and numeric values in
+flat typed arrays instead of allocating one Python object per event, plus
+per-category and per-metric secondary indexes for recent-window queries.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Value kinds stored alongside each numeric value so reads round-trip the
+# original Python type (1 stays 1, True stays True)
+KIND_FLOAT = 0
+KIND_INT = 1
+KIND_BOOL = 2
+KIND_OBJECT = 3
+
+# Largest integer magnitude a double holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+
+class StringInterner:
+    """Maps strings to dense integer IDs and back"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def intern(self, text: str) -> int:
+        """Get the ID for a string, assigning a new one if needed"""
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._ids[text] = string_id
+            self._strings.append(text)
+        return string_id
+
+    def get_id(self, text: str) -> Optional[int]:
+        """Get the ID for a string without interning it"""
+        return self._ids.get(text)
+
+    def lookup(self, string_id: int) -> str:
+        """Get the string for an ID"""
+        return self._strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class _StoreView:
+    """All live events of a ``StatRingBuffer`` as a sorted sequence of seqs"""
+
+    __slots__ = ("first", "count")
+
+    def __init__(self, first: int, count: int):
+        self.first = first
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> int:
+        return self.first + position
+
+
+class StatRingBuffer:
+    """Fixed-capacity columnar ring buffer of statistics events.
+
+    Each event occupies one slot across four parallel arrays:
+
+        timestamps   float64   8 bytes
+        values       float64   8 bytes
+        metric_ids   uint32    4 bytes   interned (category, name)
+        flags        uint16    2 bytes   interned unit << 2 | value kind
+
+    for a fixed cost of ``BYTES_PER_EVENT`` (22) bytes per event. Values that
+    are not plain numbers are kept in a side table keyed by slot.
+
+    Every event also gets a sequence number (its ``total_appended`` count at
+    insert time; slot = seq % capacity). Per-category and per-metric index
+    arrays hold the sequence numbers of each group in insertion order, so
+    filtered recent-window queries cost O(limit). Inserts do not touch the
+    indexes, so recording pays nothing for them; instead the first query
+    after N inserts indexes the ones still live, costing O(min(N, capacity))
+    once. Evicted sequence numbers are skipped by binary search at query
+    time and trimmed from every index once per ``capacity`` newly indexed
+    events, which keeps the indexes at no more than twice the capacity
+    without a query walking all of them.
+
+    Timestamps are clamped to be non-decreasing: an event older than the
+    newest one already stored is kept, stamped with that newest timestamp,
+    so ``since``/``until`` ranges are binary searches too.
+    """
+
+    BYTES_PER_EVENT = 8 + 8 + 4 + 2
+
+    def __init__(self, capacity: int, categories: Sequence[Any],
+                 entry_factory: Optional[Callable[..., Any]] = None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.categories = list(categories)
+        self.entry_factory = entry_factory or (lambda *fields: fields)
+
+        self.timestamps = array("d", [0.0]) * capacity
+        self.values = array("d", [0.0]) * capacity
+        self.metric_ids = array("I", [0]) * capacity
+        self.flags = array("H", [0]) * capacity
+        self._objects: Dict[int, Any] = {}
+
+        # Metric table: one entry per distinct (category, name)
+        self._metric_lookup: List[Dict[str, int]] = [{} for _ in self.categories]
+        self.metric_categories = array("B")
+        self.metric_names: List[str] = []
+
+        # Secondary indexes of live sequence numbers, complete up to _indexed_seq
+        self.category_index: List[array] = [array("q") for _ in self.categories]
+        self.metric_index: List[array] = []
+        self._indexed_seq = 0
+        self._trimmed_seq = 0
+
+        self.units = StringInterner()
+        self.units.intern("")
+
+        # The next event goes to slot total_appended % capacity
+        self.total_appended = 0
+        self._cleared_seq = 0
+        self.last_timestamp = float("-inf")
+
+    @property
+    def maxlen(self) -> int:
+        """Capacity, mirroring ``deque.maxlen``"""
+        return self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated columns"""
+        return self.capacity * self.BYTES_PER_EVENT
+
+    @property
+    def _count(self) -> int:
+        return min(self.capacity, self.total_appended - self._cleared_seq)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def metric_id(self, category_id: int, name: str) -> int:
+        """Get the interned ID for a (category, name) pair"""
+        metric_id = self._metric_lookup[category_id].get(name)
+        if metric_id is None:
+            metric_id = len(self.metric_names)
+            self._metric_lookup[category_id][name] = metric_id
+            self.metric_categories.append(category_id)
+            self.metric_names.append(name)
+            self.metric_index.append(array("q"))
+        return metric_id
+
+    def find_metric(self, category_id: int, name: str) -> Optional[int]:
+        """Get the ID for a (category, name) pair without interning it"""
+        return self._metric_lookup[category_id].get(name)
+
+    def append(self, timestamp: float, category_id: int, name: str,
+               value: Any, unit: str = "") -> int:
+        """Append one event, overwriting the oldest when full. Returns its slot.
+
+        A timestamp older than the newest stored one is clamped up to it.
+        """
+        return self.append_metric(timestamp, self.metric_id(category_id, name), value, unit)
+
+    def append_metric(self, timestamp: float, metric_id: int, value: Any, unit: str = "") -> int:
+        """``append`` for a metric already interned (see ``metric_id``)"""
+        seq = self.total_appended
+        slot = seq % self.capacity
+
+        unit_bits = self.units.intern(unit) << 2 if unit else 0
+
+        if self._objects:
+            self._objects.pop(slot, None)
+
+        value_type = type(value)
+        if value_type is float:
+            self.values[slot] = value
+            self.flags[slot] = unit_bits  # KIND_FLOAT
+        elif value_type is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            self.values[slot] = value
+            self.flags[slot] = unit_bits | KIND_INT
+        else:
+            self.flags[slot] = unit_bits | self._store_other(slot, value)
+
+        if timestamp < self.last_timestamp:
+            timestamp = self.last_timestamp
+        self.last_timestamp = timestamp
+        self.timestamps[slot] = timestamp
+        self.metric_ids[slot] = metric_id
+
+        self.total_appended = seq + 1
+        return slot
+
+    def _store_other(self, slot: int, value: Any) -> int:
+        """Store a value that is not a plain int/float. Returns its kind."""
+        if isinstance(value, bool):
+            self.values[slot] = value
+            return KIND_BOOL
+        if isinstance(value, float):
+            self.values[slot] = float(value)
+            return KIND_FLOAT
+        if isinstance(value, int) and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            self.values[slot] = int(value)
+            return KIND_INT
+        self.values[slot] = 0.0
+        self._objects[slot] = value
+        return KIND_OBJECT
+
+    def extend(self, timestamps: Sequence[float], category_ids: Sequence[int],
+               names: Sequence[str], values: Sequence[Any],
+               units: Optional[Sequence[str]] = None):
+        """Append a batch of events given as parallel columns.
+
+        Equivalent to calling ``append`` once per event, but columns are
+        written with slice assignment (at most two per column) and events
+        that would be evicted within the same batch are never written.
+        """
+        count = len(values)
+        if count == 0:
+            return
+
+        capacity = self.capacity
+        skip = max(0, count - capacity)
+        base_seq = self.total_appended
+
+        # Intern metrics and units for the whole batch
+        lookups = self._metric_lookup
+        metric_ids = [lookups[c].get(n) for c, n in zip(category_ids, names)]
+        if None in metric_ids:
+            metric_ids = [
+                m if m is not None else self.metric_id(c, n)
+                for m, c, n in zip(metric_ids, category_ids, names)
+            ]
+        if units is None:
+            unit_bits = [0] * count
+        else:
+            intern = self.units.intern
+            unit_bits = [intern(u) << 2 if u else 0 for u in units]
+
+        clamped = list(accumulate(timestamps, max, initial=self.last_timestamp))
+        self.last_timestamp = clamped[-1]
+
+        # Encode values; plain floats need no per-value work
+        objects = {}
+        if all(type(v) is float for v in values):
+            numbers = values
+            flags = unit_bits
+        else:
+            numbers = [0.0] * count
+            flags = list(unit_bits)
+            for i, value in enumerate(values):
+                value_type = type(value)
+                if value_type is float:
+                    numbers[i] = value
+                elif value_type is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                    numbers[i] = value
+                    flags[i] |= KIND_INT
+                elif isinstance(value, bool):
+                    numbers[i] = value
+                    flags[i] |= KIND_BOOL
+                elif isinstance(value, float):
+                    numbers[i] = float(value)
+                elif isinstance(value, int) and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                    numbers[i] = int(value)
+                    flags[i] |= KIND_INT
+                else:
+                    flags[i] |= KIND_OBJECT
+                    objects[i] = value
+
+        # Write the surviving tail of the batch in at most two segments
+        start = (base_seq + skip) % capacity
+        position = skip
+        while position < count:
+            length = min(count - position, capacity - start)
+            end = position + length
+            if self._objects:
+                for slot in range(start, start + length):
+                    self._objects.pop(slot, None)
+            self.timestamps[start:start + length] = array("d", clamped[position + 1:end + 1])
+            self.values[start:start + length] = array("d", numbers[position:end])
+            self.metric_ids[start:start + length] = array("I", metric_ids[position:end])
+            self.flags[start:start + length] = array("H", flags[position:end])
+            start = (start + length) % capacity
+            position = end
+
+        for i, value in objects.items():
+            if i >= skip:
+                self._objects[(base_seq + i) % capacity] = value
+
+        self.total_appended = base_seq + count
+
+    def clear(self):
+        """Drop all events while keeping the allocated columns"""
+        self._objects.clear()
+        self._cleared_seq = self.total_appended
+        self.category_index = [array("q") for _ in self.categories]
+        self.metric_index = [array("q") for _ in self.metric_names]
+        self._indexed_seq = self._trimmed_seq = self.total_appended
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest live event"""
+        return self.total_appended - self._count
+
+    def _update_indexes(self):
+        """Index the live events appended since the last query"""
+        first = max(self._indexed_seq, self.first_seq)
+        end = self.total_appended
+        if first >= end:
+            return
+        capacity = self.capacity
+        metric_ids = self.metric_ids
+        metric_categories = self.metric_categories
+        metric_index = self.metric_index
+        category_index = self.category_index
+        for seq in range(first, end):
+            metric_id = metric_ids[seq % capacity]
+            metric_index[metric_id].append(seq)
+            category_index[metric_categories[metric_id]].append(seq)
+        self._indexed_seq = end
+        if end - self._trimmed_seq >= self.capacity:
+            self._trim_indexes()
+
+    def _trim_indexes(self):
+        """Drop evicted sequence numbers from the front of every index"""
+        self._trimmed_seq = self._indexed_seq
+        first_seq = self.first_seq
+        for index in self.category_index:
+            stale = bisect_left(index, first_seq)
+            if stale:
+                del index[:stale]
+        for index in self.metric_index:
+            stale = bisect_left(index, first_seq)
+            if stale:
+                del index[:stale]
+
+    def slot_of(self, position: int) -> int:
+        """Physical slot of a logical position (0 = oldest live event)"""
+        return (self.first_seq + position) % self.capacity
+
+    def value_at(self, slot: int) -> Any:
+        """Decode the value stored in a slot"""
+        kind = self.flags[slot] & 0b11
+        if kind == KIND_FLOAT:
+            return self.values[slot]
+        if kind == KIND_INT:
+            return int(self.values[slot])
+        if kind == KIND_BOOL:
+            return bool(self.values[slot])
+        return self._objects.get(slot)
+
+    def category_id_at(self, slot: int) -> int:
+        """Category ID of the event in a slot"""
+        return self.metric_categories[self.metric_ids[slot]]
+
+    def entry_at(self, slot: int) -> Any:
+        """Materialize the event in a slot through ``entry_factory``"""
+        metric_id = self.metric_ids[slot]
+        return self.entry_factory(
+            self.timestamps[slot],
+            self.categories[self.metric_categories[metric_id]],
+            self.metric_names[metric_id],
+            self.value_at(slot),
+            self.units.lookup(self.flags[slot] >> 2)
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in range(self._count):
+            yield self.entry_at(self.slot_of(position))
+
+    def entries(self, since_seq: int = 0) -> Iterator[Any]:
+        """Live events with sequence number >= ``since_seq``, oldest first"""
+        for seq in range(max(since_seq, self.first_seq), self.total_appended):
+            yield self.entry_at(seq % self.capacity)
+
+    def columns(self, since_seq: int = 0) -> Tuple[array, array, array, array]:
+        """Copies of the (timestamps, values, metric_ids, flags) columns, oldest first.
+
+        Only live events with sequence number >= ``since_seq`` are included.
+        """
+        first = max(since_seq, self.first_seq)
+        count = max(0, self.total_appended - first)
+        start = first % self.capacity
+        first_part = min(count, self.capacity - start)
+        result = []
+        for column in (self.timestamps, self.values, self.metric_ids, self.flags):
+            chunk = column[start:start + first_part]
+            chunk.extend(column[:count - first_part])
+            result.append(chunk)
+        return tuple(result)
+
+    def column_entries(self, columns: Tuple[array, array, array, array]) -> Iterator[Any]:
+        """Materialize events copied out by ``columns`` through ``entry_factory``.
+
+        Copies do not carry KIND_OBJECT values; those come back as None.
+        """
+        for timestamp, value, metric_id, flag in zip(*columns):
+            kind = flag & 0b11
+            if kind == KIND_INT:
+                value = int(value)
+            elif kind == KIND_BOOL:
+                value = bool(value)
+            elif kind == KIND_OBJECT:
+                value = None
+            yield self.entry_factory(
+                timestamp,
+                self.categories[self.metric_categories[metric_id]],
+                self.metric_names[metric_id],
+                value,
+                self.units.lookup(flag >> 2)
+            )
+
+    def objects(self, since_seq: int = 0) -> List[Any]:
+        """Values of the live KIND_OBJECT events with sequence number >= ``since_seq``, oldest first"""
+        if not self._objects:
+            return []
+        first = max(since_seq, self.first_seq)
+        return [self._objects.get(seq % self.capacity)
+                for seq in range(first, self.total_appended)
+                if self.flags[seq % self.capacity] & 0b11 == KIND_OBJECT]
+
+    def metric_ids_named(self, name: str) -> List[int]:
+        """IDs of every metric called ``name``, across all categories"""
+        return [lookup[name] for lookup in self._metric_lookup if name in lookup]
+
+    def _range(self, seqs: Sequence[int], since: Optional[float],
+               until: Optional[float]) -> range:
+        """Positions of live seqs in ``seqs`` whose timestamps fall in [since, until]"""
+        capacity = self.capacity
+        timestamps = self.timestamps
+
+        def timestamp_of(seq):
+            return timestamps[seq % capacity]
+
+        first = bisect_left(seqs, self.first_seq)
+        low = first if since is None else bisect_left(seqs, since, first, key=timestamp_of)
+        high = len(seqs) if until is None else bisect_right(seqs, until, low, key=timestamp_of)
+        return range(low, max(low, high))
+
+    def query(self, category_id: Optional[int] = None,
+              metric_ids: Optional[Iterable[int]] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: Optional[int] = 100) -> List[int]:
+        """Find the slots of matching events in chronological order.
+
+        ``metric_ids`` takes precedence over ``category_id``; with neither,
+        all live events match. Only the newest ``limit`` matches within the
+        ``[since, until]`` time range are returned; like ``matches[-limit:]``,
+        a ``limit`` of 0 (or None) returns all of them.
+        """
+        self._update_indexes()
+        if metric_ids is not None:
+            indexes: List[Sequence[int]] = [self.metric_index[m] for m in metric_ids]
+        elif category_id is not None:
+            indexes = [self.category_index[category_id]]
+        else:
+            indexes = [_StoreView(self.first_seq, self._count)]
+
+        seqs: List[int] = []
+        for index in indexes:
+            positions = self._range(index, since, until)
+            if limit is not None and limit > 0:
+                positions = positions[-limit:]
+            seqs.extend(index[position] for position in positions)
+
+        if len(indexes) > 1:
+            seqs.sort()
+        if limit:
+            seqs = seqs[-limit:]
+
+        capacity = self.capacity
+        return [seq % capacity for seq in seqs]
+
+    def recent(self, limit: Optional[int] = 100, category_id: Optional[int] = None,
+               metric_ids: Optional[Iterable[int]] = None,
+               since: Optional[float] = None, until: Optional[float] = None) -> List[Any]:
+        """Get up to ``limit`` most recent matching events in chronological order"""
+        slots = self.query(category_id, metric_ids, since, until, limit)
+        return [self.entry_at(slot) for slot in slots]
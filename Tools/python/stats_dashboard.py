@@ -8,11 +8,26 @@ Tracks performance metrics, game balance, and player progress.
 import json
 import time
 import datetime
-from typing import Dict, List, Any, Optional, Tuple
+import operator
+from bisect import bisect_right
+from functools import reduce
+from itertools import islice
+from typing import Callable, Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque, defaultdict
 import math
+from array import array
+
+from stat_store import KIND_FLOAT, StatRingBuffer
+from analytics_rules import DEFAULT_ANALYTICS_RULES, Rule, RuleEngine
+from anomaly_detector import Alert, AnomalyDetector, AnomalyRule, DEFAULT_RULES
+from entity_gauges import EntityGauges
+from frame_stats import FrameTimeStats
+from hitch_detector import Hitch, HitchDetector, HitchThresholds
+from perf_rollups import ARCHIVED_BUCKET_FIELDS, PerformanceRollups, RollupBucket
+from rate_windows import RateTracker
+from telemetry_codec import TelemetryReader, TelemetryWriter
 
 
 class StatCategory(Enum):
@@ -26,6 +41,86 @@ class StatCategory(Enum):
     ENEMIES = "Enemies"
     SESSION = "Session"
 
+    # Members are singletons, so identity hashing is equivalent to Enum's
+    # name-based __hash__ while avoiding a Python-level call per dict lookup
+    __hash__ = object.__hash__
+
+
+# Dense IDs used by the columnar stat store
+_CATEGORY_IDS = {category: index for index, category in enumerate(StatCategory)}
+
+# Accepts both "Combat" and "COMBAT" spellings in ingested logs
+CATEGORY_BY_NAME = {category.value: category for category in StatCategory}
+CATEGORY_BY_NAME.update({category.name: category for category in StatCategory})
+
+# How recorded stats roll up into GameSession totals:
+# (category, name) -> ((session field, "count" | "sum" | "max"), ...)
+_SESSION_UPDATES = {
+    (StatCategory.WAVES, "wave_completed"): (("waves_completed", "count"),
+                                             ("highest_wave", "max")),
+    (StatCategory.COMBAT, "enemy_killed"): (("enemies_killed", "count"),),
+    (StatCategory.COMBAT, "damage_dealt"): (("total_damage_dealt", "sum"),),
+    (StatCategory.COMBAT, "damage_taken"): (("total_damage_taken", "sum"),),
+    (StatCategory.DEFENDERS, "defender_lost"): (("defenders_lost", "count"),),
+    (StatCategory.ECONOMY, "money_earned"): (("money_earned", "sum"),),
+    (StatCategory.ECONOMY, "money_spent"): (("money_spent", "sum"),),
+    (StatCategory.UPGRADES, "upgrade_purchased"): (("upgrades_purchased", "count"),),
+}
+
+# Metrics with windowed rates: (rate metric, "count" or "sum")
+_RATE_METRICS = {
+    (StatCategory.COMBAT, "enemy_killed"): ("kills", "count"),
+    (StatCategory.COMBAT, "damage_dealt"): ("damage", "sum"),
+    (StatCategory.ECONOMY, "money_earned"): ("income", "sum"),
+    (StatCategory.ECONOMY, "money_spent"): ("spend", "sum"),
+}
+
+# Reported rate -> (section, rate metric, per-second scale)
+_RATE_FIGURES = {
+    "kills_per_minute": ("combat", "kills", 60.0),
+    "damage_per_second": ("combat", "damage", 1.0),
+    "income_rate": ("economy", "income", 60.0),
+    "spend_rate": ("economy", "spend", 60.0),
+}
+
+# Live entity-count gauges: metric -> EntityGauges kind
+_ENTITY_GAUGES = {
+    (StatCategory.ENEMIES, "live_attackers"): "attackers",
+    (StatCategory.COMBAT, "live_projectiles"): "projectiles",
+    (StatCategory.DEFENDERS, "live_defenders"): "defenders",
+}
+
+# Position-carrying events: heatmap kind -> the stat each one also records
+_POSITION_EVENTS = {
+    "kill": (StatCategory.COMBAT, "enemy_killed"),
+    "leak": (StatCategory.ENEMIES, "enemy_leaked"),
+    "defender_loss": (StatCategory.DEFENDERS, "defender_lost"),
+}
+
+SUMMARY_SECTIONS = ("session", "waves", "combat", "economy", "upgrades", "performance")
+
+# Time-dependent summary fields per section, with the decimals the report shows
+_LIVE_FIELDS = {
+    "session": (("duration", 0),),
+    "combat": (("kills_per_minute", 1), ("damage_per_second", 1)) + tuple(
+        (f"{figure}_{window}", 1)
+        for figure in ("kills_per_minute", "damage_per_second")
+        for window in ("10s", "60s", "wave")
+    ),
+    "economy": tuple(
+        (f"{figure}_{window}", 1)
+        for figure in ("income_rate", "spend_rate")
+        for window in ("10s", "60s", "wave")
+    ),
+}
+
+
+class _MetricHooks(NamedTuple):
+    """What recording one (category, name) feeds besides the history and counters"""
+    gauge: Optional[str]            # EntityGauges kind
+    anomalies: bool                 # watched by an anomaly rule
+    rule_slot: Optional[int]        # RuleEngine slot, if an analytics rule watches it
+
 
 @dataclass
 class StatEntry:
@@ -53,26 +148,86 @@ class GameSession:
     total_damage_taken: float = 0.0
     session_id: str = ""
     
-    def duration(self) -> float:
-        """Get session duration in seconds"""
-        end = self.end_time or time.time()
+    def duration(self, now: Optional[float] = None) -> float:
+        """Get session duration in seconds (up to ``now`` while the session is running)"""
+        end = self.end_time or (time.time() if now is None else now)
         return end - self.start_time
 
 
 class StatsDashboard:
     """Real-time statistics dashboard for TopDeck"""
     
-    def __init__(self, history_size: int = 1000):
-        self.stats_history: deque = deque(maxlen=history_size)
+    def __init__(self, history_size: int = 1000, archive=None,
+                 hitch_thresholds: Optional[HitchThresholds] = None,
+                 heatmaps=None, position_batch: int = 4096,
+                 anomaly_rules: Optional[Sequence[AnomalyRule]] = None,
+                 analytics_rules: Optional[Sequence[Rule]] = None,
+                 clock: Callable[[], float] = time.time):
+        # Every timestamp the dashboard takes comes from here, so a replay
+        # can drive it with recorded times (see session_replay.py)
+        self.clock = clock
+        self.stats_history = StatRingBuffer(
+            history_size, list(StatCategory), entry_factory=StatEntry
+        )
         self.current_session: Optional[GameSession] = None
         self.sessions: List[GameSession] = []
         
+        # Optional SessionArchive that ended sessions are persisted to.
+        # The running session's events are copied out of the history
+        # before it wraps, so long sessions are archived whole
+        self.archive = archive
+        self._session_first_seq = 0
+        self._session_spilled: List[Tuple[array, array, array, array]] = []
+        self._spilled_seq = 0
+        self._spill_at = math.inf
+        
+        # Optional SpatialHeatmaps that event positions are binned into.
+        # Positions are buffered here and handed over in batches; without
+        # a heatmap only the latest ``position_batch`` per kind are kept
+        self.heatmaps = heatmaps
+        self.position_batch = position_batch
+        self.positions: Dict[str, Tuple[array, array]] = {
+            kind: (array("d"), array("d")) for kind in _POSITION_EVENTS
+        }
+        
         # Real-time counters
         self.counters = defaultdict(lambda: defaultdict(float))
         
         # Performance metrics
         self.frame_times: deque = deque(maxlen=100)
-        self.fps_history: deque = deque(maxlen=300)
+        self.frame_stats = FrameTimeStats(window=300)
+        self.hitches = HitchDetector(hitch_thresholds)
+        
+        # Entity counts and per-frame times for frame-cost scaling analysis
+        self.entities = EntityGauges()
+        
+        # Per-frame samples go to the rollup pipeline, not stats_history,
+        # so frame data cannot crowd gameplay events out of the history
+        self.performance = PerformanceRollups()
+        
+        # Trailing 10s/60s/current-wave rates behind the lifetime averages
+        self.rates = RateTracker([metric for metric, _ in _RATE_METRICS.values()])
+        
+        # EWMA baselines per watched metric; alerts stream to subscribers
+        self.anomalies = AnomalyDetector(DEFAULT_RULES if anomaly_rules is None else anomaly_rules)
+        
+        # Achievement/recommendation/warning rules, evaluated as stats arrive
+        self.rules = RuleEngine(DEFAULT_ANALYTICS_RULES if analytics_rules is None else analytics_rules)
+        
+        # Gauges and rules watching each (category, name), resolved up front
+        # so an unwatched stat costs one dict lookup. record_stat caches the
+        # metric ID and hooks per category and name in _metrics
+        self._hooks: Dict[Tuple[StatCategory, str], _MetricHooks] = {}
+        self._metrics: Dict[StatCategory, Dict[str, Tuple[int, Optional[_MetricHooks]]]] = {}
+        self._resolve_hooks()
+        self.anomalies.on_new_metric = self._resolve_hooks
+        self.rules.on_new_metric = self._resolve_hooks
+        
+        # Summary sections and report fragments, rebuilt only when dirty
+        self._summary_sections: Dict[str, Dict[str, Any]] = {}
+        self._report_fragments: Dict[str, Tuple[tuple, List[str]]] = {}
+        self._dirty_summary = set(SUMMARY_SECTIONS)
+        self._dirty_report = set(SUMMARY_SECTIONS)
         
         # Wave statistics
         self.wave_stats = {
@@ -117,10 +272,23 @@ class StatsDashboard:
         if self.current_session and not self.current_session.end_time:
             self.end_session()
         
+        now = self.clock()
         self.current_session = GameSession(
-            start_time=time.time(),
-            session_id=session_id or datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            start_time=now,
+            session_id=session_id or datetime.datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S")
         )
+        self.frame_stats.reset_session()
+        self.hitches.reset()
+        self.entities.clear()
+        self.rates.reset(self.current_session.start_time)
+        self.anomalies.reset()
+        self.rules.reset()
+        self.anomalies.context["session_id"] = self.current_session.session_id
+        self._session_first_seq = self._spilled_seq = self.stats_history.total_appended
+        self._session_spilled = []
+        if self.archive is not None:
+            self._spill_at = self._spilled_seq + self.stats_history.capacity
+        self.invalidate("session", "performance")
         
         self.record_stat(StatCategory.SESSION, "session_started", 1)
         return self.current_session
@@ -130,75 +298,342 @@ class StatsDashboard:
         if not self.current_session:
             return None
         
-        self.current_session.end_time = time.time()
+        self.current_session.end_time = self.clock()
         self.sessions.append(self.current_session)
+        if self.heatmaps is not None:
+            self.flush_positions()
+            self.heatmaps.end_session()
         
         self.record_stat(StatCategory.SESSION, "session_ended", 1)
         session = self.current_session
         self.current_session = None
+        self.invalidate("session")
+        
+        if self.archive is not None:
+            self._archive_session(session)
+        self._session_spilled = []
+        self._spill_at = math.inf
         return session
     
-    def record_stat(self, category: StatCategory, name: str, value: Any, unit: str = ""):
-        """Record a statistics entry"""
-        entry = StatEntry(
-            timestamp=time.time(),
-            category=category,
-            name=name,
-            value=value,
-            unit=unit
+    def _spill_session_events(self):
+        """Copy the running session's not yet copied events out of the history before it wraps"""
+        store = self.stats_history
+        self._session_spilled.append(store.columns(self._spilled_seq))
+        self._spilled_seq = store.total_appended
+        self._spill_at = self._spilled_seq + store.capacity
+    
+    def session_events(self) -> Iterator[StatEntry]:
+        """The running session's events, oldest first, including any already
+        copied out of the history for the archive"""
+        if self.current_session is None:
+            return
+        store = self.stats_history
+        for spilled in self._session_spilled:
+            yield from store.column_entries(spilled)
+        yield from store.entries(self._spilled_seq)
+    
+    def _archive_session(self, session: GameSession):
+        """Persist a finished session, every event recorded during it and its frame-time buckets"""
+        store = self.stats_history
+        events = store.columns(self._spilled_seq)
+        for spilled in reversed(self._session_spilled):
+            events = tuple(earlier + later for earlier, later in zip(spilled, events))
+        events = self._with_frame_buckets(session, events)
+        categories = list(StatCategory)
+        metric_table = [(categories[store.metric_categories[metric_id]], store.metric_names[metric_id])
+                        for metric_id in range(len(store.metric_names))]
+        unit_table = [store.units.lookup(unit_id) for unit_id in range(len(store.units))]
+        self.archive.append(
+            session,
+            events=events,
+            metric_table=metric_table,
+            unit_table=unit_table,
+            frame_summary=self.frame_stats.summary()
         )
+    
+    def _with_frame_buckets(self, session: GameSession,
+                            events: Tuple[array, array, array, array]) -> Tuple[array, array, array, array]:
+        """Merge the session's frame-time buckets into its event columns.
+        
+        Each bucket becomes one PERFORMANCE event per ``ARCHIVED_BUCKET_FIELDS``
+        entry at the bucket's start, so an archived session keeps its frame
+        times however long it ran.
+        """
+        store = self.stats_history
+        performance = _CATEGORY_IDS[StatCategory.PERFORMANCE]
+        metric_ids = [store.metric_id(performance, name) for name, _ in ARCHIVED_BUCKET_FIELDS]
+        flags = [store.units.intern(unit) << 2 | KIND_FLOAT for _, unit in ARCHIVED_BUCKET_FIELDS]
+        width = len(ARCHIVED_BUCKET_FIELDS)
         
-        self.stats_history.append(entry)
+        timestamps = events[0]
+        merged = tuple(array(column.typecode) for column in events)
+        position = 0
+        for bucket in self.performance.finest_buckets(session.start_time, session.end_time):
+            if not bucket.count:
+                continue
+            start = max(bucket.start, session.start_time)
+            cut = bisect_right(timestamps, start, position)
+            for column, out in zip(events, merged):
+                out.extend(column[position:cut])
+            position = cut
+            merged[0].extend([start] * width)
+            merged[1].extend(bucket.archived_values())
+            merged[2].extend(metric_ids)
+            merged[3].extend(flags)
+        for column, out in zip(events, merged):
+            out.extend(column[position:])
+        return merged
+    
+    def _resolve_hooks(self, _key: Any = None):
+        """Rebuild the per-metric hook table (also called when a rule watches a new metric)"""
+        by_anomalies = set()
+        for category_name, name in self.anomalies.watched:
+            category = CATEGORY_BY_NAME.get(category_name)
+            if category is not None:
+                by_anomalies.add((category, name))
+        rule_slots = {}
+        for (category_name, name), slot in self.rules.slots.items():
+            category = CATEGORY_BY_NAME.get(category_name)
+            if category is not None:
+                rule_slots[(category, name)] = slot
+        self._metrics = {category: {} for category in StatCategory}
+        self._hooks = {
+            key: _MetricHooks(_ENTITY_GAUGES.get(key), key in by_anomalies, rule_slots.get(key))
+            for key in set(_ENTITY_GAUGES) | by_anomalies | set(rule_slots)
+        }
+    
+    def record_stat(self, category: StatCategory, name: str, value: Any, unit: str = ""):
+        """Record a statistics entry"""
+        timestamp = self.clock()
+        metric = self._metrics[category].get(name)
+        if metric is None:
+            metric = self._metrics[category][name] = (
+                self.stats_history.metric_id(_CATEGORY_IDS[category], name),
+                self._hooks.get((category, name))
+            )
+        metric_id, hooks = metric
+        self.stats_history.append_metric(timestamp, metric_id, value, unit)
         self.counters[category][name] = value
         
+        if hooks is not None:
+            gauge, anomalies, rule_slot = hooks
+            if gauge:
+                self.entities.set_counts(timestamp, **{gauge: value})
+            if anomalies:
+                self.anomalies.observe(category.value, name, timestamp, value)
+            if rule_slot is not None:
+                self.rules.observe_slot(rule_slot, timestamp, value)
+        
         # Update session stats if active
         if self.current_session:
-            self._update_session_stats(category, name, value)
+            if self.stats_history.total_appended >= self._spill_at:
+                self._spill_session_events()
+            updates = _SESSION_UPDATES.get((category, name))
+            if updates:
+                self._apply_session_updates(updates, (value,))
+            rate = _RATE_METRICS.get((category, name))
+            if rate:
+                self.rates.add(rate[0], timestamp, 1 if rate[1] == "count" else value)
     
-    def _update_session_stats(self, category: StatCategory, name: str, value: Any):
-        """Update current session statistics"""
-        if not self.current_session:
+    def record_position_event(self, kind: str, x: float, z: float):
+        """Record a kill, leak or defender loss at world position (x, z).
+        
+        Also records the matching stat, so session totals and rates see it.
+        """
+        category, name = _POSITION_EVENTS[kind]
+        self.record_stat(category, name, 1)
+        xs, zs = self.positions[kind]
+        xs.append(x)
+        zs.append(z)
+        if len(xs) >= self.position_batch:
+            if self.heatmaps is not None:
+                self.flush_positions()
+            elif len(xs) >= 2 * self.position_batch:
+                del xs[:self.position_batch]
+                del zs[:self.position_batch]
+    
+    def flush_positions(self):
+        """Bin buffered event positions into the heatmaps"""
+        if self.heatmaps is None:
             return
+        for kind, (xs, zs) in self.positions.items():
+            if xs:
+                self.heatmaps.add_many(kind, xs, zs)
+                del xs[:]
+                del zs[:]
+    
+    def record_many(self, categories: Sequence[StatCategory], names: Sequence[str],
+                    values: Sequence[Any], units: Optional[Sequence[str]] = None,
+                    timestamps: Optional[Sequence[float]] = None) -> int:
+        """Record a batch of statistics entries given as parallel sequences.
         
-        if category == StatCategory.WAVES:
-            if name == "wave_completed":
-                self.current_session.waves_completed += 1
-                self.current_session.highest_wave = max(
-                    self.current_session.highest_wave, value
+        Produces the same history, counters and session totals as calling
+        ``record_stat`` once per event in order. Returns the number recorded.
+        """
+        count = len(values)
+        if len(categories) != count or len(names) != count:
+            raise ValueError("categories, names and values must have the same length")
+        if units is not None and len(units) != count:
+            raise ValueError("units must have the same length as values")
+        if timestamps is None:
+            timestamps = [self.clock()] * count
+        elif len(timestamps) != count:
+            raise ValueError("timestamps must have the same length as values")
+        if count == 0:
+            return 0
+        if self.stats_history.total_appended + count > self._spill_at:
+            capacity = self.stats_history.capacity
+            if count > capacity:
+                # Each piece is spilled before the next can overwrite it
+                return sum(
+                    self.record_many(categories[start:start + capacity], names[start:start + capacity],
+                                     values[start:start + capacity],
+                                     units[start:start + capacity] if units is not None else None,
+                                     timestamps[start:start + capacity])
+                    for start in range(0, count, capacity)
                 )
-        elif category == StatCategory.COMBAT:
-            if name == "enemy_killed":
-                self.current_session.enemies_killed += 1
-            elif name == "damage_dealt":
-                self.current_session.total_damage_dealt += value
-            elif name == "damage_taken":
-                self.current_session.total_damage_taken += value
-        elif category == StatCategory.DEFENDERS:
-            if name == "defender_lost":
-                self.current_session.defenders_lost += 1
-        elif category == StatCategory.ECONOMY:
-            if name == "money_earned":
-                self.current_session.money_earned += value
-            elif name == "money_spent":
-                self.current_session.money_spent += value
-        elif category == StatCategory.UPGRADES:
-            if name == "upgrade_purchased":
-                self.current_session.upgrades_purchased += 1
+            self._spill_session_events()
+        
+        category_ids = [_CATEGORY_IDS[category] for category in categories]
+        self.stats_history.extend(timestamps, category_ids, names, values, units)
+        
+        # Last value per metric wins, as with sequential record_stat calls
+        keys = list(zip(categories, names))
+        for (category, name), value in dict(zip(keys, values)).items():
+            self.counters[category][name] = value
+        
+        get_hooks = self._hooks.get
+        for key, timestamp, value in zip(keys, timestamps, values):
+            hooks = get_hooks(key)
+            if hooks is None:
+                continue
+            gauge, anomalies, rule_slot = hooks
+            if gauge:
+                self.entities.set_counts(timestamp, **{gauge: value})
+            if anomalies:
+                self.anomalies.observe(key[0].value, key[1], timestamp, value)
+            if rule_slot is not None:
+                self.rules.observe_slot(rule_slot, timestamp, value)
+        
+        if self.current_session:
+            self._update_session_stats_batch(keys, values)
+            for key, timestamp, value in zip(keys, timestamps, values):
+                rate = _RATE_METRICS.get(key)
+                if rate:
+                    self.rates.add(rate[0], timestamp, 1 if rate[1] == "count" else value)
+        return count
+    
+    def ingest_ndjson(self, stream: Iterable, batch_size: int = 65536) -> int:
+        """Record events from newline-delimited JSON, one object per line.
+        
+        Each line holds ``category`` (e.g. "Combat"), ``name``, ``value`` and
+        optionally ``unit`` and ``timestamp``; events without a timestamp are
+        stamped with the batch's ingest time. Lines are parsed and recorded
+        ``batch_size`` at a time. Returns the number of events recorded.
+        """
+        total = 0
+        lines = iter(stream)
+        while True:
+            batch = [
+                line.decode() if isinstance(line, bytes) else line
+                for line in islice(lines, batch_size)
+            ]
+            if not batch:
+                return total
+            
+            # One parser call per batch instead of one per line
+            records = json.loads("[" + ",".join(line for line in batch if line.strip()) + "]")
+            now = self.clock()
+            total += self.record_many(
+                [CATEGORY_BY_NAME[record["category"]] for record in records],
+                [record["name"] for record in records],
+                [record["value"] for record in records],
+                [record.get("unit", "") for record in records],
+                [record.get("timestamp", now) for record in records]
+            )
+    
+    def export_binary(self, out, since_seq: int = 0, compression: Optional[str] = "zlib") -> int:
+        """Write the events still in the history as binary telemetry (see telemetry_codec.py).
+        
+        Only events with sequence number >= ``since_seq`` are written.
+        Returns the number of bytes written.
+        """
+        store = self.stats_history
+        categories = list(StatCategory)
+        metric_table = [(categories[store.metric_categories[metric_id]].value, store.metric_names[metric_id])
+                        for metric_id in range(len(store.metric_names))]
+        unit_table = [store.units.lookup(unit_id) for unit_id in range(len(store.units))]
+        writer = TelemetryWriter(out, compression)
+        writer.write_columns(*store.columns(since_seq), metric_table, unit_table, store.objects(since_seq))
+        writer.close()
+        return writer.bytes_written
+    
+    def ingest_binary(self, buffer) -> int:
+        """Record every event in a binary telemetry buffer (bytes, mmap or memoryview).
+        
+        Decoded one block at a time through ``record_many``. Returns the
+        number of events recorded.
+        """
+        reader = TelemetryReader(buffer)
+        total = 0
+        for block in reader.blocks():
+            metrics = [(CATEGORY_BY_NAME[category], name) for category, name in reader.metrics]
+            units = reader.units
+            keys = [metrics[metric_id] for metric_id in block.metric_ids]
+            total += self.record_many(
+                [category for category, _ in keys],
+                [name for _, name in keys],
+                block.decoded_values(),
+                [units[flag >> 2] for flag in block.flags],
+                block.timestamps()
+            )
+        return total
+    
+    def _update_session_stats_batch(self, keys: List[Tuple[StatCategory, str]],
+                                    values: Sequence[Any]):
+        """Update current session statistics from a batch of events"""
+        groups: Dict[Tuple[StatCategory, str], List[Any]] = {}
+        for key, value in zip(keys, values):
+            if key in _SESSION_UPDATES:
+                groups.setdefault(key, []).append(value)
+        
+        for key, key_values in groups.items():
+            self._apply_session_updates(_SESSION_UPDATES[key], key_values)
+    
+    def _apply_session_updates(self, updates: Tuple[Tuple[str, str], ...],
+                               values: Sequence[Any]):
+        """Fold values for one metric into the session's totals"""
+        session = self.current_session
+        self.invalidate("session")
+        for field_name, mode in updates:
+            current = getattr(session, field_name)
+            if mode == "count":
+                current += len(values)
+            elif mode == "sum":
+                # Left-to-right, so float totals match one-at-a-time updates
+                current = reduce(operator.add, values, current)
+            else:
+                current = max(current, max(values))
+            setattr(session, field_name, current)
     
     def update_wave_stats(self, wave_number: int, enemies_spawned: int = 0):
         """Update wave-related statistics"""
         self.wave_stats["current_wave"] = wave_number
-        self.wave_stats["wave_start_time"] = time.time()
+        self.wave_stats["wave_start_time"] = self.clock()
+        self.rates.start_wave(self.wave_stats["wave_start_time"])
         self.wave_stats["enemies_this_wave"] = enemies_spawned
         self.wave_stats["enemies_killed_this_wave"] = 0
+        self.anomalies.context["wave"] = wave_number
+        self.invalidate("waves")
         
         self.record_stat(StatCategory.WAVES, "wave_started", wave_number)
     
     def complete_wave(self):
         """Mark current wave as completed"""
         if self.wave_stats["wave_start_time"] > 0:
-            duration = time.time() - self.wave_stats["wave_start_time"]
+            duration = self.clock() - self.wave_stats["wave_start_time"]
             self.wave_stats["wave_duration"] = duration
+            self.invalidate("waves")
             
             # Calculate efficiency
             if self.wave_stats["enemies_this_wave"] > 0:
@@ -218,6 +653,7 @@ class StatsDashboard:
         """Update combat-related statistics"""
         self.combat_stats["shots_fired"] += shots_fired
         self.combat_stats["shots_hit"] += shots_hit
+        self.invalidate("combat")
         
         if critical:
             self.combat_stats["critical_hits"] += 1
@@ -226,6 +662,10 @@ class StatsDashboard:
             self.combat_stats["accuracy"] = (
                 self.combat_stats["shots_hit"] / self.combat_stats["shots_fired"]
             ) * 100
+            # Lifetime accuracy barely moves late in a session; the
+            # anomaly rules watch each volley's
+            self.record_stat(StatCategory.COMBAT, "shot_accuracy",
+                             shots_hit / shots_fired * 100, "%")
         
         self.record_stat(StatCategory.COMBAT, "damage_dealt", damage_dealt)
         self.record_stat(StatCategory.COMBAT, "accuracy", 
@@ -234,6 +674,7 @@ class StatsDashboard:
     def update_economy_stats(self, current_money: int, earned: int = 0, spent: int = 0):
         """Update economy-related statistics"""
         self.economy_stats["current_money"] = current_money
+        self.invalidate("economy")
         
         if earned > 0:
             self.record_stat(StatCategory.ECONOMY, "money_earned", earned)
@@ -242,7 +683,7 @@ class StatsDashboard:
         
         # Calculate rates
         if self.current_session:
-            duration = self.current_session.duration() / 60.0  # Convert to minutes
+            duration = self.current_session.duration(self.clock()) / 60.0  # Convert to minutes
             if duration > 0:
                 self.economy_stats["income_rate"] = (
                     self.current_session.money_earned / duration
@@ -266,7 +707,10 @@ class StatsDashboard:
     def update_upgrade_stats(self, defender_type: str, level: int, cost: int):
         """Update upgrade-related statistics"""
         self.upgrade_stats["total_upgrades"] += 1
+        self.invalidate("upgrades")
         self.upgrade_stats["upgrade_levels"][defender_type] = level
+        self.anomalies.context["last_upgrade"] = {"defender": defender_type, "level": level,
+                                                  "timestamp": self.clock()}
         
         # Track efficiency (damage increase per cost)
         if defender_type not in self.upgrade_stats["upgrade_efficiency"]:
@@ -292,81 +736,195 @@ class StatsDashboard:
         self.record_stat(StatCategory.UPGRADES, "upgrade_purchased", 1)
         self.record_stat(StatCategory.UPGRADES, f"{defender_type}_level", level)
     
+    def update_entity_counts(self, attackers: Optional[int] = None,
+                             projectiles: Optional[int] = None,
+                             defenders: Optional[int] = None):
+        """Record how many attackers, projectiles and defenders are alive"""
+        for (category, name), kind in _ENTITY_GAUGES.items():
+            count = {"attackers": attackers, "projectiles": projectiles, "defenders": defenders}[kind]
+            if count is not None:
+                self.record_stat(category, name, count)
+    
     def update_fps(self, delta_time: float):
         """Update FPS statistics"""
         self.frame_times.append(delta_time)
         
         if delta_time > 0:
             fps = 1.0 / delta_time
-            self.fps_history.append(fps)
             
-            # Calculate averages
-            avg_fps = sum(self.fps_history) / len(self.fps_history)
-            min_fps = min(self.fps_history) if self.fps_history else 0
-            max_fps = max(self.fps_history) if self.fps_history else 0
+            # Window figures are maintained incrementally by the frame engine
+            frame_stats = self.frame_stats
+            frame_stats.add(delta_time)
+            self.invalidate("performance")
+            now = self.clock()
+            closed = self.performance.add(now, delta_time)
+            self.entities.add_frame(now, delta_time)
+            if closed is not None:
+                # One frame-time event per second, not per frame, reaches the history
+                self.record_stat(StatCategory.PERFORMANCE, "frame_time_ms", closed.mean * 1000.0, "ms")
             
-            self.record_stat(StatCategory.PERFORMANCE, "current_fps", fps)
-            self.record_stat(StatCategory.PERFORMANCE, "average_fps", avg_fps)
-            self.record_stat(StatCategory.PERFORMANCE, "min_fps", min_fps)
-            self.record_stat(StatCategory.PERFORMANCE, "max_fps", max_fps)
+            severity = self.hitches.check(delta_time)
+            if severity:
+                self._record_hitch(now, delta_time, severity)
+            
+            counters = self.counters[StatCategory.PERFORMANCE]
+            counters["current_fps"] = fps
+            counters["average_fps"] = frame_stats.average_fps
+            self.rules.observe(StatCategory.PERFORMANCE.value, "average_fps",
+                               now, frame_stats.average_fps)
+            counters["min_fps"] = frame_stats.min_fps
+            counters["max_fps"] = frame_stats.max_fps
     
-    def get_summary(self) -> Dict[str, Any]:
-        """Get a summary of all current statistics"""
-        summary = {
-            "session": {},
-            "waves": self.wave_stats,
-            "combat": self.combat_stats,
-            "economy": self.economy_stats,
-            "upgrades": self.upgrade_stats,
-            "performance": {}
-        }
+    def _record_hitch(self, timestamp: float, frame_time: float, severity: str):
+        """Keep a detected hitch with the gameplay events leading up to it.
         
-        # Session summary
-        if self.current_session:
-            summary["session"] = {
-                "id": self.current_session.session_id,
-                "duration": self.current_session.duration(),
-                "waves_completed": self.current_session.waves_completed,
-                "enemies_killed": self.current_session.enemies_killed,
-                "defenders_lost": self.current_session.defenders_lost,
-                "kd_ratio": (self.current_session.enemies_killed / 
-                           max(1, self.current_session.defenders_lost))
-            }
+        Hitches live in ``self.hitches``, not the event history, so a run
+        of slow frames cannot push the gameplay events out of it.
+        """
+        context = self.hitches.thresholds.context_events
+        recent_events = []
+        if context:
+            store = self.stats_history
+            performance = _CATEGORY_IDS[StatCategory.PERFORMANCE]
+            gameplay = [metric_id for metric_id, category_id in enumerate(store.metric_categories)
+                        if category_id != performance]
+            recent_events = store.recent(context, metric_ids=gameplay)
+        self.hitches.record(Hitch(
+            timestamp=timestamp,
+            frame_time_ms=frame_time * 1000.0,
+            baseline_ms=self.hitches.baseline_ms,
+            wave=self.wave_stats["current_wave"],
+            severity=severity,
+            recent_events=recent_events
+        ))
+    
+    def get_hitches(self, since: Optional[float] = None) -> List[Hitch]:
+        """Recently detected hitches, oldest first"""
+        return [hitch for hitch in self.hitches.hitches if since is None or hitch.timestamp >= since]
+    
+    def get_alerts(self, since_seq: int = 0) -> List[Alert]:
+        """Anomaly alerts raised this session, oldest first.
+        
+        Pass the ``seq`` after the last alert seen to poll for new ones, or
+        use ``anomalies.subscribe(callback)`` to receive them as they happen.
+        """
+        return self.anomalies.alerts(since_seq)
+    
+    def get_performance_rollups(self, resolution: float = 1.0,
+                                since: Optional[float] = None) -> List[RollupBucket]:
+        """Get frame-time rollup buckets (1s, 10s or 60s resolution)"""
+        return self.performance.buckets(resolution, since)
+    
+    def invalidate(self, *sections: str):
+        """Mark summary sections as changed (all of them if none are given).
         
-        # Performance summary
-        if self.fps_history:
-            summary["performance"] = {
-                "current_fps": self.fps_history[-1] if self.fps_history else 0,
-                "average_fps": sum(self.fps_history) / len(self.fps_history),
-                "min_fps": min(self.fps_history),
-                "max_fps": max(self.fps_history),
-                "stable": max(self.fps_history) - min(self.fps_history) < 20
+        The update_* and record_* methods do this themselves; call it after
+        modifying wave_stats, combat_stats etc. directly.
+        """
+        sections = sections or SUMMARY_SECTIONS
+        self._dirty_summary.update(sections)
+        self._dirty_report.update(sections)
+    
+    def _build_section(self, section: str) -> Dict[str, Any]:
+        """Snapshot of one summary section's call-driven (non time-dependent) fields"""
+        if section == "session":
+            session = self.current_session
+            if not session:
+                return {}
+            return {
+                "id": session.session_id,
+                "waves_completed": session.waves_completed,
+                "enemies_killed": session.enemies_killed,
+                "defenders_lost": session.defenders_lost,
+                "kd_ratio": session.enemies_killed / max(1, session.defenders_lost)
+            }
+        if section == "waves":
+            return dict(self.wave_stats)
+        if section == "combat":
+            return dict(self.combat_stats)
+        if section == "economy":
+            return dict(self.economy_stats)
+        if section == "upgrades":
+            upgrades = dict(self.upgrade_stats)
+            upgrades["upgrade_levels"] = dict(upgrades["upgrade_levels"])
+            upgrades["upgrade_efficiency"] = {
+                defender: dict(stats) for defender, stats in upgrades["upgrade_efficiency"].items()
             }
+            return upgrades
+        performance = self.frame_stats.summary()
+        if not performance:
+            return {}
+        performance["hitches"] = self.hitches.summary()
+        return performance
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get a summary of all current statistics.
+        
+        Sections are rebuilt only after a call that changed them; the
+        time-dependent figures (session duration, kills/min, DPS and the
+        windowed rates) are recomputed on every call. The returned dicts
+        are snapshots shared between calls, so treat them as read-only.
+        """
+        for section in self._dirty_summary:
+            self._summary_sections[section] = self._build_section(section)
+        self._dirty_summary.clear()
+        summary = dict(self._summary_sections)
         
         # Calculate derived metrics
         if self.current_session:
-            duration_minutes = self.current_session.duration() / 60.0
-            if duration_minutes > 0:
-                summary["combat"]["kills_per_minute"] = (
-                    self.current_session.enemies_killed / duration_minutes
-                )
-                summary["combat"]["damage_per_second"] = (
-                    self.current_session.total_damage_dealt / 
-                    self.current_session.duration()
-                )
+            now = self.clock()
+            duration = self.current_session.duration(now)
+            summary["session"] = dict(summary["session"], duration=duration)
+            combat = summary["combat"] = dict(summary["combat"])
+            economy = summary["economy"] = dict(summary["economy"])
+            if duration > 0:
+                combat["kills_per_minute"] = self.current_session.enemies_killed / (duration / 60.0)
+                combat["damage_per_second"] = self.current_session.total_damage_dealt / duration
+            summary["rates"] = self.get_rates(now)
+            for figure, windows in summary["rates"].items():
+                section = combat if _RATE_FIGURES[figure][0] == "combat" else economy
+                for window, rate in windows.items():
+                    section[f"{figure}_{window}"] = rate
         
         return summary
     
+    def get_rates(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Trailing-window rates, e.g. ``{"kills_per_minute": {"10s": .., "60s": .., "wave": ..}}``.
+        
+        Kills, income and spend are per minute and damage is per second, in
+        the same units as the lifetime figures in combat_stats/economy_stats.
+        """
+        now = self.clock() if now is None else now
+        return {
+            figure: self.rates.rates(metric, now, scale)
+            for figure, (_, metric, scale) in _RATE_FIGURES.items()
+        }
+    
     def get_recent_stats(self, category: Optional[StatCategory] = None, 
-                        limit: int = 100) -> List[StatEntry]:
-        """Get recent statistics entries"""
-        if category:
-            filtered = [s for s in self.stats_history if s.category == category]
-            return list(filtered)[-limit:]
-        return list(self.stats_history)[-limit:]
+                        limit: Optional[int] = 100, name: Optional[str] = None,
+                        since: Optional[float] = None,
+                        until: Optional[float] = None) -> List[StatEntry]:
+        """Get recent statistics entries, optionally filtered by metric and time range"""
+        store = self.stats_history
+        category_id = _CATEGORY_IDS[category] if category else None
+        
+        metric_ids = None
+        if name is not None:
+            if category_id is not None:
+                metric_id = store.find_metric(category_id, name)
+                metric_ids = [metric_id] if metric_id is not None else []
+            else:
+                metric_ids = store.metric_ids_named(name)
+        
+        return store.recent(limit, category_id, metric_ids, since, until)
     
     def generate_report(self) -> str:
-        """Generate a formatted statistics report"""
+        """Generate a formatted statistics report.
+        
+        Each section's lines are cached and re-rendered only when the
+        section changed or one of its time-dependent figures changed at
+        the precision shown.
+        """
         summary = self.get_summary()
         
         report = ["=" * 60]
@@ -374,28 +932,42 @@ class StatsDashboard:
         report.append("=" * 60)
         report.append("")
         
-        # Session info
-        if summary["session"]:
-            report.append("📊 CURRENT SESSION")
-            report.append("-" * 40)
-            sess = summary["session"]
-            duration = sess["duration"]
-            hours = int(duration // 3600)
-            minutes = int((duration % 3600) // 60)
-            seconds = int(duration % 60)
-            
-            report.append(f"  Session ID: {sess['id']}")
-            report.append(f"  Duration: {hours:02d}:{minutes:02d}:{seconds:02d}")
-            report.append(f"  Waves Completed: {sess['waves_completed']}")
-            report.append(f"  Enemies Killed: {sess['enemies_killed']}")
-            report.append(f"  Defenders Lost: {sess['defenders_lost']}")
-            report.append(f"  K/D Ratio: {sess['kd_ratio']:.2f}")
-            report.append("")
-        
-        # Wave stats
-        report.append("🌊 WAVE STATISTICS")
-        report.append("-" * 40)
-        wave = summary["waves"]
+        for section in SUMMARY_SECTIONS:
+            live = tuple(
+                round(summary[section].get(name, 0.0), digits)
+                for name, digits in _LIVE_FIELDS.get(section, ())
+            )
+            cached = self._report_fragments.get(section)
+            if cached is None or cached[0] != live or section in self._dirty_report:
+                cached = (live, getattr(self, f"_render_{section}")(summary[section]))
+                self._report_fragments[section] = cached
+                self._dirty_report.discard(section)
+            report.extend(cached[1])
+        
+        report.append("=" * 60)
+        
+        return "\n".join(report)
+    
+    def _render_session(self, sess: Dict[str, Any]) -> List[str]:
+        if not sess:
+            return []
+        report = ["📊 CURRENT SESSION", "-" * 40]
+        duration = sess["duration"]
+        hours = int(duration // 3600)
+        minutes = int((duration % 3600) // 60)
+        seconds = int(duration % 60)
+        
+        report.append(f"  Session ID: {sess['id']}")
+        report.append(f"  Duration: {hours:02d}:{minutes:02d}:{seconds:02d}")
+        report.append(f"  Waves Completed: {sess['waves_completed']}")
+        report.append(f"  Enemies Killed: {sess['enemies_killed']}")
+        report.append(f"  Defenders Lost: {sess['defenders_lost']}")
+        report.append(f"  K/D Ratio: {sess['kd_ratio']:.2f}")
+        report.append("")
+        return report
+    
+    def _render_waves(self, wave: Dict[str, Any]) -> List[str]:
+        report = ["🌊 WAVE STATISTICS", "-" * 40]
         report.append(f"  Current Wave: {wave['current_wave']}")
         report.append(f"  Enemies This Wave: {wave['enemies_this_wave']}")
         report.append(f"  Enemies Killed: {wave['enemies_killed_this_wave']}")
@@ -403,34 +975,41 @@ class StatsDashboard:
         if wave['wave_duration'] > 0:
             report.append(f"  Last Wave Duration: {wave['wave_duration']:.1f}s")
         report.append("")
-        
-        # Combat stats
-        report.append("⚔️ COMBAT STATISTICS")
-        report.append("-" * 40)
-        combat = summary["combat"]
+        return report
+    
+    def _render_combat(self, combat: Dict[str, Any]) -> List[str]:
+        report = ["⚔️ COMBAT STATISTICS", "-" * 40]
         report.append(f"  Accuracy: {combat['accuracy']:.1f}%")
         report.append(f"  Shots Fired: {combat['shots_fired']:,}")
         report.append(f"  Shots Hit: {combat['shots_hit']:,}")
         report.append(f"  Critical Hits: {combat['critical_hits']:,}")
         report.append(f"  Kills/Minute: {combat.get('kills_per_minute', 0):.1f}")
         report.append(f"  DPS: {combat.get('damage_per_second', 0):.1f}")
+        if "kills_per_minute_10s" in combat:
+            report.append(f"  Kills/Minute 10s/60s/wave: {combat['kills_per_minute_10s']:.1f} / "
+                          f"{combat['kills_per_minute_60s']:.1f} / {combat['kills_per_minute_wave']:.1f}")
+            report.append(f"  DPS 10s/60s/wave: {combat['damage_per_second_10s']:.1f} / "
+                          f"{combat['damage_per_second_60s']:.1f} / {combat['damage_per_second_wave']:.1f}")
         report.append("")
-        
-        # Economy stats
-        report.append("💰 ECONOMY STATISTICS")
-        report.append("-" * 40)
-        econ = summary["economy"]
+        return report
+    
+    def _render_economy(self, econ: Dict[str, Any]) -> List[str]:
+        report = ["💰 ECONOMY STATISTICS", "-" * 40]
         report.append(f"  Current Money: ${econ['current_money']:,}")
         report.append(f"  Income Rate: ${econ['income_rate']:.1f}/min")
         report.append(f"  Spend Rate: ${econ['spend_rate']:.1f}/min")
+        if "income_rate_10s" in econ:
+            report.append(f"  Income 10s/60s/wave: ${econ['income_rate_10s']:.1f} / "
+                          f"${econ['income_rate_60s']:.1f} / ${econ['income_rate_wave']:.1f} per min")
+            report.append(f"  Spend 10s/60s/wave: ${econ['spend_rate_10s']:.1f} / "
+                          f"${econ['spend_rate_60s']:.1f} / ${econ['spend_rate_wave']:.1f} per min")
         report.append(f"  Efficiency: {econ['efficiency_ratio']*100:.1f}%")
         report.append(f"  Cost per Kill: ${econ['cost_per_kill']:.2f}")
         report.append("")
-        
-        # Upgrade stats
-        report.append("⬆️ UPGRADE STATISTICS")
-        report.append("-" * 40)
-        upgr = summary["upgrades"]
+        return report
+    
+    def _render_upgrades(self, upgr: Dict[str, Any]) -> List[str]:
+        report = ["⬆️ UPGRADE STATISTICS", "-" * 40]
         report.append(f"  Total Upgrades: {upgr['total_upgrades']}")
         report.append(f"  Most Upgraded: {upgr['most_upgraded'] or 'None'}")
         
@@ -439,23 +1018,31 @@ class StatsDashboard:
             for def_type, level in upgr['upgrade_levels'].items():
                 report.append(f"    {def_type}: Level {level}")
         report.append("")
-        
-        # Performance stats
-        if summary["performance"]:
-            report.append("⚡ PERFORMANCE STATISTICS")
-            report.append("-" * 40)
-            perf = summary["performance"]
-            report.append(f"  Current FPS: {perf['current_fps']:.0f}")
-            report.append(f"  Average FPS: {perf['average_fps']:.0f}")
-            report.append(f"  Min FPS: {perf['min_fps']:.0f}")
-            report.append(f"  Max FPS: {perf['max_fps']:.0f}")
-            stability = "✅ Stable" if perf['stable'] else "⚠️ Unstable"
-            report.append(f"  Stability: {stability}")
-            report.append("")
-        
-        report.append("=" * 60)
-        
-        return "\n".join(report)
+        return report
+    
+    def _render_performance(self, perf: Dict[str, Any]) -> List[str]:
+        if not perf:
+            return []
+        report = ["⚡ PERFORMANCE STATISTICS", "-" * 40]
+        report.append(f"  Current FPS: {perf['current_fps']:.0f}")
+        report.append(f"  Average FPS: {perf['average_fps']:.0f}")
+        report.append(f"  Min FPS: {perf['min_fps']:.0f}")
+        report.append(f"  Max FPS: {perf['max_fps']:.0f}")
+        report.append(f"  1% Low FPS: {perf['one_percent_low_fps']:.0f}")
+        frame_ms = perf["frame_time_ms"]
+        report.append(f"  Frame Time p50/p95/p99/p99.9: {frame_ms['p50']:.1f} / "
+                      f"{frame_ms['p95']:.1f} / {frame_ms['p99']:.1f} / "
+                      f"{frame_ms['p99_9']:.1f} ms")
+        over = perf["frames_over_ms"]
+        report.append("  Frames ≥ " + " / ".join(f"{ms:g}" for ms in over) + " ms: "
+                      + " / ".join(f"{count:,}" for count in over.values()))
+        hitches = perf["hitches"]
+        report.append(f"  Hitches: {hitches['count']:,} ({hitches['spikes']:,} spikes), "
+                      f"{hitches['per_minute']:.2f}/min, worst {hitches['worst_ms']:.1f} ms")
+        stability = "✅ Stable" if perf['stable'] else "⚠️ Unstable"
+        report.append(f"  Stability: {stability}")
+        report.append("")
+        return report
     
     def export_session_data(self, session: Optional[GameSession] = None) -> Dict:
         """Export session data for analysis"""
@@ -469,7 +1056,7 @@ class StatsDashboard:
             "session_id": session.session_id,
             "start_time": session.start_time,
             "end_time": session.end_time,
-            "duration": session.duration(),
+            "duration": session.duration(self.clock()),
             "waves_completed": session.waves_completed,
             "highest_wave": session.highest_wave,
             "enemies_killed": session.enemies_killed,
@@ -490,49 +1077,31 @@ class StatsDashboard:
         }
     
     def get_analytics(self) -> Dict[str, Any]:
-        """Generate analytics insights from statistics"""
+        """Generate analytics insights from statistics.
+        
+        Insights are the rules currently active in ``self.rules``, which are
+        kept up to date as stats are recorded, so nothing is recomputed here.
+        Use ``rules.subscribe(callback)`` to be told when one turns on or off.
+        """
         analytics = {
             "recommendations": [],
             "warnings": [],
-            "achievements": []
+            "achievements": [],
+            "alerts": [alert.to_dict() for alert in self.get_alerts()]
         }
         
-        summary = self.get_summary()
+        for rule in self.rules.active():
+            analytics[rule.kind + "s"].append(rule.message)
         
-        # Performance analysis
-        if summary.get("performance"):
-            avg_fps = summary["performance"]["average_fps"]
-            if avg_fps < 30:
-                analytics["warnings"].append("⚠️ Low FPS detected - consider reducing quality settings")
-            elif avg_fps > 60:
-                analytics["achievements"].append("🏆 Excellent performance - running smoothly!")
-        
-        # Combat analysis
-        if summary["combat"]["accuracy"] < 50:
-            analytics["recommendations"].append("💡 Low accuracy - try focusing fire on single targets")
-        elif summary["combat"]["accuracy"] > 80:
-            analytics["achievements"].append("🎯 Sharp shooter - excellent accuracy!")
-        
-        # Economy analysis
-        econ = summary["economy"]
-        if econ["efficiency_ratio"] > 0.9:
-            analytics["warnings"].append("⚠️ Spending nearly all income - save for emergencies")
-        elif econ["efficiency_ratio"] < 0.5:
-            analytics["recommendations"].append("💡 Under-spending - consider more upgrades")
-        
-        # Wave progress
-        if self.current_session:
-            if self.current_session.waves_completed > 20:
-                analytics["achievements"].append("🌟 Veteran defender - 20+ waves completed!")
-            
-            kd_ratio = (self.current_session.enemies_killed / 
-                       max(1, self.current_session.defenders_lost))
-            if kd_ratio > 100:
-                analytics["achievements"].append("💪 Unstoppable force - 100:1 K/D ratio!")
+        hitches = self.hitches
+        if hitches.spike_count or hitches.per_minute > 1.0:
+            analytics["warnings"].append(
+                f"⚠️ Frame hitches detected - {hitches.hitch_count} so far, "
+                f"worst {hitches.worst_ms:.0f} ms (see get_hitches())"
+            )
         
         return analytics
 
-
 def main():
     """Demo the statistics dashboard"""
     dashboard = StatsDashboard()
@@ -578,6 +1147,11 @@ def main():
         for warning in analytics["warnings"]:
             print(f"  {warning}")
     
+    if analytics["alerts"]:
+        print("\nAlerts:")
+        for alert in analytics["alerts"]:
+            print(f"  {json.dumps(alert)}")
+    
     # Export session data
     session_data = dashboard.export_session_data()
     print("\nSession data exported:", json.dumps(session_data, indent=2))
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Telemetry Codec for TopDeck Stats Dashboard
+Compact binary encoding for statistics events, for the wire and for files.
+
+Layout (little-endian):
+
+    stream header   magic "TDTC", version, flags
+    block*          block header + payload, optionally zlib/lzma compressed
+
+A block payload holds the events' columns back to back: values (float64),
+timestamp deltas in microseconds (int32, or int64 when a gap needs it),
+metric IDs (uint32) and flags (uint16, unit ID << 2 | value kind, as in
+stat_store), followed by the metric names, units and non-numeric values
+first seen in the block. Names are interned for the whole stream, so a
+metric's name is written once. Uncompressed blocks decode without copying
+on little-endian hosts: the columns are memoryview slices of the input
+buffer. Big-endian hosts byteswap the columns on both sides.
+"""
+
+import json
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from stat_store import KIND_BOOL, KIND_FLOAT, KIND_INT, KIND_OBJECT
+
+MAGIC = b"TDTC"
+VERSION = 1
+
+# magic, version, flags (reserved)
+_STREAM_HEADER = struct.Struct("<4sHH")
+
+# codec, block flags, reserved, event count, raw payload bytes, stored payload bytes,
+# first timestamp (microseconds)
+_BLOCK_HEADER = struct.Struct("<BBHIIIq")
+_FLAG_WIDE_DELTAS = 1
+
+CODECS = {None: 0, "zlib": 1, "lzma": 2}
+_CODEC_NAMES = {code: name for name, code in CODECS.items()}
+
+_MAX_EXACT_INT = 2 ** 53
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+# array.tobytes() and memoryview.cast() use the host's byte order
+_SWAP_BYTES = sys.byteorder != "little"
+
+
+def _pad8(size: int) -> int:
+    return -size % 8
+
+
+@dataclass
+class EventBlock:
+    """Decoded columns of one block.
+
+    ``values``, ``deltas``, ``metric_ids`` and ``flags`` are memoryviews;
+    for uncompressed blocks they point straight into the input buffer.
+    On big-endian hosts they are byteswapped arrays instead.
+    ``objects`` holds the non-numeric values, in event order.
+    """
+    first_timestamp_us: int
+    deltas: memoryview
+    values: memoryview
+    metric_ids: memoryview
+    flags: memoryview
+    objects: List[Any]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def timestamps(self) -> array:
+        """Absolute timestamps in seconds"""
+        first = self.first_timestamp_us
+        return array("d", (us / 1_000_000.0 for us in accumulate(self.deltas, initial=first)))[1:]
+
+    def decoded_values(self) -> List[Any]:
+        """Values with their original Python types"""
+        objects = iter(self.objects)
+        result = []
+        for value, flag in zip(self.values, self.flags):
+            kind = flag & 0b11
+            if kind == KIND_FLOAT:
+                result.append(value)
+            elif kind == KIND_INT:
+                result.append(int(value))
+            elif kind == KIND_BOOL:
+                result.append(bool(value))
+            else:
+                result.append(next(objects))
+        return result
+
+
+class TelemetryWriter:
+    """Encodes events into a binary stream, one block per ``block_events`` events.
+
+    Events are added one at a time with ``write`` or as store columns with
+    ``write_columns``; a stream should use one or the other, since both
+    assign metric and unit IDs. Timestamps are kept to the microsecond.
+    """
+
+    def __init__(self, out: BinaryIO, compression: Optional[str] = "zlib",
+                 level: Optional[int] = None, block_events: int = 65536):
+        if compression not in CODECS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.out = out
+        self.compression = compression
+        self.level = level
+        self.block_events = block_events
+        self.metrics: List[Tuple[str, str]] = []
+        self.units: List[str] = [""]
+        self._metric_ids: Dict[Tuple[str, str], int] = {}
+        self._unit_ids: Dict[str, int] = {"": 0}
+        self._sent_metrics = 0
+        self._sent_units = 1
+        self.events_written = 0
+        self.bytes_written = _STREAM_HEADER.size
+        self._reset_block()
+        out.write(_STREAM_HEADER.pack(MAGIC, VERSION, 0))
+
+    def _reset_block(self):
+        self._timestamps = array("d")
+        self._values = array("d")
+        self._metric_column = array("I")
+        self._flags = array("H")
+        self._objects: List[Any] = []
+
+    def write(self, timestamp: float, category: str, name: str, value: Any, unit: str = ""):
+        """Add one event (``category`` is the StatCategory value, e.g. "Combat")"""
+        key = (category, name)
+        metric_id = self._metric_ids.get(key)
+        if metric_id is None:
+            metric_id = self._metric_ids[key] = len(self.metrics)
+            self.metrics.append(key)
+        unit_id = self._unit_ids.get(unit)
+        if unit_id is None:
+            unit_id = self._unit_ids[unit] = len(self.units)
+            self.units.append(unit)
+
+        value_type = type(value)
+        if value_type is float:
+            kind = KIND_FLOAT
+        elif value_type is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            kind = KIND_INT
+        elif isinstance(value, bool):
+            kind = KIND_BOOL
+        elif isinstance(value, float):
+            kind, value = KIND_FLOAT, float(value)
+        elif isinstance(value, int) and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            kind, value = KIND_INT, int(value)
+        else:
+            kind = KIND_OBJECT
+            self._objects.append(value)
+            value = 0.0
+        self._timestamps.append(timestamp)
+        self._values.append(value)
+        self._metric_column.append(metric_id)
+        self._flags.append(unit_id << 2 | kind)
+        if len(self._values) >= self.block_events:
+            self.flush()
+
+    def write_columns(self, timestamps: Sequence[float], values: Sequence[float],
+                      metric_ids: Sequence[int], flags: Sequence[int],
+                      metric_table: Sequence[Tuple[str, str]], unit_table: Sequence[str],
+                      objects: Sequence[Any] = ()):
+        """Add events given as stat_store columns.
+
+        ``metric_table``/``unit_table`` map the IDs used in the columns to
+        names; they may grow between calls but must keep earlier entries.
+        ``objects`` are the values of the KIND_OBJECT events, in order.
+        """
+        if len(metric_table) < len(self.metrics) or len(unit_table) < len(self.units):
+            raise ValueError("metric and unit tables must extend the ones already written")
+        self.metrics[len(self.metrics):] = [tuple(m) for m in metric_table[len(self.metrics):]]
+        self.units[len(self.units):] = list(unit_table[len(self.units):])
+
+        objects = list(objects)
+        position = 0
+        total = len(values)
+        while position < total:
+            room = self.block_events - len(self._values)
+            end = min(total, position + room)
+            self._timestamps.extend(timestamps[position:end])
+            self._values.extend(values[position:end])
+            self._metric_column.extend(metric_ids[position:end])
+            block_flags = flags[position:end]
+            self._flags.extend(block_flags)
+            if objects:
+                taken = sum(1 for flag in block_flags if flag & 0b11 == KIND_OBJECT)
+                self._objects.extend(objects[:taken])
+                del objects[:taken]
+            position = end
+            if len(self._values) >= self.block_events:
+                self.flush()
+
+    def flush(self):
+        """Encode and write the buffered events as one block"""
+        count = len(self._values)
+        if count == 0:
+            return
+
+        # Delta-encode timestamps in whole microseconds
+        micros = [round(t * 1_000_000.0) for t in self._timestamps]
+        deltas = [0]
+        deltas.extend(b - a for a, b in zip(micros, micros[1:]))
+        block_flags = 0
+        if min(deltas) < _INT32_MIN or max(deltas) > _INT32_MAX:
+            delta_column = array("q", deltas)
+            block_flags |= _FLAG_WIDE_DELTAS
+        else:
+            delta_column = array("i", deltas)
+
+        tables = {}
+        if len(self.metrics) > self._sent_metrics:
+            tables["metrics"] = self.metrics[self._sent_metrics:]
+        if len(self.units) > self._sent_units:
+            tables["units"] = self.units[self._sent_units:]
+        if self._objects:
+            tables["objects"] = [
+                value if isinstance(value, (str, int, float, bool, type(None), list, dict)) else str(value)
+                for value in self._objects
+            ]
+        table_bytes = json.dumps(tables, separators=(",", ":")).encode("utf-8") if tables else b""
+
+        columns = [self._values, delta_column, self._metric_column, self._flags]
+        if _SWAP_BYTES:
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        parts = [column.tobytes() for column in columns]
+        columns_size = sum(len(part) for part in parts)
+        parts.append(b"\0" * _pad8(columns_size))
+        parts.append(table_bytes)
+        payload = b"".join(parts)
+
+        if self.compression == "zlib":
+            stored = zlib.compress(payload, 6 if self.level is None else self.level)
+        elif self.compression == "lzma":
+            stored = lzma.compress(payload, preset=6 if self.level is None else self.level)
+        else:
+            stored = payload
+        header = _BLOCK_HEADER.pack(CODECS[self.compression], block_flags, 0, count,
+                                    len(payload), len(stored), micros[0])
+        self.out.write(header)
+        self.out.write(stored)
+        padding = _pad8(len(stored))
+        if padding:
+            self.out.write(b"\0" * padding)
+
+        self.events_written += count
+        self.bytes_written += len(header) + len(stored) + padding
+        self._sent_metrics = len(self.metrics)
+        self._sent_units = len(self.units)
+        self._reset_block()
+
+    def close(self):
+        """Write any buffered events (the output stream is left open)"""
+        self.flush()
+
+    def __enter__(self) -> "TelemetryWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TelemetryReader:
+    """Decodes a binary telemetry stream from a bytes-like object (bytes, mmap, memoryview).
+
+    ``metrics`` and ``units`` grow as blocks are read.
+    """
+
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast("B")
+        if len(self.view) < _STREAM_HEADER.size:
+            raise ValueError("Not a telemetry stream: too short")
+        magic, version, _ = _STREAM_HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a telemetry stream: bad magic")
+        if version > VERSION:
+            raise ValueError(f"Unsupported telemetry version {version}")
+        self.version = version
+        self.metrics: List[Tuple[str, str]] = []
+        self.units: List[str] = [""]
+
+    def blocks(self) -> Iterator[EventBlock]:
+        view = self.view
+        offset = _STREAM_HEADER.size
+        while offset + _BLOCK_HEADER.size <= len(view):
+            codec, block_flags, _, count, raw_size, stored_size, first_us = \
+                _BLOCK_HEADER.unpack_from(view, offset)
+            offset += _BLOCK_HEADER.size
+            stored = view[offset:offset + stored_size]
+            if len(stored) < stored_size:
+                raise ValueError("Truncated telemetry block")
+            offset += stored_size + _pad8(stored_size)
+
+            name = _CODEC_NAMES.get(codec, "unknown")
+            if name is None:
+                payload = stored
+            elif name == "zlib":
+                payload = memoryview(zlib.decompress(stored))
+            elif name == "lzma":
+                payload = memoryview(lzma.decompress(stored))
+            else:
+                raise ValueError(f"Unknown telemetry codec {codec}")
+            if len(payload) != raw_size:
+                raise ValueError("Corrupt telemetry block")
+
+            position = 0
+            columns = []
+            delta_code = "q" if block_flags & _FLAG_WIDE_DELTAS else "i"
+            for code in ("d", delta_code, "I", "H"):
+                size = count * struct.calcsize(code)
+                column = payload[position:position + size].cast(code)
+                if _SWAP_BYTES:
+                    column = array(code, column)
+                    column.byteswap()
+                columns.append(column)
+                position += size
+            position += _pad8(position)
+
+            tables = json.loads(bytes(payload[position:])) if position < raw_size else {}
+            self.metrics.extend(tuple(metric) for metric in tables.get("metrics", ()))
+            self.units.extend(tables.get("units", ()))
+            values, deltas, metric_ids, flags = columns
+            yield EventBlock(first_us, deltas, values, metric_ids, flags, tables.get("objects", []))
+
+    def events(self) -> Iterator[Tuple[float, str, str, Any, str]]:
+        """(timestamp, category, name, value, unit) for every event, in order"""
+        for block in self.blocks():
+            metrics, units = self.metrics, self.units
+            for timestamp, value, metric_id, flag in zip(block.timestamps(), block.decoded_values(),
+                                                         block.metric_ids, block.flags):
+                category, name = metrics[metric_id]
+                yield timestamp, category, name, value, units[flag >> 2]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Convert an NDJSON event log to the binary format, or print a binary log as NDJSON"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TopDeck binary telemetry converter")
+    parser.add_argument("input", help="NDJSON log to encode, or binary log to decode")
+    parser.add_argument("-o", "--output", help="output file (encode: required; decode: default stdout)")
+    parser.add_argument("--compression", choices=("none", "zlib", "lzma"), default="zlib")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "rb") as source:
+        data = source.read()
+
+    if data[:4] == MAGIC:
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            for timestamp, category, name, value, unit in TelemetryReader(data).events():
+                record = {"timestamp": timestamp, "category": category, "name": name, "value": value}
+                if unit:
+                    record["unit"] = unit
+                out.write(json.dumps(record) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 0
+
+    if not args.output:
+        parser.error("--output is required when encoding")
+    compression = None if args.compression == "none" else args.compression
+    with open(args.output, "wb") as out:
+        writer = TelemetryWriter(out, compression)
+        for line in data.decode("utf-8").splitlines():
+            if line.strip():
+                record = json.loads(line)
+                writer.write(record.get("timestamp", 0.0), record["category"], record["name"],
+                             record["value"], record.get("unit", ""))
+        writer.close()
+    print(f"✅ Encoded {writer.events_written:,} events: {len(data):,} → {writer.bytes_written:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Telemetry Server for TopDeck Stats Dashboard
+Asyncio UDP/TCP ingestion server that feeds a StatsDashboard from a running
+game (or a local stand-in emitter) over localhost.
+
+Frame format: NDJSON, one event object per line with the same fields that
+StatsDashboard.ingest_ndjson accepts. An optional first line
+{"sent": <unix time>} marks when the frame left the game and is used to
+measure ingest-to-visible latency. UDP carries one frame per datagram; TCP
+carries frames prefixed with a 4-byte big-endian length.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import struct
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from concurrent_dashboard import ConcurrentDashboard
+from frame_stats import QuantileSketch
+from stats_dashboard import StatsDashboard, CATEGORY_BY_NAME
+
+_FRAME_HEADER = struct.Struct(">I")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TelemetryStats:
+    """Ingestion counters for a TelemetryServer"""
+    frames_received: int = 0
+    frames_ingested: int = 0
+    events_ingested: int = 0
+    frames_dropped: int = 0
+    malformed_frames: int = 0
+    failed_frames: int = 0
+    backpressure_waits: int = 0
+    queue_high_water: int = 0
+
+
+def encode_frame(events: Sequence[Dict[str, Any]], sent: Optional[float] = None) -> bytes:
+    """Encode events as an NDJSON frame payload (without the TCP length prefix)"""
+    lines = [] if sent is None else [json.dumps({"sent": sent})]
+    lines.extend(json.dumps(event) for event in events)
+    return "\n".join(lines).encode()
+
+
+def frame_for_tcp(payload: bytes) -> bytes:
+    """Prefix a frame payload with its length for the TCP stream"""
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_frame(payload: bytes) -> Tuple[Optional[float], List[Dict[str, Any]]]:
+    """Decode a frame payload into (sent time, event records)"""
+    text = payload.decode().strip()
+    if not text:
+        return None, []
+    lines = [line for line in text.splitlines() if line.strip()]
+    records = json.loads("[" + ",".join(lines) + "]")
+    sent = None
+    if records and "sent" in records[0] and "category" not in records[0]:
+        sent = records.pop(0)["sent"]
+    return sent, records
+
+
+def _real(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def frame_columns(records: List[Dict[str, Any]], now: float) -> Tuple[list, list, list, list, list]:
+    """Decoded records as record_many columns; ValueError unless every record is well formed"""
+    categories, names, values, units, timestamps = [], [], [], [], []
+    for record in records:
+        category = CATEGORY_BY_NAME.get(record.get("category"))
+        name = record.get("name")
+        value = record.get("value")
+        unit = record.get("unit", "")
+        timestamp = record.get("timestamp", now)
+        if category is None or not isinstance(name, str) or not isinstance(unit, str):
+            raise ValueError(f"Malformed record: {record!r}")
+        if not _real(value) or not _real(timestamp):
+            raise ValueError(f"Value and timestamp must be finite numbers: {record!r}")
+        categories.append(category)
+        names.append(name)
+        values.append(value)
+        units.append(unit)
+        timestamps.append(float(timestamp))
+    return categories, names, values, units, timestamps
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    """Hands datagrams to the server without ever blocking"""
+
+    def __init__(self, server: "TelemetryServer"):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr):
+        self.server._offer(data)
+
+
+class TelemetryServer:
+    """Bounded-queue telemetry ingestion for a StatsDashboard.
+
+    Network handlers only enqueue raw frames; a single consumer task
+    decodes them and records them in batches. When the queue is full, UDP
+    frames are dropped (``frames_dropped``) and TCP connections stop being
+    read until there is room (``backpressure_waits``), which pushes back on
+    the sender through TCP flow control instead of growing memory. Frames
+    with a record that is not well formed are skipped whole
+    (``malformed_frames``). Given a ConcurrentDashboard, batches are only
+    buffered here, so reports read on other threads never stall ingestion;
+    a batch then counts as ingested, and its latency is measured, when the
+    flush that applies it runs.
+    """
+
+    def __init__(self, dashboard: Union[StatsDashboard, ConcurrentDashboard], host: str = "127.0.0.1",
+                 udp_port: Optional[int] = 9870, tcp_port: Optional[int] = 9871,
+                 max_queue: int = 1024, max_batch_frames: int = 64):
+        self.dashboard = dashboard
+        self.host = host
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self.max_batch_frames = max_batch_frames
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.stats = TelemetryStats()
+        self.latency = QuantileSketch()
+
+        self._udp_transport = None
+        self._tcp_server = None
+        self._tcp_handlers: Set[asyncio.Task] = set()
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Open the sockets and start consuming frames"""
+        loop = asyncio.get_running_loop()
+        if self.udp_port is not None:
+            self._udp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, self.udp_port)
+            )
+            self.udp_port = self._udp_transport.get_extra_info("sockname")[1]
+        if self.tcp_port is not None:
+            self._tcp_server = await asyncio.start_server(
+                self._handle_tcp, self.host, self.tcp_port
+            )
+            self.tcp_port = self._tcp_server.sockets[0].getsockname()[1]
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = 10.0):
+        """Close the sockets, optionally recording frames still queued.
+        
+        With ``drain``, open TCP connections are read until their clients
+        disconnect (for at most ``timeout`` seconds), so frames already
+        sent are recorded; without it they are cut off.
+        """
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+        handlers = list(self._tcp_handlers)
+        if handlers:
+            pending = handlers
+            if drain:
+                _, pending = await asyncio.wait(handlers, timeout=timeout)
+            for handler in pending:
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+        if self._tcp_server is not None:
+            await self._tcp_server.wait_closed()
+        if drain:
+            await self.queue.join()
+            if isinstance(self.dashboard, ConcurrentDashboard):
+                await asyncio.get_running_loop().run_in_executor(None, self.dashboard.flush)
+                # Run the on_applied callbacks the flush scheduled
+                await asyncio.sleep(0)
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+
+    def _offer(self, payload: bytes) -> bool:
+        """Enqueue a frame without waiting; counts a drop if the queue is full"""
+        self.stats.frames_received += 1
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.stats.frames_dropped += 1
+            return False
+        self._note_depth()
+        return True
+
+    def _note_depth(self):
+        depth = self.queue.qsize()
+        if depth > self.stats.queue_high_water:
+            self.stats.queue_high_water = depth
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read length-prefixed frames until the client disconnects"""
+        handler = asyncio.current_task()
+        self._tcp_handlers.add(handler)
+        try:
+            while True:
+                header = await reader.readexactly(_FRAME_HEADER.size)
+                payload = await reader.readexactly(_FRAME_HEADER.unpack(header)[0])
+                self.stats.frames_received += 1
+                if self.queue.full():
+                    self.stats.backpressure_waits += 1
+                await self.queue.put(payload)
+                self._note_depth()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._tcp_handlers.discard(handler)
+            writer.close()
+
+    async def _consume(self):
+        """Decode queued frames and record them, coalescing whatever is ready"""
+        queue = self.queue
+        while True:
+            payloads = [await queue.get()]
+            while len(payloads) < self.max_batch_frames and not queue.empty():
+                payloads.append(queue.get_nowait())
+            try:
+                self._ingest(payloads)
+            except Exception:
+                # A bad batch must not take the only consumer down with it
+                logger.exception("Failed to ingest %d telemetry frames", len(payloads))
+                self.stats.failed_frames += len(payloads)
+            finally:
+                for _ in payloads:
+                    queue.task_done()
+            # Let the network handlers run between batches
+            await asyncio.sleep(0)
+
+    def _ingest(self, payloads: List[bytes]):
+        """Record a group of frames with one record_many call"""
+        categories, names, values, units, timestamps = [], [], [], [], []
+        sent_times = []
+        frames = 0
+        now = time.time()
+        for payload in payloads:
+            try:
+                sent, records = decode_frame(payload)
+                columns = frame_columns(records, now)
+            except (ValueError, KeyError, TypeError, AttributeError, UnicodeDecodeError):
+                self.stats.malformed_frames += 1
+                continue
+            for column, frame_column in zip((categories, names, values, units, timestamps), columns):
+                column.extend(frame_column)
+            if _real(sent):
+                sent_times.append(sent)
+            frames += 1
+
+        if isinstance(self.dashboard, ConcurrentDashboard):
+            # Only buffered here: count the batch when a flush applies it
+            loop = asyncio.get_running_loop()
+            events = len(values)
+            self.dashboard.record_many(
+                categories, names, values, units, timestamps,
+                on_applied=lambda: loop.is_closed() or loop.call_soon_threadsafe(
+                    self._ingested, frames, events, sent_times, time.time())
+            )
+            return
+        if values:
+            self.dashboard.record_many(categories, names, values, units, timestamps)
+        self._ingested(frames, len(values), sent_times, time.time())
+
+    def _ingested(self, frames: int, events: int, sent_times: List[float], visible: float):
+        """Count a batch once recorded, so a failed batch is not reported as ingested"""
+        self.stats.frames_ingested += frames
+        self.stats.events_ingested += events
+        for sent in sent_times:
+            self.latency.add(max(0.0, visible - sent))
+
+    def report(self) -> Dict[str, Any]:
+        """Counters plus ingest-to-visible latency percentiles in milliseconds"""
+        report = asdict(self.stats)
+        report["queue_depth"] = self.queue.qsize()
+        report["latency_ms"] = {
+            "p50": self.latency.quantile(0.50) * 1000.0,
+            "p99": self.latency.quantile(0.99) * 1000.0,
+            "max": (self.latency.max if self.latency.count else 0.0) * 1000.0
+        }
+        return report
+
+
+async def serve(args) -> int:
+    """Run the server until interrupted, printing periodic reports"""
+    dashboard = StatsDashboard(history_size=args.history_size)
+    dashboard.start_session(args.session_id)
+    # Ingestion only buffers batches; the flusher thread applies them and
+    # reports wait on its lock in an executor, never on the event loop
+    concurrent = ConcurrentDashboard(dashboard)
+    server = TelemetryServer(concurrent, args.host, args.udp_port, args.tcp_port,
+                             max_queue=args.max_queue)
+    concurrent.start()
+    await server.start()
+    print(f"Listening on {args.host} (UDP {server.udp_port}, TCP {server.tcp_port})")
+
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(json.dumps(server.report()))
+            if args.dashboard_report:
+                print(await loop.run_in_executor(None, concurrent.generate_report))
+    finally:
+        await server.stop(drain=False)
+        concurrent.stop()
+
+
+def main():
+    """Main entry point for the telemetry server"""
+    parser = argparse.ArgumentParser(description="TopDeck telemetry ingestion server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--udp-port", type=int, default=9870)
+    parser.add_argument("--tcp-port", type=int, default=9871)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--history-size", type=int, default=100_000)
+    parser.add_argument("--session-id", default=None)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--dashboard-report", action="store_true",
+                        help="also print the full dashboard report each interval")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
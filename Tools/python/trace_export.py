@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Trace Export for TopDeck Stats Dashboard
+Streams a session as Chrome Trace Event JSON for chrome://tracing or
+Perfetto (ui.perfetto.dev). Waves become spans, gameplay events become
+instants, and frame time/FPS become counter tracks (from the rollups, or
+the frame-time buckets archived with the session).
+
+Events are written as they are read, so memory stays bounded no matter
+how long the session is.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import sys
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from perf_rollups import ARCHIVED_BUCKET_FIELDS, RollupBucket
+from stats_dashboard import GameSession, StatsDashboard, StatCategory, StatEntry, CATEGORY_BY_NAME
+
+PID = 1
+WAVES_TID = 1
+GAMEPLAY_TID = 2
+
+# PERFORMANCE metrics drawn as counter tracks rather than instants
+COUNTER_METRICS = {"frame_time", "frame_time_ms", "fps", "current_fps", "average_fps"}
+
+
+class TraceWriter:
+    """Writes trace events to a file one at a time"""
+
+    def __init__(self, out: TextIO, flush_every: int = 4096):
+        self.out = out
+        self.flush_every = flush_every
+        self.events_written = 0
+        self._pending: List[str] = []
+        out.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+
+    def write(self, event: dict):
+        self.write_encoded(json.dumps(event, separators=(",", ":")))
+
+    def write_encoded(self, text: str):
+        """Write one event that is already JSON-encoded"""
+        self._pending.append(",\n" + text if self.events_written else text)
+        self.events_written += 1
+        if len(self._pending) >= self.flush_every:
+            self.out.write("".join(self._pending))
+            self._pending.clear()
+
+    def close(self):
+        self.out.write("".join(self._pending))
+        self._pending.clear()
+        self.out.write("\n]}\n")
+
+
+def _metadata(writer: TraceWriter, process_name: str):
+    writer.write({"name": "process_name", "ph": "M", "pid": PID, "args": {"name": process_name}})
+    for tid, name in ((WAVES_TID, "Waves"), (GAMEPLAY_TID, "Gameplay")):
+        writer.write({"name": "thread_name", "ph": "M", "pid": PID, "tid": tid, "args": {"name": name}})
+
+
+def write_trace(out: TextIO, events: Iterable[StatEntry],
+                frames: Iterable[RollupBucket] = (), origin: Optional[float] = None,
+                process_name: str = "TopDeck") -> int:
+    """Stream events and frame buckets (each in time order) as a Chrome trace.
+
+    ``origin`` is the time shown as zero; it defaults to the first timestamp
+    seen. Returns the number of trace events written.
+    """
+    writer = TraceWriter(out)
+    _metadata(writer, process_name)
+
+    # (timestamp, kind, item): kind 0 = frame bucket, 1 = event
+    stream = heapq.merge(
+        ((bucket.start, 0, bucket) for bucket in frames),
+        ((entry.timestamp, 1, entry) for entry in events),
+        key=lambda item: (item[0], item[1])
+    )
+
+    open_wave: Optional[Any] = None
+    last_ts = 0.0
+    instant_templates = {}
+    for timestamp, kind, item in stream:
+        if origin is None:
+            origin = timestamp
+        ts = (timestamp - origin) * 1_000_000.0
+        last_ts = max(last_ts, ts)
+
+        if kind == 0:
+            ts = max(ts, 0.0)  # The first bucket may start before the session
+            if item.count:
+                writer.write({"name": "Frame time (ms)", "ph": "C", "pid": PID, "ts": ts, "args": {
+                    "mean": item.mean * 1000.0, "p99": item.p99 * 1000.0, "max": item.max * 1000.0}})
+                writer.write({"name": "FPS", "ph": "C", "pid": PID, "ts": ts, "args": {
+                    "fps": 1.0 / item.mean if item.mean > 0 else 0.0}})
+            continue
+
+        entry: StatEntry = item
+        if entry.category is StatCategory.WAVES and entry.name in ("wave_started", "wave_completed"):
+            if open_wave is not None:
+                writer.write({"name": f"Wave {open_wave}", "ph": "E", "pid": PID, "tid": WAVES_TID, "ts": ts})
+                open_wave = None
+            if entry.name == "wave_started":
+                open_wave = entry.value
+                writer.write({"name": f"Wave {open_wave}", "cat": "Waves", "ph": "B", "pid": PID,
+                              "tid": WAVES_TID, "ts": ts, "args": {"wave": entry.value}})
+            continue
+
+        if (entry.category is StatCategory.PERFORMANCE and entry.name in COUNTER_METRICS
+                and isinstance(entry.value, (int, float))):
+            writer.write({"name": entry.name, "ph": "C", "pid": PID, "ts": ts,
+                          "args": {entry.name: entry.value}})
+            continue
+
+        # Instants are the bulk of a trace: encode the fixed parts once per metric
+        key = (entry.category, entry.name, entry.unit)
+        template = instant_templates.get(key)
+        if template is None:
+            head = json.dumps({"name": entry.name, "cat": entry.category.value, "ph": "i", "s": "t",
+                               "pid": PID, "tid": GAMEPLAY_TID}, separators=(",", ":"))[:-1]
+            tail = f',"unit":{json.dumps(entry.unit)}}}}}' if entry.unit else "}}"
+            template = instant_templates[key] = (head + ',"ts":', tail)
+        value = entry.value
+        if type(value) is int:
+            encoded = repr(value)
+        elif type(value) is float:
+            encoded = repr(value) if math.isfinite(value) else "null"
+        else:
+            encoded = json.dumps(value if isinstance(value, (str, bool, int, float)) else str(value))
+        writer.write_encoded(f'{template[0]}{ts!r},"args":{{"value":{encoded}{template[1]}')
+
+    if open_wave is not None:
+        writer.write({"name": f"Wave {open_wave}", "ph": "E", "pid": PID, "tid": WAVES_TID, "ts": last_ts})
+
+    writer.close()
+    return writer.events_written
+
+
+def export_dashboard_trace(dashboard: StatsDashboard, out: TextIO,
+                           session: Optional[GameSession] = None) -> int:
+    """Stream a dashboard session (current one by default) as a Chrome trace.
+
+    The running session uses its events (including any already copied out
+    of ``stats_history`` for the archive) and the frame-time rollups
+    covering it. An ended session is read back from the dashboard's
+    archive when it has one, otherwise from what ``stats_history`` still
+    holds.
+    """
+    session = session or dashboard.current_session or (dashboard.sessions[-1] if dashboard.sessions else None)
+    if session is None:
+        raise ValueError("No session to export")
+    if session is dashboard.current_session:
+        events: Iterable[StatEntry] = dashboard.session_events()
+    else:
+        archived = dashboard.archive.get(session.session_id) if dashboard.archive is not None else None
+        if archived is not None:
+            return export_archived_trace(dashboard.archive, archived, out)
+        events = dashboard.stats_history.entries()
+    start, end = session.start_time, session.end_time
+    events = (entry for entry in events
+              if entry.timestamp >= start and (end is None or entry.timestamp <= end))
+    return write_trace(out, events, dashboard.performance.finest_buckets(start, end),
+                       origin=start, process_name=f"TopDeck {session.session_id}")
+
+
+def archived_frame_buckets(archive, session) -> Tuple[List[RollupBucket], List[int]]:
+    """Frame-time buckets archived with a session, and the archive metric IDs they use"""
+    metric_ids = [archive.find_metric(StatCategory.PERFORMANCE, name) for name, _ in ARCHIVED_BUCKET_FIELDS]
+    if None in metric_ids:
+        return [], []
+    field_of = {metric_id: position for position, metric_id in enumerate(metric_ids)}
+    columns = archive.events(session)
+    starts: List[float] = []
+    rows: List[List[float]] = []
+    for timestamp, value, metric_id in zip(columns.timestamps, columns.values, columns.metric_ids):
+        position = field_of.get(metric_id)
+        if position is None:
+            continue
+        if position == 0:
+            starts.append(timestamp)
+            rows.append([0.0] * len(metric_ids))
+        rows[-1][position] = value
+
+    buckets = []
+    resolution = 1.0
+    for index, start in enumerate(starts):
+        if index + 1 < len(starts):
+            resolution = starts[index + 1] - start
+        buckets.append(RollupBucket.from_archived(start, resolution, rows[index]))
+    return buckets, metric_ids
+
+
+def export_archived_trace(archive, session, out: TextIO) -> int:
+    """Stream an archived session, with its archived frame-time buckets, as a Chrome trace"""
+    buckets, metric_ids = archived_frame_buckets(archive, session)
+    frame_metrics = {archive.metric(metric_id) for metric_id in metric_ids}
+    events = (entry for entry in archive.iter_events(session)
+              if (entry.category, entry.name) not in frame_metrics)
+    return write_trace(out, events, buckets, origin=session.start_time,
+                       process_name=f"TopDeck {session.session_id}")
+
+
+def iter_ndjson_events(lines: Iterable[str]) -> Iterator[StatEntry]:
+    """StatEntry objects from an NDJSON log in ``StatsDashboard.ingest_ndjson`` format.
+
+    An event without a timestamp takes the one before it; events before
+    the first timestamped one are skipped, as they cannot be placed.
+    """
+    timestamp = None
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        timestamp = record.get("timestamp", timestamp)
+        if timestamp is None:
+            continue
+        yield StatEntry(timestamp, CATEGORY_BY_NAME[record["category"]],
+                        record["name"], record["value"], record.get("unit", ""))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Export an archived session or an NDJSON log as a Chrome trace"""
+    parser = argparse.ArgumentParser(description="Export a TopDeck session as a Chrome/Perfetto trace")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--archive", nargs=2, metavar=("ARCHIVE_DIR", "SESSION_ID"),
+                        help="session from a session archive")
+    source.add_argument("--ndjson", metavar="LOG", help="NDJSON event log")
+    parser.add_argument("-o", "--output", default="trace.json")
+    args = parser.parse_args(argv)
+
+    with open(args.output, "w") as out:
+        if args.archive:
+            from session_archive import SessionArchive
+            with SessionArchive(args.archive[0]) as archive:
+                session = archive.get(args.archive[1])
+                if session is None:
+                    print(f"Session {args.archive[1]} not found")
+                    return 1
+                written = export_archived_trace(archive, session, out)
+        else:
+            with open(args.ndjson) as log:
+                written = write_trace(out, iter_ndjson_events(log))
+
+    print(f"✅ Wrote {written:,} trace events to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
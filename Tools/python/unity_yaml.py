@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Unity YAML for TopDeck Config Validator
+Loader for the YAML dialect Unity writes for assets, prefabs and scenes:
+``%TAG !u!`` directives, one ``--- !u!<classID> &<fileID>`` document per
+object, sequences indented like their parent key, and ``{fileID, guid}``
+flow references. AssetCache keeps parsed files keyed by content hash, so
+re-checking an unchanged project costs one stat() per file.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_HEADER = re.compile(r"--- !u!(\d+) &(-?\d+)( stripped)?")
+# Unity never writes ints with leading zeros; digit strings like
+# m_StackTraceTypes (hex-encoded bytes) stay strings
+_INT = re.compile(r"-?(0|[1-9]\d*)\Z")
+# Unity writes exponents with a sign (1e-07), so 32-digit hex GUIDs such
+# as 0000000000000000e000000000000000 stay strings, and no leading zeros,
+# so digit strings like 00010304 do too
+_FLOAT = re.compile(r"-?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][-+]\d+)?\Z")
+_SPECIAL_FLOATS = {"Infinity": float("inf"), "-Infinity": float("-inf"), "NaN": float("nan")}
+_STRING_KEYS = frozenset({"guid"})
+_META_GUID = re.compile(rb"^guid: ([0-9a-f]{32})", re.MULTILINE)
+
+# Files AssetCache and the project walk treat as Unity YAML
+UNITY_YAML_SUFFIXES = (".asset", ".prefab", ".unity", ".mat", ".controller", ".anim")
+
+CACHE_VERSION = 3
+# A file modified this close to when it was cached may change again within
+# the same mtime tick, so its stat() alone is not trusted
+_RACY_NS = 2_000_000_000
+
+
+class UnityYamlError(ValueError):
+    """Text the loader cannot parse"""
+
+
+@dataclass
+class UnityObject:
+    """One ``--- !u!`` document: an object of Unity class ``class_id``"""
+    class_id: int
+    file_id: int
+    type_name: str
+    data: Dict[str, Any]
+    stripped: bool = False
+
+    @property
+    def script_guid(self) -> Optional[str]:
+        """GUID of a MonoBehaviour's script asset"""
+        script = self.data.get("m_Script")
+        return script.get("guid") if isinstance(script, dict) else None
+
+    @property
+    def script_class(self) -> Optional[str]:
+        """Class name from ``m_EditorClassIdentifier`` ("Assembly::Namespace.Class")"""
+        identifier = self.data.get("m_EditorClassIdentifier")
+        if not identifier or not isinstance(identifier, str):
+            return None
+        return identifier.rpartition("::")[2].rpartition(".")[2] or None
+
+
+@dataclass
+class UnityAsset:
+    path: str
+    digest: str
+    objects: List[UnityObject] = field(default_factory=list)
+
+    def monobehaviours(self) -> List[UnityObject]:
+        return [obj for obj in self.objects if obj.type_name == "MonoBehaviour" and not obj.stripped]
+
+    def scriptable_objects(self) -> List[UnityObject]:
+        """MonoBehaviours not attached to a GameObject, i.e. ScriptableObject assets"""
+        return [obj for obj in self.monobehaviours()
+                if isinstance(obj.data.get("m_GameObject"), dict) and not obj.data["m_GameObject"].get("fileID")]
+
+    def find(self, file_id: int) -> Optional[UnityObject]:
+        for obj in self.objects:
+            if obj.file_id == file_id:
+                return obj
+        return None
+
+    def references(self) -> List[str]:
+        """GUIDs of the other assets this file's ``{fileID, guid}`` references point to"""
+        guids = set()
+        pending: List[Any] = [obj.data for obj in self.objects]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, dict):
+                guid = value.get("guid")
+                if guid and "fileID" in value:
+                    guids.add(guid)
+                pending.extend(value.values())
+            elif isinstance(value, list):
+                pending.extend(value)
+        return sorted(guids)
+
+
+def _scalar(text: str, key: str = "") -> Any:
+    if not text:
+        return None
+    first = text[0]
+    if first == "'":
+        return text[1:-1].replace("''", "'")
+    if first == '"':
+        return _double_quoted(text)
+    if key in _STRING_KEYS:
+        return text
+    if _INT.match(text):
+        return int(text)
+    if _FLOAT.match(text):
+        return float(text)
+    special = _SPECIAL_FLOATS.get(text)
+    return text if special is None else special
+
+
+def _double_quoted(text: str) -> str:
+    body = text[1:-1]
+    if "\\" not in body:
+        return body
+    return body.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+def _split_flow(text: str) -> List[str]:
+    """Top-level comma-separated items of a flow collection's body"""
+    items = []
+    depth = 0
+    quote = ""
+    start = 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "'\"":
+            quote = char
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(text[start:index].strip())
+            start = index + 1
+    tail = text[start:].strip()
+    if tail:
+        items.append(tail)
+    return items
+
+
+def _flow(text: str, key: str = "") -> Any:
+    """A flow mapping, flow sequence or scalar"""
+    if text.startswith("{"):
+        if not text.endswith("}"):
+            raise UnityYamlError(f"Unterminated flow mapping: {text[:60]}")
+        result = {}
+        for item in _split_flow(text[1:-1]):
+            name, _, value = item.partition(":")
+            name = name.strip()
+            result[name] = _flow(value.strip(), name)
+        return result
+    if text.startswith("["):
+        if not text.endswith("]"):
+            raise UnityYamlError(f"Unterminated flow sequence: {text[:60]}")
+        return [_flow(item, key) for item in _split_flow(text[1:-1])]
+    return _scalar(text, key)
+
+
+def _is_mapping_entry(text: str) -> bool:
+    return text[0] not in "{['\"" and (": " in text or text.endswith(":"))
+
+
+class _Parser:
+    """Recursive descent over (indent, text) lines of one document"""
+
+    def __init__(self, lines: List[Tuple[int, str]]):
+        self.lines = lines
+        self.index = 0
+
+    def block(self, indent: int) -> Any:
+        lines = self.lines
+        text = lines[self.index][1]
+        if text == "-" or text.startswith("- "):
+            return self.sequence(indent)
+        if _is_mapping_entry(text):
+            return self.mapping(indent)
+        # A scalar that starts on the line after its key
+        parts = []
+        while self.index < len(lines) and lines[self.index][0] >= indent:
+            parts.append(lines[self.index][1])
+            self.index += 1
+        return _flow(" ".join(parts))
+
+    def mapping(self, indent: int) -> Dict[str, Any]:
+        lines = self.lines
+        count = len(lines)
+        result: Dict[str, Any] = {}
+        while self.index < count:
+            line_indent, text = lines[self.index]
+            if line_indent != indent or text == "-" or text.startswith("- "):
+                if line_indent > indent:
+                    raise UnityYamlError(f"Unexpected indentation: {text[:60]}")
+                break
+            split = text.find(": ")
+            if split >= 0:
+                key, rest = text[:split], text[split + 2:].strip()
+            elif text.endswith(":"):
+                key, rest = text[:-1], ""
+            else:
+                raise UnityYamlError(f"Expected 'key: value': {text[:60]}")
+            self.index += 1
+            if rest:
+                result[key] = self.value(rest, indent, key)
+            elif self.index < count and (lines[self.index][0] > indent or (
+                    lines[self.index][0] == indent and lines[self.index][1][:1] == "-")):
+                result[key] = self.block(lines[self.index][0])
+            else:
+                result[key] = None
+        return result
+
+    def sequence(self, indent: int) -> List[Any]:
+        lines = self.lines
+        count = len(lines)
+        result: List[Any] = []
+        while self.index < count:
+            line_indent, text = lines[self.index]
+            if line_indent != indent or not (text == "-" or text.startswith("- ")):
+                break
+            rest = text[2:].strip()
+            if not rest:
+                self.index += 1
+                result.append(self.block(lines[self.index][0]) if self.index < count
+                              and lines[self.index][0] > indent else None)
+            elif _is_mapping_entry(rest) or rest == "-" or rest.startswith("- "):
+                # "- key: value" opens a mapping whose keys line up with "key"
+                lines[self.index] = (indent + 2, rest)
+                result.append(self.block(indent + 2))
+            else:
+                self.index += 1
+                result.append(self.value(rest, indent))
+        return result
+
+    def value(self, text: str, indent: int, key: str = "") -> Any:
+        """An inline value, folding any continuation lines indented past ``indent``"""
+        lines = self.lines
+        count = len(lines)
+        if self.index < count and lines[self.index][0] > indent and text[0] not in "{[":
+            parts = [text]
+            while self.index < count and lines[self.index][0] > indent:
+                parts.append(lines[self.index][1])
+                self.index += 1
+            text = " ".join(parts)
+        elif text[0] in "{[" and not text.endswith("}" if text[0] == "{" else "]"):
+            parts = [text]
+            while self.index < count and lines[self.index][0] > indent:
+                parts.append(lines[self.index][1])
+                self.index += 1
+            text = " ".join(parts)
+        return _flow(text, key)
+
+
+def _document(header: str, lines: List[Tuple[int, str]]) -> UnityObject:
+    match = _HEADER.match(header)
+    if not match:
+        raise UnityYamlError(f"Not a Unity object header: {header[:60]}")
+    if not lines:
+        raise UnityYamlError(f"Empty document: {header}")
+    parser = _Parser(lines)
+    body = parser.mapping(0)
+    if parser.index != len(lines):
+        raise UnityYamlError(f"Unexpected line in document {header}: {lines[parser.index][1][:60]}")
+    if len(body) != 1:
+        raise UnityYamlError(f"Document {header} must hold exactly one object")
+    (type_name, data), = body.items()
+    return UnityObject(int(match.group(1)), int(match.group(2)), type_name,
+                       data if isinstance(data, dict) else {}, bool(match.group(3)))
+
+
+def parse_unity_yaml(text: str) -> List[UnityObject]:
+    """Every object in a Unity YAML file (asset, prefab or scene), in file order"""
+    objects = []
+    header = None
+    lines: List[Tuple[int, str]] = []
+    for raw in text.splitlines():
+        if not raw or raw.isspace():
+            continue
+        if raw[0] == "%":
+            continue
+        if raw.startswith("--- "):
+            if header is not None:
+                objects.append(_document(header, lines))
+            header = raw.rstrip()
+            lines = []
+            continue
+        if header is None:
+            raise UnityYamlError("Not Unity YAML: content before the first '--- !u!' document")
+        stripped = raw.lstrip(" ")
+        lines.append((len(raw) - len(stripped), stripped.rstrip()))
+    if header is not None:
+        objects.append(_document(header, lines))
+    return objects
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def load_unity_asset(path: str) -> UnityAsset:
+    """Parse one Unity YAML file (no caching)"""
+    with open(path, "rb") as source:
+        data = source.read()
+    return UnityAsset(path, content_digest(data), parse_unity_yaml(data.decode("utf-8")))
+
+
+def read_meta_guid(path: str) -> Optional[str]:
+    """The ``guid`` of a ``.meta`` file"""
+    with open(path, "rb") as meta:
+        match = _META_GUID.search(meta.read(512))
+    return match.group(1).decode() if match else None
+
+
+def scan_script_guids(root: str) -> Dict[str, str]:
+    """Script GUID -> class name (file stem) for every ``*.cs.meta`` under ``root``"""
+    scripts = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".cs.meta"):
+                guid = read_meta_guid(os.path.join(directory, name))
+                if guid:
+                    scripts[guid] = name[:-len(".cs.meta")]
+    return scripts
+
+
+class AssetCache:
+    """Parsed Unity YAML files, persisted between runs.
+
+    A file whose size and mtime match its cached stat() is not opened. A
+    file whose stat changed is read and hashed, and only parsed if the
+    content hash is new; parses are shared by identical files. Mirrors
+    the ``useContentHashing`` option of PythonTools.asset. The parses are
+    unpickled on first use, so a run that only needs digests skips them.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.stats: Dict[str, Tuple[int, int, int, str]] = {}   # path -> (mtime_ns, size, cached_ns, digest)
+        self._parsed: Optional[Dict[str, List[UnityObject]]] = {}   # digest -> objects
+        self._parsed_blob = b""
+        self.stat_hits = 0
+        self.hash_hits = 0
+        self.parses = 0
+        self.dirty = False
+        if path and os.path.exists(path):
+            self._read(path)
+
+    def _read(self, path: str):
+        try:
+            with open(path, "rb") as source:
+                version, stats, parsed_blob = pickle.load(source)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return
+        if version == CACHE_VERSION:
+            self.stats, self._parsed, self._parsed_blob = stats, None, parsed_blob
+
+    @property
+    def parsed(self) -> Dict[str, List[UnityObject]]:
+        if self._parsed is None:
+            try:
+                self._parsed = pickle.loads(self._parsed_blob)
+            except (EOFError, ValueError, pickle.UnpicklingError):
+                self._parsed, self.stats = {}, {}
+        return self._parsed
+
+    def _unchanged(self, key: str, st: os.stat_result) -> Optional[str]:
+        """The cached digest of ``key`` if its stat() still matches"""
+        entry = self.stats.get(key)
+        if (entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size
+                and entry[2] - st.st_mtime_ns > _RACY_NS):
+            return entry[3]
+        return None
+
+    def digest(self, path: str) -> str:
+        """The content digest of ``path`` (any file), without parsing it"""
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        digest = self._unchanged(key, st)
+        if digest is not None:
+            self.stat_hits += 1
+            return digest
+        with open(key, "rb") as source:
+            digest = content_digest(source.read())
+        self.stats[key] = (st.st_mtime_ns, st.st_size, time.time_ns(), digest)
+        self.dirty = True
+        return digest
+
+    def load(self, path: str) -> UnityAsset:
+        """The parsed asset at ``path``, from the cache when its content is unchanged"""
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        digest = self._unchanged(key, st)
+        if digest is not None and digest in self.parsed:
+            self.stat_hits += 1
+            return UnityAsset(path, digest, self.parsed[digest])
+
+        with open(key, "rb") as source:
+            data = source.read()
+        digest = content_digest(data)
+        objects = self.parsed.get(digest)
+        if objects is None:
+            objects = self.parsed[digest] = parse_unity_yaml(data.decode("utf-8"))
+            self.parses += 1
+        else:
+            self.hash_hits += 1
+        self.stats[key] = (st.st_mtime_ns, st.st_size, time.time_ns(), digest)
+        self.dirty = True
+        return UnityAsset(path, digest, objects)
+
+    def forget(self, path: str):
+        self.stats.pop(os.path.abspath(path), None)
+        self.dirty = True
+
+    def save(self):
+        """Write the cache (dropping parses no file refers to any more)"""
+        if not self.path or not self.dirty:
+            return
+        if self._parsed is not None:
+            live = {entry[3] for entry in self.stats.values()}
+            self._parsed = {digest: objects for digest, objects in self._parsed.items() if digest in live}
+            self._parsed_blob = pickle.dumps(self._parsed, protocol=pickle.HIGHEST_PROTOCOL)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as out:
+            pickle.dump((CACHE_VERSION, self.stats, self._parsed_blob), out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+        self.dirty = False
+
+    def __enter__(self) -> "AssetCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.save()
+
+
+def find_project_root(path: str) -> Optional[str]:
+    """The nearest directory at or above ``path`` with an ``Assets`` folder"""
+    directory = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+    while True:
+        if os.path.isdir(os.path.join(directory, "Assets")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def default_cache_path(path: str, name: str = "asset_cache.pickle") -> Optional[str]:
+    """``Library/TopDeckTools/<name>`` in the project holding ``path``"""
+    root = find_project_root(path)
+    return os.path.join(root, "Library", "TopDeckTools", name) if root else None
+
+
+def iter_unity_yaml_files(root: str) -> Iterator[str]:
+    """Unity YAML files under ``root``, in sorted order"""
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        for name in sorted(files):
+            if name.endswith(UNITY_YAML_SUFFIXES):
+                yield os.path.join(directory, name)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse Unity YAML files and print a per-file object summary"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse Unity YAML assets, prefabs and scenes")
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--cache", help="asset cache file (default: the project's Library folder)")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    cache = AssetCache(None if args.no_cache else args.cache or default_cache_path(args.paths[0]))
+    failed = 0
+    start = time.perf_counter()
+    files = 0
+    for path in args.paths:
+        for file_path in (iter_unity_yaml_files(path) if os.path.isdir(path) else [path]):
+            files += 1
+            try:
+                asset = cache.load(file_path)
+            except (UnityYamlError, UnicodeDecodeError) as error:
+                print(f"❌ {file_path}: {error}")
+                failed += 1
+                continue
+            scripts = sorted({obj.script_class for obj in asset.monobehaviours() if obj.script_class})
+            print(f"  {file_path}: {len(asset.objects)} objects"
+                  + (f" ({', '.join(scripts)})" if scripts else ""))
+    cache.save()
+    print(f"✅ {files - failed} of {files} files in {time.perf_counter() - start:.3f}s "
+          f"({cache.stat_hits} unchanged, {cache.hash_hits} same content, {cache.parses} parsed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())